@@ -0,0 +1,9 @@
+# SPDX-FileCopyrightText: 2025-present U.N. Owen <void@some.where>
+#
+# SPDX-License-Identifier: MIT
+
+"""Performance benchmarks for PipeForge.
+
+Run ``python -m benchmarks --help`` from the repository root with ``src`` on
+``PYTHONPATH`` (or with PipeForge installed).
+"""
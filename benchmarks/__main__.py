@@ -0,0 +1,7 @@
+# SPDX-FileCopyrightText: 2025-present U.N. Owen <void@some.where>
+#
+# SPDX-License-Identifier: MIT
+
+from benchmarks.run import main
+
+main()
@@ -0,0 +1,134 @@
+# SPDX-FileCopyrightText: 2025-present U.N. Owen <void@some.where>
+#
+# SPDX-License-Identifier: MIT
+
+"""Per-job memory footprint of the IR, compact models versus the original layout.
+
+The "legacy" figures rebuild each parsed plan with the pre-slots dataclasses
+(per-instance ``__dict__``, a fresh env ``dict`` per step/job, and one string
+object per command occurrence, as ``yaml.safe_load`` hands them to the parser)
+so both layouts are measured from the same input.
+"""
+
+from __future__ import annotations
+
+import gc
+import json
+import tracemalloc
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+import click
+
+from pipeforge import yamlio
+from pipeforge.models import Pipeline
+from pipeforge.parsers import default_parser_registry
+
+from .specgen import SpecShape, generate_spec_text
+
+
+@dataclass
+class LegacyStep:
+    name: str
+    commands: List[str] = field(default_factory=list)
+    env: Dict[str, str] = field(default_factory=dict)
+
+
+@dataclass
+class LegacyJob:
+    name: str
+    steps: List[LegacyStep] = field(default_factory=list)
+    image: Optional[str] = None
+    env: Dict[str, str] = field(default_factory=dict)
+
+
+@dataclass
+class LegacyPipeline:
+    name: str
+    jobs: List[LegacyJob] = field(default_factory=list)
+    variables: Dict[str, str] = field(default_factory=dict)
+    triggers: List[str] = field(default_factory=list)
+
+
+def _fresh(value: str) -> str:
+    # A distinct object with the same contents, as the YAML loader produces.
+    return value.encode("utf-8").decode("utf-8")
+
+
+def to_legacy(pipeline: Pipeline) -> LegacyPipeline:
+    return LegacyPipeline(
+        name=_fresh(pipeline.name),
+        jobs=[
+            LegacyJob(
+                name=_fresh(job.name),
+                steps=[
+                    LegacyStep(
+                        name=_fresh(step.name),
+                        commands=[_fresh(command) for command in step.commands],
+                        env={_fresh(k): _fresh(v) for k, v in step.env.items()},
+                    )
+                    for step in job.steps
+                ],
+                image=_fresh(job.image) if job.image else None,
+                env={_fresh(k): _fresh(v) for k, v in job.env.items()},
+            )
+            for job in pipeline.jobs
+        ],
+        variables={_fresh(k): _fresh(v) for k, v in pipeline.variables.items()},
+        triggers=list(pipeline.triggers),
+    )
+
+
+def retained_bytes(build: Callable[[], Any]) -> int:
+    """Bytes still allocated after ``build()`` returns, while its result is alive."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        result = build()
+        gc.collect()
+        after, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del result
+    return after - before
+
+
+def measure(shape: SpecShape, plans: int) -> Dict[str, Any]:
+    """Holds ``plans`` copies of a parsed spec in memory and reports bytes per job."""
+    parser = default_parser_registry().get("bamboo")
+    content = generate_spec_text(shape).encode("utf-8")
+    jobs = shape.total_jobs * plans
+
+    # The loaded YAML is dropped after parsing, as in a real conversion, so
+    # only what the IR keeps alive is counted.
+    compact = retained_bytes(lambda: [parser.parse(yamlio.load(content)) for _ in range(plans)])
+    legacy = retained_bytes(lambda: [to_legacy(parser.parse(yamlio.load(content))) for _ in range(plans)])
+    return {
+        "scenario": shape.name,
+        "plans": plans,
+        "jobs": jobs,
+        "legacy_bytes_per_job": legacy / jobs,
+        "compact_bytes_per_job": compact / jobs,
+        "saving": 1 - compact / legacy if legacy else 0.0,
+    }
+
+
+@click.command(help=__doc__)
+@click.option("--stages", type=click.IntRange(min=1), default=5, show_default=True)
+@click.option("--jobs", type=click.IntRange(min=1), default=20, show_default=True, help="Jobs per stage.")
+@click.option("--tasks", type=click.IntRange(min=0), default=5, show_default=True)
+@click.option("--variables", type=click.IntRange(min=0), default=20, show_default=True)
+@click.option("--plans", type=click.IntRange(min=1), default=20, show_default=True, help="Copies held at once.")
+def main(stages: int, jobs: int, tasks: int, variables: int, plans: int) -> None:
+    report = measure(SpecShape(stages, jobs, tasks, variables), plans)
+    click.echo(
+        f"{report['scenario']}: {report['legacy_bytes_per_job']:.0f} B/job -> "
+        f"{report['compact_bytes_per_job']:.0f} B/job ({report['saving']:.0%} smaller)",
+        err=True,
+    )
+    click.echo(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,233 @@
+# SPDX-FileCopyrightText: 2025-present U.N. Owen <void@some.where>
+#
+# SPDX-License-Identifier: MIT
+
+"""Per-stage timings for loading, parsing, rendering, and dumping specs.
+
+Each scenario generates a synthetic spec once and then times the stages
+separately: ``load`` (YAML text to Python data), ``parse`` (data to the IR),
+and, for every target, ``render`` (IR to document) and ``dump`` (document to
+YAML text). Results are emitted as JSON; ``--compare`` checks them against a
+saved baseline and exits non-zero when a stage regressed beyond the threshold.
+"""
+
+from __future__ import annotations
+
+import json
+import platform
+import statistics
+import sys
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import click
+
+from pipeforge import __about__, yamlio
+from pipeforge.parsers import default_parser_registry
+from pipeforge.renderers import default_renderer_registry
+
+from .specgen import LAYOUTS, SpecShape, generate_spec_text
+
+SCENARIOS: Dict[str, Tuple[int, int, int, int]] = {
+    # name: (stages, jobs per stage, tasks per job, plan variables)
+    "small": (2, 3, 3, 5),
+    "medium": (5, 10, 5, 20),
+    "large": (10, 30, 8, 50),
+}
+
+
+@dataclass
+class StageTiming:
+    scenario: str
+    stage: str
+    target: Optional[str]
+    min_s: float
+    median_s: float
+    repeat: int
+    # Rendered YAML bytes, recorded on ``dump`` stages to track output size.
+    size: Optional[int] = None
+
+    @property
+    def key(self) -> Tuple[str, str, Optional[str]]:
+        return (self.scenario, self.stage, self.target)
+
+
+@dataclass
+class Regression:
+    scenario: str
+    stage: str
+    target: Optional[str]
+    baseline_s: float
+    current_s: float
+
+    @property
+    def ratio(self) -> float:
+        return self.current_s / self.baseline_s if self.baseline_s else float("inf")
+
+
+def time_call(func: Callable[[], Any], repeat: int) -> Tuple[float, float, Any]:
+    """Runs ``func`` ``repeat`` times; returns (min, median, last result)."""
+    samples: List[float] = []
+    result: Any = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        samples.append(time.perf_counter() - start)
+    return min(samples), statistics.median(samples), result
+
+
+def run_scenario(shape: SpecShape, targets: Iterable[str], repeat: int) -> List[StageTiming]:
+    parser = default_parser_registry().get("bamboo")
+    renderers = default_renderer_registry()
+    content = generate_spec_text(shape).encode("utf-8")
+    timings: List[StageTiming] = []
+
+    def record(stage: str, target: Optional[str], func: Callable[[], Any]) -> Any:
+        best, median, result = time_call(func, repeat)
+        size = len(result.encode("utf-8")) if isinstance(result, str) else None
+        timings.append(StageTiming(shape.name, stage, target, best, median, repeat, size))
+        return result
+
+    raw = record("load", None, lambda: yamlio.load(content))
+    pipeline = record("parse", None, lambda: parser.parse(raw))
+    for target in targets:
+        renderer = renderers.get(target)
+        document = record("render", target, lambda: renderer.build_document(pipeline))
+        record("dump", target, lambda: yamlio.dump(document))
+    return timings
+
+
+def compare(
+    current: Iterable[StageTiming],
+    baseline: Iterable[StageTiming],
+    threshold: float,
+) -> List[Regression]:
+    """Returns stages whose median grew by more than ``threshold`` (0.1 = 10%)."""
+    previous = {timing.key: timing for timing in baseline}
+    regressions: List[Regression] = []
+    for timing in current:
+        before = previous.get(timing.key)
+        if before is None:
+            continue
+        if timing.median_s > before.median_s * (1 + threshold):
+            regressions.append(
+                Regression(timing.scenario, timing.stage, timing.target, before.median_s, timing.median_s)
+            )
+    return regressions
+
+
+def load_results(path: Path) -> List[StageTiming]:
+    payload = json.loads(path.read_text(encoding="utf-8"))
+    return [StageTiming(**entry) for entry in payload["results"]]
+
+
+def results_payload(timings: Iterable[StageTiming]) -> Dict[str, Any]:
+    return {
+        "meta": {
+            "pipeforge": __about__.__version__,
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "yaml_backend": yamlio.BACKEND,
+        },
+        "results": [asdict(timing) for timing in timings],
+    }
+
+
+@click.command(help=__doc__)
+@click.option(
+    "--scenario",
+    "scenarios",
+    type=click.Choice(sorted(SCENARIOS)),
+    multiple=True,
+    help="Predefined sizes to run. Defaults to all unless a custom shape is given.",
+)
+@click.option("--stages", type=click.IntRange(min=1), help="Custom shape: number of stages.")
+@click.option("--jobs", type=click.IntRange(min=1), help="Custom shape: jobs per stage.")
+@click.option("--tasks", type=click.IntRange(min=0), help="Custom shape: tasks per job.")
+@click.option("--variables", type=click.IntRange(min=0), help="Custom shape: plan variables.")
+@click.option(
+    "--layout",
+    "layouts",
+    type=click.Choice(LAYOUTS),
+    multiple=True,
+    help="Spec layouts to generate. Defaults to both.",
+)
+@click.option("-t", "--target", "targets", multiple=True, help="Targets to render. Defaults to all.")
+@click.option("--repeat", type=click.IntRange(min=1), default=5, show_default=True)
+@click.option("-o", "--output", type=click.Path(dir_okay=False, path_type=Path), help="Write JSON results here.")
+@click.option(
+    "--compare",
+    "baseline",
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+    help="Baseline JSON to compare against.",
+)
+@click.option(
+    "--threshold",
+    type=click.FloatRange(min=0),
+    default=0.10,
+    show_default=True,
+    help="Allowed median slowdown before a stage is flagged.",
+)
+def main(
+    scenarios: Tuple[str, ...],
+    stages: Optional[int],
+    jobs: Optional[int],
+    tasks: Optional[int],
+    variables: Optional[int],
+    layouts: Tuple[str, ...],
+    targets: Tuple[str, ...],
+    repeat: int,
+    output: Optional[Path],
+    baseline: Optional[Path],
+    threshold: float,
+) -> None:
+    sizes: List[Tuple[int, int, int, int]] = [SCENARIOS[name] for name in scenarios]
+    custom = (stages, jobs, tasks, variables)
+    if any(value is not None for value in custom) or not sizes:
+        if any(value is not None for value in custom):
+            defaults = SpecShape()
+            sizes.append(
+                (
+                    stages or defaults.stages,
+                    jobs or defaults.jobs,
+                    defaults.tasks if tasks is None else tasks,
+                    defaults.variables if variables is None else variables,
+                )
+            )
+        else:
+            sizes = list(SCENARIOS.values())
+
+    selected_targets = list(targets) or default_renderer_registry().slugs()
+    timings: List[StageTiming] = []
+    for size in sizes:
+        for layout in layouts or LAYOUTS:
+            shape = SpecShape(*size, layout=layout)
+            timings.extend(run_scenario(shape, selected_targets, repeat))
+
+    for timing in timings:
+        label = f"{timing.stage}:{timing.target}" if timing.target else timing.stage
+        size = f" {timing.size:>10} B" if timing.size is not None else ""
+        click.echo(f"{timing.scenario:<34} {label:<18} {timing.median_s * 1000:10.3f} ms{size}", err=True)
+
+    rendered = json.dumps(results_payload(timings), indent=2)
+    if output:
+        output.write_text(rendered + "\n", encoding="utf-8")
+    else:
+        click.echo(rendered)
+
+    if baseline:
+        regressions = compare(timings, load_results(baseline), threshold)
+        for regression in regressions:
+            label = f"{regression.stage}:{regression.target}" if regression.target else regression.stage
+            click.secho(
+                f"REGRESSION {regression.scenario} {label}: "
+                f"{regression.baseline_s * 1000:.3f} ms -> {regression.current_s * 1000:.3f} ms "
+                f"({regression.ratio:.2f}x)",
+                fg="red",
+                err=True,
+            )
+        if regressions:
+            sys.exit(1)
+        click.echo(f"No regressions beyond {threshold:.0%} against {baseline}.", err=True)
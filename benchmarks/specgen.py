@@ -0,0 +1,103 @@
+# SPDX-FileCopyrightText: 2025-present U.N. Owen <void@some.where>
+#
+# SPDX-License-Identifier: MIT
+
+"""Synthetic Bamboo spec generator used by the benchmarks."""
+
+from __future__ import annotations
+
+import random
+from dataclasses import dataclass
+from typing import Any, Dict, List
+
+import yaml
+
+LAYOUTS = ("stages", "jobs")
+
+_COMMANDS = [
+    "mvn -B -DskipTests package",
+    "npm ci",
+    "npm run build -- --prod",
+    "pip install -r requirements.txt",
+    "pytest -q --maxfail=1",
+    "./gradlew assemble",
+    "docker build -t app:${BUILD_NUMBER} .",
+    "echo \"Deploying to ${TARGET_ENV}\"",
+]
+_IMAGES = ["maven:3.9-eclipse-temurin-17", "node:20", "python:3.12-slim", None]
+
+
+@dataclass(frozen=True)
+class SpecShape:
+    """Size knobs for a synthetic spec. ``jobs`` is the number of jobs per stage."""
+
+    stages: int = 3
+    jobs: int = 5
+    tasks: int = 4
+    variables: int = 10
+    layout: str = "stages"
+
+    @property
+    def name(self) -> str:
+        return f"{self.layout}-s{self.stages}-j{self.jobs}-t{self.tasks}-v{self.variables}"
+
+    @property
+    def total_jobs(self) -> int:
+        return self.stages * self.jobs
+
+
+def generate_spec(shape: SpecShape, *, seed: int = 0) -> Dict[str, Any]:
+    """Builds a Bamboo spec mapping with the requested shape.
+
+    The ``stages`` layout nests jobs under ``stages:``; the ``jobs`` layout emits
+    the same jobs as one flat ``jobs:`` list. Job entries alternate between the
+    ``{name: ..., tasks: ...}`` and ``{Job Name: {tasks: ...}}`` forms, and tasks
+    mix list and string scripts, so every parser branch is exercised.
+    """
+    if shape.layout not in LAYOUTS:
+        raise ValueError(f"Unknown layout '{shape.layout}', expected one of {LAYOUTS}.")
+    rng = random.Random(seed)
+
+    spec: Dict[str, Any] = {
+        "plan": {"name": f"Synthetic {shape.name}", "key": "SYN"},
+        "variables": {f"PLAN_VAR_{index}": f"value-{index}" for index in range(shape.variables)},
+    }
+
+    stage_jobs: List[List[Dict[str, Any]]] = []
+    for stage_index in range(shape.stages):
+        jobs = [_job(rng, shape, f"stage{stage_index + 1}-job{job_index + 1}") for job_index in range(shape.jobs)]
+        stage_jobs.append(jobs)
+
+    if shape.layout == "stages":
+        spec["stages"] = [
+            {f"Stage {index + 1}": {"jobs": jobs}} for index, jobs in enumerate(stage_jobs)
+        ]
+    else:
+        spec["jobs"] = [job for jobs in stage_jobs for job in jobs]
+    return spec
+
+
+def generate_spec_text(shape: SpecShape, *, seed: int = 0) -> str:
+    return yaml.safe_dump(generate_spec(shape, seed=seed), sort_keys=False)
+
+
+def _job(rng: random.Random, shape: SpecShape, name: str) -> Dict[str, Any]:
+    tasks: List[Any] = []
+    for task_index in range(shape.tasks):
+        commands = rng.sample(_COMMANDS, k=rng.randint(1, 3))
+        if task_index % 2:
+            tasks.append({"script": commands, "description": f"task {task_index + 1}"})
+        else:
+            tasks.append({"script": " && ".join(commands), "env": {"STEP": str(task_index)}})
+
+    body: Dict[str, Any] = {
+        "tasks": tasks,
+        "variables": {f"JOB_VAR_{index}": rng.choice(["a", "b", "c"]) for index in range(shape.variables // 4)},
+    }
+    image = rng.choice(_IMAGES)
+    if image:
+        body["docker"] = {"image": image}
+
+    if rng.random() < 0.5:
+        return {"name": name, **body}
+    return {name: body}
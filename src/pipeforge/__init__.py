@@ -2,9 +2,21 @@
 #
 # SPDX-License-Identifier: MIT
 
+from __future__ import annotations
+
+from typing import Any
+
 from pipeforge import __about__
-from pipeforge.transpiler import PipelineTranspiler
 
 __version__ = __about__.__version__
 
 __all__ = ["PipelineTranspiler"]
+
+
+def __getattr__(name: str) -> Any:
+    # Deferred so `import pipeforge.cli` does not pull in yaml and every provider.
+    if name == "PipelineTranspiler":
+        from pipeforge.transpiler import PipelineTranspiler
+
+        return PipelineTranspiler
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,201 @@
+# SPDX-FileCopyrightText: 2025-present U.N. Owen <void@some.where>
+#
+# SPDX-License-Identifier: MIT
+
+"""Critical-path and parallelism estimates for a pipeline and its rendered schedules.
+
+Durations come from historical runs (``load_durations``) and fall back to a
+default for jobs without data. Each schedule is a ``job -> jobs it waits
+for`` mapping, as returned by ``BaseRenderer.schedule()``; every job is
+assumed to start as soon as those have finished, with unlimited runners.
+"""
+
+from __future__ import annotations
+
+import json
+import statistics
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+from pipeforge.errors import InvalidPipelineSpecError, PipeForgeError
+from pipeforge.models import Pipeline
+
+DEFAULT_DURATION = 60.0
+SOURCE_SCHEDULE = "source"
+
+
+@dataclass
+class ScheduleEstimate:
+    """Wall time and peak concurrency of one schedule."""
+
+    name: str
+    wall_s: float
+    max_width: int
+    ratio: float = 1.0
+
+
+@dataclass
+class PipelineAnalysis:
+    """Estimates for one pipeline; ``ratio`` compares each schedule to the source's ``needs``."""
+
+    pipeline: str
+    jobs: int
+    levels: int
+    runner_s: float
+    critical_s: float
+    critical_path: List[str] = field(default_factory=list)
+    max_width: int = 0
+    defaulted: int = 0
+    schedules: List[ScheduleEstimate] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, Any]:
+        payload = asdict(self)
+        payload["runner_minutes"] = round(self.runner_s / 60, 3)
+        return payload
+
+
+def load_durations(path: Path) -> Dict[str, float]:
+    """Reads ``{"job": seconds}`` (optionally under ``"jobs"``) from JSON.
+
+    A list of past durations counts as its median.
+    """
+    try:
+        payload = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError) as exc:
+        raise PipeForgeError(f"Failed to read durations from {path}: {exc}") from exc
+    if isinstance(payload, dict) and isinstance(payload.get("jobs"), dict):
+        payload = payload["jobs"]
+    if not isinstance(payload, dict):
+        raise PipeForgeError(f"{path} must map job names to durations in seconds.")
+
+    durations: Dict[str, float] = {}
+    for name, value in payload.items():
+        samples = value if isinstance(value, list) else [value]
+        if not samples or not all(isinstance(sample, (int, float)) and sample >= 0 for sample in samples):
+            raise PipeForgeError(f"Duration of job '{name}' in {path} must be a non-negative number or a list of them.")
+        durations[str(name)] = float(statistics.median(samples))
+    return durations
+
+
+def analyze(
+    pipeline: Pipeline,
+    schedules: Mapping[str, Mapping[str, Tuple[str, ...]]],
+    durations: Optional[Mapping[str, float]] = None,
+    default: float = DEFAULT_DURATION,
+) -> PipelineAnalysis:
+    """Estimates the source's ``needs`` graph and every given schedule."""
+    durations = durations or {}
+    seconds = {job.name: durations.get(job.name, default) for job in pipeline.jobs}
+    needs = {job.name: job.needs for job in pipeline.jobs}
+    # A matrix job occupies one runner per entry for its whole duration.
+    runs = {job.name: len(job.matrix) or 1 for job in pipeline.jobs}
+
+    starts, finishes = _simulate(seconds, needs)
+    critical_path = _critical_path(finishes, needs)
+    critical_s = max(finishes.values(), default=0.0)
+    analysis = PipelineAnalysis(
+        pipeline=pipeline.name,
+        jobs=len(pipeline.jobs),
+        levels=len(pipeline.job_levels()),
+        runner_s=sum(seconds[name] * runs[name] for name in seconds),
+        critical_s=critical_s,
+        critical_path=critical_path,
+        max_width=_max_width(starts, finishes, runs),
+        defaulted=sum(1 for job in pipeline.jobs if job.name not in durations),
+    )
+    analysis.schedules.append(ScheduleEstimate(SOURCE_SCHEDULE, critical_s, analysis.max_width))
+    for name, waits in schedules.items():
+        starts, finishes = _simulate(seconds, waits)
+        wall = max(finishes.values(), default=0.0)
+        ratio = wall / critical_s if critical_s else 1.0
+        analysis.schedules.append(ScheduleEstimate(name, wall, _max_width(starts, finishes, runs), round(ratio, 3)))
+    return analysis
+
+
+def _simulate(
+    seconds: Mapping[str, float],
+    waits: Mapping[str, Tuple[str, ...]],
+) -> Tuple[Dict[str, float], Dict[str, float]]:
+    """Earliest start and finish of every job when each starts once its waits have finished."""
+    starts: Dict[str, float] = {}
+    finishes: Dict[str, float] = {}
+    for root in seconds:
+        if root in finishes:
+            continue
+        # Iterative depth-first walk, as in ``Pipeline.job_levels()``.
+        visiting = {root}
+        stack = [(root, iter(waits.get(root, ())))]
+        while stack:
+            name, pending = stack[-1]
+            for wait in pending:
+                if wait in finishes:
+                    continue
+                if wait in visiting:
+                    raise InvalidPipelineSpecError(f"Job '{name}' is part of a dependency cycle.")
+                if wait not in seconds:
+                    raise InvalidPipelineSpecError(f"Job '{name}' waits for unknown job '{wait}'.")
+                visiting.add(wait)
+                stack.append((wait, iter(waits.get(wait, ()))))
+                break
+            else:
+                stack.pop()
+                visiting.discard(name)
+                starts[name] = max((finishes[wait] for wait in waits.get(name, ())), default=0.0)
+                finishes[name] = starts[name] + seconds[name]
+    return starts, finishes
+
+
+def _critical_path(finishes: Mapping[str, float], waits: Mapping[str, Tuple[str, ...]]) -> List[str]:
+    """Walks back from the last job to finish through the wait that finished last."""
+    if not finishes:
+        return []
+    current: Optional[str] = max(finishes, key=lambda name: finishes[name])
+    path: List[str] = []
+    while current is not None:
+        path.append(current)
+        current = max(waits.get(current, ()), key=lambda name: finishes[name], default=None)
+    return path[::-1]
+
+
+def _max_width(starts: Mapping[str, float], finishes: Mapping[str, float], runs: Mapping[str, int]) -> int:
+    """Peak number of runners busy at once; a job ending frees its runners for one starting then."""
+    events = sorted(
+        [(finish, -runs[name]) for name, finish in finishes.items()]
+        + [(start, runs[name]) for name, start in starts.items()]
+    )
+    width = peak = 0
+    for _, delta in events:
+        width += delta
+        peak = max(peak, width)
+    return peak
+
+
+def format_duration(seconds: float) -> str:
+    whole = int(round(seconds))
+    hours, rest = divmod(whole, 3600)
+    minutes, secs = divmod(rest, 60)
+    if hours:
+        return f"{hours}h {minutes:02d}m {secs:02d}s"
+    if minutes:
+        return f"{minutes}m {secs:02d}s"
+    return f"{secs}s"
+
+
+def format_analysis(analysis: PipelineAnalysis) -> str:
+    """Renders an analysis as a plain-text report with one row per schedule."""
+    lines = [
+        f"Pipeline: {analysis.pipeline} ({analysis.jobs} jobs, {analysis.levels} dependency levels)",
+        f"Critical path: {format_duration(analysis.critical_s)}  {' -> '.join(analysis.critical_path)}",
+        f"Max parallel width: {analysis.max_width} jobs",
+        f"Runner minutes: {analysis.runner_s / 60:.1f} (serial wall time {format_duration(analysis.runner_s)})",
+    ]
+    if analysis.defaulted:
+        lines.append(f"Jobs without duration data: {analysis.defaulted}")
+    lines.append("")
+    lines.append(f"{'schedule':<12} {'wall':>12} {'width':>6} {'vs source':>10}")
+    for schedule in analysis.schedules:
+        lines.append(
+            f"{schedule.name:<12} {format_duration(schedule.wall_s):>12} {schedule.max_width:>6} {schedule.ratio:>9.2f}x"
+        )
+    return "\n".join(lines)
@@ -0,0 +1,142 @@
+# SPDX-FileCopyrightText: 2025-present U.N. Owen <void@some.where>
+#
+# SPDX-License-Identifier: MIT
+
+"""Reading specs out of zip/tar archives and writing converted output into new ones.
+
+Members are streamed one at a time (tar archives in stream mode, so even
+compressed exports are read front to back without seeking), and nothing is
+extracted to disk.
+"""
+
+from __future__ import annotations
+
+import fnmatch
+import io
+import os
+import posixpath
+import tarfile
+import time
+import zipfile
+from pathlib import Path
+from typing import IO, Iterable, Iterator, Optional, Tuple
+
+from pipeforge.errors import PipeForgeError
+
+# Longest suffixes first so ``.tar.gz`` is not mistaken for ``.gz``.
+_TAR_MODES = (
+    (".tar.gz", "gz"),
+    (".tgz", "gz"),
+    (".tar.bz2", "bz2"),
+    (".tbz2", "bz2"),
+    (".tar.xz", "xz"),
+    (".txz", "xz"),
+    (".tar", ""),
+)
+
+
+def archive_kind(path: Path) -> Optional[str]:
+    """Returns ``"zip"`` or ``"tar"`` from the file name, or ``None`` for other files."""
+    name = path.name.lower()
+    if name.endswith(".zip"):
+        return "zip"
+    if any(name.endswith(suffix) for suffix, _ in _TAR_MODES):
+        return "tar"
+    return None
+
+
+def safe_member_name(name: str) -> Optional[str]:
+    """Normalises a member name, or returns ``None`` if it would escape the output root."""
+    normalized = posixpath.normpath(name.replace("\\", "/"))
+    if normalized.startswith(("/", "../")) or normalized in (".", ".."):
+        return None
+    return normalized
+
+
+def iter_members(path: Path, patterns: Iterable[str]) -> Iterator[Tuple[str, IO[bytes]]]:
+    """Yields ``(name, handle)`` for every regular member whose file name matches a pattern.
+
+    Each handle is only valid until the next member is requested.
+    """
+    patterns = tuple(patterns)
+    kind = archive_kind(path)
+    if kind is None:
+        raise PipeForgeError(f"{path} is not a zip or tar archive.")
+    try:
+        if kind == "zip":
+            with zipfile.ZipFile(path) as archive:
+                for info in archive.infolist():
+                    if not info.is_dir() and _matches(info.filename, patterns):
+                        with archive.open(info) as handle:
+                            yield info.filename, handle
+        else:
+            with tarfile.open(path, "r|*") as archive:
+                for member in archive:
+                    if member.isfile() and _matches(member.name, patterns):
+                        handle = archive.extractfile(member)
+                        if handle is not None:
+                            yield member.name, handle
+    except (OSError, zipfile.BadZipFile, tarfile.TarError, EOFError) as exc:
+        raise PipeForgeError(f"Failed to read archive {path}: {exc}") from exc
+
+
+def _matches(name: str, patterns: Tuple[str, ...]) -> bool:
+    base = posixpath.basename(name)
+    return any(fnmatch.fnmatch(base, pattern) for pattern in patterns)
+
+
+class ArchiveWriter:
+    """Writes text members into a new zip or tar archive, replacing ``path`` on success.
+
+    Members go into a temporary file next to ``path`` that is moved into place
+    when the writer closes cleanly, so a failed run leaves no half-written
+    archive behind.
+    """
+
+    def __init__(self, path: Path) -> None:
+        kind = archive_kind(path)
+        if kind is None:
+            raise PipeForgeError(
+                f"Cannot tell the archive format of {path}; use .zip, .tar, .tar.gz, .tar.bz2 or .tar.xz."
+            )
+        self.path = path
+        self.count = 0
+        self._partial = path.with_name(f".{path.name}.partial")
+        self._mtime = time.time()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._zip: Optional[zipfile.ZipFile] = None
+        self._tar: Optional[tarfile.TarFile] = None
+        if kind == "zip":
+            self._zip = zipfile.ZipFile(self._partial, "w", compression=zipfile.ZIP_DEFLATED)
+        else:
+            name = path.name.lower()
+            mode = next(mode for suffix, mode in _TAR_MODES if name.endswith(suffix))
+            self._tar = tarfile.open(self._partial, f"w:{mode}")
+
+    def write(self, name: str, text: str) -> None:
+        data = text.encode("utf-8")
+        if self._zip is not None:
+            self._zip.writestr(name, data)
+        elif self._tar is not None:
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            info.mtime = int(self._mtime)
+            info.mode = 0o644
+            self._tar.addfile(info, io.BytesIO(data))
+        self.count += 1
+
+    def close(self, *, keep: bool = True) -> None:
+        for archive in (self._zip, self._tar):
+            if archive is not None:
+                archive.close()
+        self._zip = self._tar = None
+        if keep:
+            os.replace(self._partial, self.path)
+        else:
+            self._partial.unlink(missing_ok=True)
+
+    def __enter__(self) -> ArchiveWriter:
+        return self
+
+    def __exit__(self, exc_type: object, exc: object, tb: object) -> None:
+        self.close(keep=exc_type is None)
@@ -0,0 +1,164 @@
+# SPDX-FileCopyrightText: 2025-present U.N. Owen <void@some.where>
+#
+# SPDX-License-Identifier: MIT
+
+from __future__ import annotations
+
+import hashlib
+import os
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from pipeforge import __about__
+
+DEFAULT_MAX_SIZE = 256 * 1024 * 1024
+ENTRY_SUFFIX = ".yml"
+
+
+def default_cache_dir() -> Path:
+    """Resolves the cache location from the environment, XDG style."""
+    override = os.environ.get("PIPEFORGE_CACHE_DIR")
+    if override:
+        return Path(override)
+    base = os.environ.get("XDG_CACHE_HOME")
+    return (Path(base) if base else Path.home() / ".cache") / "pipeforge"
+
+
+@dataclass
+class CacheStats:
+    """Snapshot of the on-disk cache footprint."""
+
+    directory: Path
+    entries: int
+    size: int
+    max_size: int
+
+
+class ConversionCache:
+    """Content-addressed store of rendered pipelines with LRU eviction.
+
+    Entries are plain files named after a hash of everything that affects the
+    rendered output. Writes go through a temporary file and an atomic rename,
+    and readers treat vanished files as misses, so parallel workers and
+    processes can share one directory without locking. An entry's mtime is
+    bumped on every hit and eviction removes the least recently used entries
+    once the directory grows past ``max_size`` bytes.
+    """
+
+    def __init__(self, directory: Optional[Path] = None, max_size: int = DEFAULT_MAX_SIZE) -> None:
+        self.directory = Path(directory) if directory else default_cache_dir()
+        self.max_size = max_size
+        self._approx_size: Optional[int] = None
+
+    def key(
+        self,
+        content: bytes,
+        *,
+        source: str,
+        target: str,
+        name: Optional[str] = None,
+        options: str = "",
+    ) -> str:
+        """``options`` names any conversion options that change the output."""
+        digest = hashlib.sha256()
+        for part in (__about__.__version__, source, target, name or "", options):
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\0")
+        digest.update(content)
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        path = self._entry_path(key)
+        try:
+            rendered = path.read_text(encoding="utf-8")
+            os.utime(path)
+        except OSError:
+            return None
+        return rendered
+
+    def put(self, key: str, rendered: str) -> None:
+        path = self._entry_path(key)
+        data = rendered.encode("utf-8")
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+            try:
+                with os.fdopen(fd, "wb") as handle:
+                    handle.write(data)
+                os.replace(tmp_name, path)
+            except BaseException:
+                _unlink(Path(tmp_name))
+                raise
+        except OSError:
+            # The cache is an optimisation; a read-only or full disk must not
+            # fail the conversion itself.
+            return
+
+        if self._approx_size is None:
+            self._approx_size = self._total_size()
+        else:
+            self._approx_size += len(data)
+        if self._approx_size > self.max_size:
+            self.evict()
+
+    def evict(self) -> int:
+        """Drops least recently used entries until the cache fits. Returns the count removed."""
+        entries = self._entries()
+        total = sum(size for _, _, size in entries)
+        # Trim below the limit so a busy cache doesn't rescan on every write.
+        budget = int(self.max_size * 0.9)
+        removed = 0
+        for _, path, size in sorted(entries):
+            if total <= budget:
+                break
+            if _unlink(path):
+                removed += 1
+            total -= size
+        self._approx_size = total
+        return removed
+
+    def clear(self) -> int:
+        removed = 0
+        for _, path, _ in self._entries():
+            if _unlink(path):
+                removed += 1
+        self._approx_size = 0
+        return removed
+
+    def stats(self) -> CacheStats:
+        entries = self._entries()
+        return CacheStats(
+            directory=self.directory,
+            entries=len(entries),
+            size=sum(size for _, _, size in entries),
+            max_size=self.max_size,
+        )
+
+    def _entry_path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}{ENTRY_SUFFIX}"
+
+    def _total_size(self) -> int:
+        return sum(size for _, _, size in self._entries())
+
+    def _entries(self) -> List[Tuple[float, Path, int]]:
+        """Returns ``(mtime, path, size)`` for every entry still on disk."""
+        entries: List[Tuple[float, Path, int]] = []
+        if not self.directory.is_dir():
+            return entries
+        for path in self.directory.glob(f"*/*{ENTRY_SUFFIX}"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, path, stat.st_size))
+        return entries
+
+
+def _unlink(path: Path) -> bool:
+    try:
+        path.unlink()
+    except OSError:
+        return False
+    return True
@@ -0,0 +1,85 @@
+# SPDX-FileCopyrightText: 2025-present U.N. Owen <void@some.where>
+#
+# SPDX-License-Identifier: MIT
+
+"""Well-known dependency caches and their detection from job commands."""
+
+from __future__ import annotations
+
+import re
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Pattern, Tuple
+
+from pipeforge.errors import InvalidPipelineSpecError
+from pipeforge.models import Cache
+
+KNOWN_CACHES: Dict[str, Cache] = {
+    "maven": Cache(
+        "maven",
+        ("~/.m2/repository",),
+        ("**/pom.xml",),
+        {"MAVEN_OPTS": "-Dmaven.repo.local={path}"},
+    ),
+    "gradle": Cache(
+        "gradle",
+        ("~/.gradle/caches", "~/.gradle/wrapper"),
+        ("**/*.gradle*", "gradle/wrapper/gradle-wrapper.properties"),
+        {"GRADLE_USER_HOME": "{path}"},
+    ),
+    "npm": Cache("npm", ("~/.npm",), ("**/package-lock.json",), {"npm_config_cache": "{path}"}),
+    "yarn": Cache("yarn", ("~/.cache/yarn",), ("**/yarn.lock",), {"YARN_CACHE_FOLDER": "{path}"}),
+    "pip": Cache("pip", ("~/.cache/pip",), ("**/requirements*.txt",), {"PIP_CACHE_DIR": "{path}"}),
+}
+
+# Command position: start of a line or after a shell separator, past any
+# ``VAR=value`` prefixes, optionally as a ``./`` wrapper script.
+_START = r"(?:^|[;&|(\n])\s*(?:\w+=\S*\s+)*(?:\./)?"
+_DETECTORS: List[Tuple[str, Pattern[str]]] = [
+    ("maven", re.compile(_START + r"mvnw?(?:\s|$)")),
+    ("gradle", re.compile(_START + r"gradlew?(?:\s|$)")),
+    ("npm", re.compile(_START + r"npm\s+(?:ci|install|i)(?:\s|$)")),
+    ("yarn", re.compile(_START + r"yarn(?:\s|$)")),
+    ("pip", re.compile(_START + r"(?:pip3?|python3?\s+-m\s+pip)\s+install(?:\s|$)")),
+]
+
+
+def detect_caches(commands: Iterable[str]) -> List[Cache]:
+    """Returns the known caches used by ``commands``, in catalog order."""
+    found = set()
+    for command in commands:
+        found.update(_detect_command(command))
+    return [cache for name, cache in KNOWN_CACHES.items() if name in found]
+
+
+@lru_cache(maxsize=4096)
+def _detect_command(command: str) -> Tuple[str, ...]:
+    # Commands repeat heavily across jobs, so detection is memoised per string.
+    return tuple(name for name, pattern in _DETECTORS if pattern.search(command))
+
+
+def cache_from_hint(hint: Any) -> Cache:
+    """Builds a cache from a spec hint: a known name or ``{name, paths, key-files}``."""
+    if isinstance(hint, str):
+        try:
+            return KNOWN_CACHES[hint]
+        except KeyError:
+            known = ", ".join(KNOWN_CACHES)
+            raise InvalidPipelineSpecError(f"Unknown cache '{hint}'. Known caches: {known}.") from None
+    if isinstance(hint, dict) and hint.get("name"):
+        name = str(hint["name"])
+        paths = hint.get("paths", hint.get("path"))
+        if paths is None and name in KNOWN_CACHES:
+            return KNOWN_CACHES[name]
+        if not paths:
+            raise InvalidPipelineSpecError(f"Cache '{name}' needs at least one path.")
+        key_files = hint.get("key-files", hint.get("key_files", ()))
+        return Cache(name, _strings(paths), _strings(key_files))
+    raise InvalidPipelineSpecError(f"Unsupported cache entry: {hint!r}")
+
+
+def _strings(value: Any) -> Tuple[str, ...]:
+    if value is None:
+        return ()
+    if isinstance(value, (list, tuple)):
+        return tuple(str(item) for item in value)
+    return (str(value),)
@@ -0,0 +1,127 @@
+# SPDX-FileCopyrightText: 2025-present U.N. Owen <void@some.where>
+#
+# SPDX-License-Identifier: MIT
+
+"""Path filters: which changed files should run a pipeline, and each of its jobs.
+
+Sources declare filters for the whole pipeline (Bamboo's repository change
+detection, for instance), and ``load_path_map`` reads per-job globs that
+``apply_path_map`` sets on a parsed pipeline. Renderers emit what
+``job_filters`` works out, which keeps artifact producers running whenever a
+job that downloads their artifacts does.
+"""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+from pipeforge import yamlio
+from pipeforge.errors import PipeForgeError
+from pipeforge.models import ANY_PATH, PathFilter, Pipeline
+
+
+def load_path_map(path: Path) -> Dict[str, PathFilter]:
+    """Reads ``{"job": [globs]}`` (optionally under ``"jobs"``) from YAML or JSON.
+
+    A job may also map to ``{"include": [...], "exclude": [...]}``.
+    """
+    try:
+        payload = yamlio.load(path.read_bytes())
+    except (OSError, yamlio.YAMLError) as exc:
+        raise PipeForgeError(f"Failed to read path filters from {path}: {exc}") from exc
+    if isinstance(payload, dict) and isinstance(payload.get("jobs"), dict):
+        payload = payload["jobs"]
+    if not isinstance(payload, dict):
+        raise PipeForgeError(f"{path} must map job names to lists of path globs.")
+
+    filters: Dict[str, PathFilter] = {}
+    for name, value in payload.items():
+        if isinstance(value, dict):
+            unknown = set(value) - {"include", "exclude"}
+            if unknown:
+                raise PipeForgeError(f"Path filter of job '{name}' in {path} has unknown key(s): {sorted(unknown)}.")
+            include, exclude = _globs(value.get("include")), _globs(value.get("exclude"))
+        else:
+            include, exclude = _globs(value), ()
+        if include is None or exclude is None:
+            raise PipeForgeError(f"Path filter of job '{name}' in {path} must be a glob or a list of globs.")
+        filters[str(name)] = PathFilter(include, exclude)
+    return filters
+
+
+def apply_path_map(pipeline: Pipeline, filters: Mapping[str, PathFilter]) -> int:
+    """Sets the filters of the named jobs of ``pipeline``, in place; returns how many jobs matched.
+
+    Names that are not jobs of this pipeline are ignored, so one map can serve
+    a whole tree of specs.
+    """
+    matched = 0
+    for job in pipeline.jobs:
+        if job.name in filters:
+            job.paths = filters[job.name]
+            matched += 1
+    return matched
+
+
+def describe_path_map(filters: Mapping[str, PathFilter]) -> str:
+    """A stable text form of ``filters``, for cache keys and incremental settings."""
+    return json.dumps(
+        {name: [list(item.include), list(item.exclude)] for name, item in sorted(filters.items())},
+        separators=(",", ":"),
+    )
+
+
+def combine_filters(first: PathFilter, second: PathFilter) -> PathFilter:
+    """A filter matching whatever ``first`` or ``second`` matches (and possibly a little more).
+
+    Either side without ``include`` globs matches everything it does not
+    exclude, so the result drops its includes too and keeps the excludes both
+    sides share.
+    """
+    if first.include and second.include:
+        include = tuple(dict.fromkeys(first.include + second.include))
+    else:
+        include = ()
+    exclude = tuple(item for item in first.exclude if item in second.exclude)
+    return PathFilter(include, exclude)
+
+
+def job_filters(pipeline: Pipeline) -> Dict[str, PathFilter]:
+    """The filter every job should be rendered with.
+
+    A job without a filter of its own runs whenever the pipeline does. A job
+    cannot download an artifact from a job that was skipped, so producers
+    also run for every change their subscribers run for.
+    """
+    filters = {job.name: job.paths for job in pipeline.jobs}
+    producers = pipeline.artifact_producers()
+    links = [
+        (producers[item.artifact].name, job.name)
+        for job in pipeline.jobs
+        for item in job.subscriptions
+        if item.artifact in producers
+    ]
+    # Producers can subscribe in turn; widen until nothing changes.
+    changed = bool(links)
+    while changed:
+        changed = False
+        for producer, subscriber in links:
+            if filters[producer] == ANY_PATH:
+                continue
+            widened = combine_filters(filters[producer], filters[subscriber])
+            if widened != filters[producer]:
+                filters[producer] = widened
+                changed = True
+    return filters
+
+
+def _globs(value: Any) -> Optional[Tuple[str, ...]]:
+    if value is None:
+        return ()
+    if isinstance(value, str):
+        return (value,)
+    if isinstance(value, list) and all(isinstance(item, str) for item in value):
+        return tuple(value)
+    return None
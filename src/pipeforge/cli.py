@@ -4,28 +4,205 @@
 
 from __future__ import annotations
 
+import os
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass, field
+from functools import lru_cache
 from pathlib import Path
+from typing import IO, TYPE_CHECKING, Any, Callable, Dict, Iterable, Iterator, List, Tuple
 
 import click
 
 from pipeforge import __about__
+from pipeforge.cache import DEFAULT_MAX_SIZE
 from pipeforge.errors import PipeForgeError
-from pipeforge.transpiler import PipelineTranspiler
+from pipeforge.index import INDEX_FILENAME, FileStateIndex, digest_bytes, write_if_changed
+from pipeforge.reports import BatchReport, format_merged, merge_reports
+from pipeforge.sharding import STRATEGIES, Shard, select
+
+if TYPE_CHECKING:
+    from pipeforge.cache import ConversionCache
+    from pipeforge.models import PathFilter
+    from pipeforge.profiling import Profiler
+    from pipeforge.renderers import RendererRegistry
+    from pipeforge.transpiler import PipelineTranspiler
+
+# Heavy modules (yaml, the transpiler, parsers, and renderers) are imported on
+# demand so `--version`, `list`, and `--help` start quickly.
 
 
 @click.group(invoke_without_command=True, help="Transpile CI/CD pipeline specs between providers.")
-@click.option("--version", is_flag=True, help="Show the PipeForge version and exit.")
+@click.option("--version", is_flag=True, help="Show the PipeForge version and YAML backend, then exit.")
 @click.pass_context
 def app(ctx: click.Context, version: bool) -> None:
     if version:
-        click.echo(__about__.__version__)
+        from pipeforge import yamlio
+
+        click.echo(f"{__about__.__version__} (YAML backend: {yamlio.BACKEND})")
         ctx.exit(0)
     if ctx.invoked_subcommand is None:
         click.echo(ctx.get_help())
         ctx.exit(0)
 
 
-transpiler = PipelineTranspiler()
+@lru_cache(maxsize=None)
+def _default_transpiler() -> PipelineTranspiler:
+    from pipeforge.transpiler import PipelineTranspiler
+
+    return PipelineTranspiler()
+
+
+def _cache_options(command: Callable[..., Any]) -> Callable[..., Any]:
+    """Adds the shared conversion cache options to a command."""
+    options = [
+        click.option(
+            "--cache/--no-cache",
+            "use_cache",
+            default=False,
+            envvar="PIPEFORGE_CACHE",
+            show_default=True,
+            help="Reuse previously rendered output for unchanged inputs.",
+        ),
+        click.option(
+            "--cache-dir",
+            type=click.Path(file_okay=False, path_type=Path),
+            envvar="PIPEFORGE_CACHE_DIR",
+            help="Cache location. Defaults to $XDG_CACHE_HOME/pipeforge.",
+        ),
+        click.option(
+            "--cache-max-mb",
+            type=click.IntRange(min=1),
+            default=DEFAULT_MAX_SIZE // (1024 * 1024),
+            show_default=True,
+            help="Evict least recently used entries beyond this size.",
+        ),
+    ]
+    for option in reversed(options):
+        command = option(command)
+    return command
+
+
+def _profile_options(command: Callable[..., Any]) -> Callable[..., Any]:
+    """Adds the shared profiling options to a command."""
+    options = [
+        click.option("--profile", is_flag=True, help="Print a per-phase timing breakdown to stderr."),
+        click.option(
+            "--trace-file",
+            type=click.Path(dir_okay=False, writable=True, path_type=Path),
+            help="Write every phase as Chrome trace JSON (chrome://tracing, Perfetto).",
+        ),
+        click.option(
+            "--cprofile",
+            "cprofile_file",
+            type=click.Path(dir_okay=False, writable=True, path_type=Path),
+            help="Dump cProfile stats for this process, readable with pstats or snakeviz.",
+        ),
+    ]
+    for option in reversed(options):
+        command = option(command)
+    return command
+
+
+_fold_option = click.option(
+    "--fold-matrix",
+    is_flag=True,
+    help="Fold jobs that differ only in a few env values into matrix jobs before rendering.",
+)
+
+_validate_option = click.option(
+    "--validate",
+    is_flag=True,
+    help="Check every output against the target's bundled schema and fail the input on a mismatch.",
+)
+
+
+_paths_option = click.option(
+    "--paths",
+    "paths_file",
+    type=click.Path(exists=True, dir_okay=False, readable=True, path_type=Path),
+    help="YAML/JSON mapping job names to the path globs whose changes should run them.",
+)
+
+
+def _load_paths(paths_file: Path | None) -> Dict[str, PathFilter] | None:
+    if paths_file is None:
+        return None
+    from pipeforge.changes import load_path_map
+
+    try:
+        return load_path_map(paths_file)
+    except PipeForgeError as exc:
+        click.secho(f"Error: {exc}", fg="red", err=True)
+        raise click.Abort()
+
+
+def _parse_shard(ctx: click.Context, param: click.Parameter, value: str | None) -> Shard | None:
+    if value is None:
+        return None
+    try:
+        return Shard.parse(value)
+    except ValueError as exc:
+        raise click.BadParameter(str(exc)) from None
+
+
+@contextmanager
+def _profiling(profile: bool, trace_file: Path | None, cprofile_file: Path | None) -> Iterator[Profiler | None]:
+    """Yields a profiler when requested and reports it once the command is done."""
+    from pipeforge.profiling import Profiler, format_summary
+
+    profiler = Profiler() if profile or trace_file else None
+    deep = None
+    if cprofile_file:
+        import cProfile
+
+        deep = cProfile.Profile()
+        deep.enable()
+    try:
+        yield profiler
+    finally:
+        if deep is not None and cprofile_file:
+            deep.disable()
+            cprofile_file.parent.mkdir(parents=True, exist_ok=True)
+            deep.dump_stats(str(cprofile_file))
+            click.echo(f"Wrote cProfile stats to {cprofile_file}", err=True)
+        if profiler is not None:
+            if profile and profiler.records:
+                click.echo(format_summary(profiler.summary()), err=True)
+            if trace_file:
+                profiler.write_trace(trace_file)
+                click.echo(f"Wrote trace to {trace_file}", err=True)
+
+
+def _make_cache(cache_dir: Path | None, cache_max_mb: int) -> ConversionCache:
+    from pipeforge.cache import ConversionCache
+
+    return ConversionCache(cache_dir, max_size=cache_max_mb * 1024 * 1024)
+
+
+def _transpiler_for(
+    use_cache: bool = False,
+    cache_dir: Path | None = None,
+    cache_max_mb: int = DEFAULT_MAX_SIZE // (1024 * 1024),
+    profiler: Profiler | None = None,
+    fold_matrix: bool = False,
+    validate: bool = False,
+    renderers: RendererRegistry | None = None,
+    paths: Dict[str, PathFilter] | None = None,
+) -> PipelineTranspiler:
+    from pipeforge.transpiler import PipelineTranspiler
+
+    transpiler = _default_transpiler()
+    if not use_cache and profiler is None and not fold_matrix and not validate and renderers is None and not paths:
+        return transpiler
+    return PipelineTranspiler(
+        transpiler.parsers,
+        renderers or transpiler.renderers,
+        cache=_make_cache(cache_dir, cache_max_mb) if use_cache else None,
+        profiler=profiler,
+        fold_matrix=fold_matrix,
+        validate=validate,
+        paths=paths,
+    )
 
 
 @app.command(help="Transpile a CI pipeline definition to a new target.")
@@ -39,30 +216,950 @@ transpiler = PipelineTranspiler()
     type=click.Path(file_okay=True, dir_okay=False, writable=True, path_type=Path),
     help="Optional path to write the generated pipeline. Prints to stdout when omitted.",
 )
+@click.option(
+    "-d",
+    "--output-dir",
+    type=click.Path(file_okay=False, writable=True, path_type=Path),
+    help="Write each target to its conventional path (e.g. .gitlab-ci.yml) under this directory.",
+)
 @click.option("-s", "--source", default="bamboo", show_default=True, help="Source CI format.")
-@click.option("-t", "--target", default="bitbucket", show_default=True, help="Target CI format.")
+@click.option(
+    "-t",
+    "--target",
+    "targets",
+    multiple=True,
+    default=("bitbucket",),
+    show_default=True,
+    help="Target CI format. Repeat for several targets or pass 'all'.",
+)
 @click.option("--name", help="Override the pipeline name inside the rendered file.")
-def convert(input: Path, output: Path | None, source: str, target: str, name: str | None) -> None:
+@click.option(
+    "--split",
+    type=click.IntRange(min=2),
+    help="Split GitLab output into this many child pipelines, triggered from .gitlab-ci.yml (needs --output-dir).",
+)
+@click.option(
+    "--split-by",
+    type=click.Choice(["jobs", "cost"]),
+    default="jobs",
+    show_default=True,
+    help="Balance child pipelines by job runs, or by estimated cost from --durations.",
+)
+@click.option(
+    "--durations",
+    type=click.Path(exists=True, dir_okay=False, readable=True, path_type=Path),
+    help="JSON mapping job names to seconds (as for analyze), used by --split-by cost.",
+)
+@_fold_option
+@_validate_option
+@_paths_option
+@_cache_options
+@_profile_options
+def convert(
+    input: Path,
+    output: Path | None,
+    output_dir: Path | None,
+    source: str,
+    targets: Tuple[str, ...],
+    name: str | None,
+    split: int | None,
+    split_by: str,
+    durations: Path | None,
+    fold_matrix: bool,
+    validate: bool,
+    paths_file: Path | None,
+    use_cache: bool,
+    cache_dir: Path | None,
+    cache_max_mb: int,
+    profile: bool,
+    trace_file: Path | None,
+    cprofile_file: Path | None,
+) -> None:
+    paths = _load_paths(paths_file)
+    with _profiling(profile, trace_file, cprofile_file) as profiler:
+        try:
+            renderers = _split_renderers(split, split_by, durations) if split else None
+        except PipeForgeError as exc:
+            click.secho(f"Error: {exc}", fg="red", err=True)
+            raise click.Abort()
+        converter = _transpiler_for(
+            use_cache, cache_dir, cache_max_mb, profiler, fold_matrix, validate, renderers, paths
+        )
+        resolved = converter.resolve_targets(targets)
+        if output and output_dir:
+            raise click.UsageError("Use either --output or --output-dir, not both.")
+        if len(resolved) > 1 and not output_dir:
+            raise click.UsageError("Converting to several targets requires --output-dir.")
+        if split and (not output_dir or "gitlab" not in resolved):
+            raise click.UsageError("--split writes several GitLab files; use it with --target gitlab and --output-dir.")
+
+        try:
+            if split:
+                files = converter.convert_files(input, source=source, targets=resolved, name=name)
+            elif output:
+                # A single file is streamed to disk as the renderer visits jobs.
+                _stream_output(
+                    output,
+                    lambda handle: converter.convert_to(input, handle, source=source, target=resolved[0], name=name),
+                )
+            else:
+                outputs = converter.convert_targets(input, source=source, targets=resolved, name=name)
+        except PipeForgeError as exc:
+            click.secho(f"Error: {exc}", fg="red", err=True)
+            raise click.Abort()
+
+    if fold_matrix:
+        # stderr, so folding never ends up in a pipeline printed to stdout.
+        click.echo(str(converter.folds), err=True)
+    if output:
+        click.echo(f"Wrote {resolved[0]} pipeline to {output} ({_format_size(output.stat().st_size)})")
+        return
+    if split and output_dir:
+        for target, rendered_files in files.items():
+            for relative, rendered in rendered_files.items():
+                destination = output_dir / relative
+                _write_output(destination, rendered)
+                click.echo(f"Wrote {target} pipeline to {destination} ({_rendered_size(rendered)})")
+        return
+    if output_dir:
+        for target, rendered in outputs.items():
+            destination = output_dir / converter.renderers.get(target).default_output_path()
+            _write_output(destination, rendered)
+            click.echo(f"Wrote {target} pipeline to {destination} ({_rendered_size(rendered)})")
+        return
+    click.echo(next(iter(outputs.values())))
+
+
+def _split_renderers(split: int, split_by: str, durations: Path | None) -> RendererRegistry:
+    """The default renderers, with GitLab output split into ``split`` child pipelines."""
+    from pipeforge.analysis import load_durations
+    from pipeforge.renderers import default_renderer_registry
+    from pipeforge.renderers.gitlab import GitLabRenderer
+
+    known = load_durations(durations) if durations else None
+    renderers = default_renderer_registry()
+    renderers.register(GitLabRenderer(split=split, split_by=split_by, durations=known))
+    return renderers
+
+
+def _write_output(destination: Path, rendered: str) -> None:
+    destination.parent.mkdir(parents=True, exist_ok=True)
+    destination.write_text(rendered, encoding="utf-8")
+
+
+def _stream_output(destination: Path, write: Callable[[IO[str]], None]) -> None:
+    """Lets ``write`` fill a temporary file, then moves it over ``destination``.
+
+    A conversion that fails halfway leaves any previous output untouched.
+    """
+    destination.parent.mkdir(parents=True, exist_ok=True)
+    partial = destination.with_name(f".{destination.name}.partial")
     try:
-        rendered = transpiler.convert_path(input, source=source, target=target, name=name)
+        with partial.open("w", encoding="utf-8") as handle:
+            write(handle)
+        os.replace(partial, destination)
+    except BaseException:
+        partial.unlink(missing_ok=True)
+        raise
+
+
+@app.command("convert-bundle", help="Stream a multi-document YAML bundle, converting each plan as it is read.")
+@click.argument(
+    "bundle",
+    type=click.Path(exists=True, dir_okay=False, readable=True, path_type=Path),
+)
+@click.argument(
+    "output_dir",
+    type=click.Path(file_okay=False, writable=True, path_type=Path),
+)
+@click.option("-s", "--source", default="bamboo", show_default=True, help="Source CI format.")
+@click.option(
+    "-t",
+    "--target",
+    "targets",
+    multiple=True,
+    default=("bitbucket",),
+    show_default=True,
+    help="Target CI format. Repeat for several targets or pass 'all'.",
+)
+@click.option("--name", help="Override the pipeline name of every document.")
+@_fold_option
+@_validate_option
+@_paths_option
+@_profile_options
+@click.pass_context
+def convert_bundle(
+    ctx: click.Context,
+    bundle: Path,
+    output_dir: Path,
+    source: str,
+    targets: Tuple[str, ...],
+    name: str | None,
+    fold_matrix: bool,
+    validate: bool,
+    paths_file: Path | None,
+    profile: bool,
+    trace_file: Path | None,
+    cprofile_file: Path | None,
+) -> None:
+    converted = 0
+    failed = 0
+    paths = _load_paths(paths_file)
+    with _profiling(profile, trace_file, cprofile_file) as profiler:
+        transpiler = _transpiler_for(profiler=profiler, fold_matrix=fold_matrix, validate=validate, paths=paths)
+        try:
+            for result in transpiler.convert_documents(bundle, source=source, targets=targets, name=name):
+                if result.error is not None:
+                    failed += 1
+                    click.secho(f"Failed {result.error}", fg="red", err=True)
+                    continue
+                for target, rendered in result.outputs.items():
+                    relative = transpiler.renderers.get(target).default_output_path()
+                    _write_output(output_dir / result.name / relative, rendered)
+                converted += 1
+        except PipeForgeError as exc:
+            click.secho(f"Error: {exc}", fg="red", err=True)
+            raise click.Abort()
+
+    click.echo(f"Converted {converted} document(s) from {bundle} into {output_dir}, {failed} failed.")
+    if fold_matrix:
+        click.echo(str(transpiler.folds))
+    if failed:
+        ctx.exit(1)
+
+
+@app.command("convert-tree", help="Transpile every spec under a directory, mirroring its layout.")
+@click.argument(
+    "input_dir",
+    type=click.Path(exists=True, file_okay=False, readable=True, path_type=Path),
+)
+@click.argument(
+    "output_dir",
+    type=click.Path(file_okay=False, writable=True, path_type=Path),
+)
+@click.option("-s", "--source", default="bamboo", show_default=True, help="Source CI format.")
+@click.option("-t", "--target", default="bitbucket", show_default=True, help="Target CI format.")
+@click.option(
+    "-p",
+    "--pattern",
+    "patterns",
+    multiple=True,
+    default=("*.yml", "*.yaml"),
+    show_default=True,
+    help="Glob pattern selecting spec files. Repeat to add more.",
+)
+@click.option("-j", "--jobs", type=click.IntRange(min=1), help="Number of workers. Defaults to the CPU count.")
+@click.option(
+    "--executor",
+    type=click.Choice(["process", "thread"]),
+    default="process",
+    show_default=True,
+    help="Worker pool used for the conversions.",
+)
+@click.option(
+    "--incremental",
+    is_flag=True,
+    help=f"Skip inputs unchanged since the last run, tracked in <output-dir>/{INDEX_FILENAME}.",
+)
+@click.option(
+    "--shard",
+    metavar="INDEX/COUNT",
+    callback=_parse_shard,
+    help="Only convert this shard of the inputs, e.g. 2/8 on the second of eight nodes.",
+)
+@click.option(
+    "--shard-by",
+    type=click.Choice(STRATEGIES),
+    default="hash",
+    show_default=True,
+    help="'hash' keeps assignments stable as inputs come and go; 'size' also balances shards by bytes.",
+)
+@click.option(
+    "--report",
+    "report_path",
+    type=click.Path(dir_okay=False, path_type=Path),
+    help="Write a JSON report with every input's status and timing (see merge-reports).",
+)
+@_fold_option
+@_validate_option
+@_paths_option
+@_cache_options
+@_profile_options
+@click.pass_context
+def convert_tree(
+    ctx: click.Context,
+    input_dir: Path,
+    output_dir: Path,
+    source: str,
+    target: str,
+    patterns: Tuple[str, ...],
+    jobs: int | None,
+    executor: str,
+    incremental: bool,
+    shard: Shard | None,
+    shard_by: str,
+    report_path: Path | None,
+    fold_matrix: bool,
+    validate: bool,
+    paths_file: Path | None,
+    use_cache: bool,
+    cache_dir: Path | None,
+    cache_max_mb: int,
+    profile: bool,
+    trace_file: Path | None,
+    cprofile_file: Path | None,
+) -> None:
+    paths = _load_paths(paths_file)
+    index = _load_index(output_dir, source, target, fold_matrix, paths, validate) if incremental else None
+    report = BatchReport(source, target, str(shard) if shard else None, shard_by) if report_path else None
+    with _profiling(profile, trace_file, cprofile_file) as profiler:
+        converter = _transpiler_for(use_cache, cache_dir, cache_max_mb, profiler, fold_matrix, validate, paths=paths)
+        try:
+            summary = _convert_tree(
+                converter,
+                input_dir,
+                output_dir,
+                source,
+                target,
+                patterns,
+                jobs,
+                executor,
+                index,
+                shard=shard,
+                shard_by=shard_by,
+                report=report,
+            )
+        except PipeForgeError as exc:
+            click.secho(f"Error: {exc}", fg="red", err=True)
+            raise click.Abort()
+
+    message = f"Converted {summary.converted} spec(s) to {target} in {output_dir}, {len(summary.failures)} failed."
+    if incremental:
+        message += f" Skipped {summary.unchanged} unchanged."
+    if shard:
+        message = f"Shard {shard}: {message}"
+    click.echo(message)
+    if fold_matrix:
+        click.echo(str(converter.folds))
+    if report is not None and report_path is not None:
+        report.write(report_path)
+        click.echo(f"Wrote report to {report_path}")
+    if summary.failures:
+        ctx.exit(1)
+
+
+@app.command(
+    "convert-archive",
+    help="Transpile every spec inside a zip or tar archive without extracting it. "
+    "OUTPUT is a directory, or a new archive when it ends in .zip, .tar, .tar.gz, .tar.bz2 or .tar.xz.",
+)
+@click.argument(
+    "archive",
+    type=click.Path(exists=True, dir_okay=False, readable=True, path_type=Path),
+)
+@click.argument("output", type=click.Path(writable=True, path_type=Path))
+@click.option("-s", "--source", default="bamboo", show_default=True, help="Source CI format.")
+@click.option("-t", "--target", default="bitbucket", show_default=True, help="Target CI format.")
+@click.option(
+    "-p",
+    "--pattern",
+    "patterns",
+    multiple=True,
+    default=("*.yml", "*.yaml"),
+    show_default=True,
+    help="Glob pattern selecting spec members by file name. Repeat to add more.",
+)
+@click.option(
+    "-j",
+    "--jobs",
+    type=click.IntRange(min=1),
+    default=1,
+    show_default=True,
+    help="Number of workers. With 1, each member is streamed straight into the loader.",
+)
+@click.option(
+    "--executor",
+    type=click.Choice(["process", "thread"]),
+    default="process",
+    show_default=True,
+    help="Worker pool used when --jobs is above 1.",
+)
+@_fold_option
+@_validate_option
+@_paths_option
+@_cache_options
+@_profile_options
+@click.pass_context
+def convert_archive(
+    ctx: click.Context,
+    archive: Path,
+    output: Path,
+    source: str,
+    target: str,
+    patterns: Tuple[str, ...],
+    jobs: int,
+    executor: str,
+    fold_matrix: bool,
+    validate: bool,
+    paths_file: Path | None,
+    use_cache: bool,
+    cache_dir: Path | None,
+    cache_max_mb: int,
+    profile: bool,
+    trace_file: Path | None,
+    cprofile_file: Path | None,
+) -> None:
+    from pipeforge.archives import ArchiveWriter, archive_kind
+
+    converted = 0
+    failed = 0
+    paths = _load_paths(paths_file)
+    with _profiling(profile, trace_file, cprofile_file) as profiler:
+        converter = _transpiler_for(use_cache, cache_dir, cache_max_mb, profiler, fold_matrix, validate, paths=paths)
+        try:
+            writer = ArchiveWriter(output) if archive_kind(output) else None
+            with writer or nullcontext():
+                results = converter.convert_archive(
+                    archive,
+                    source=source,
+                    target=target,
+                    patterns=patterns,
+                    executor=executor if jobs > 1 else None,
+                    max_workers=jobs,
+                )
+                for result in results:
+                    member = result.input_path.as_posix()
+                    if result.error is not None:
+                        failed += 1
+                        click.secho(f"Failed {member}: {result.error}", fg="red", err=True)
+                        continue
+                    if writer is not None:
+                        writer.write(member, result.rendered or "")
+                    else:
+                        write_if_changed(output / member, result.rendered or "")
+                    converted += 1
+        except PipeForgeError as exc:
+            click.secho(f"Error: {exc}", fg="red", err=True)
+            raise click.Abort()
+
+    click.echo(f"Converted {converted} spec(s) from {archive} to {target} in {output}, {failed} failed.")
+    if fold_matrix:
+        click.echo(str(converter.folds))
+    if failed:
+        ctx.exit(1)
+
+
+@app.command(help="Watch a directory and re-convert only the specs that change.")
+@click.argument(
+    "input_dir",
+    type=click.Path(exists=True, file_okay=False, readable=True, path_type=Path),
+)
+@click.argument(
+    "output_dir",
+    type=click.Path(file_okay=False, writable=True, path_type=Path),
+)
+@click.option("-s", "--source", default="bamboo", show_default=True, help="Source CI format.")
+@click.option("-t", "--target", default="bitbucket", show_default=True, help="Target CI format.")
+@click.option(
+    "-p",
+    "--pattern",
+    "patterns",
+    multiple=True,
+    default=("*.yml", "*.yaml"),
+    show_default=True,
+    help="Glob pattern selecting spec files. Repeat to add more.",
+)
+@click.option(
+    "--interval",
+    type=click.FloatRange(min=0.05),
+    default=1.0,
+    show_default=True,
+    help="Seconds between scans.",
+)
+def watch(
+    input_dir: Path,
+    output_dir: Path,
+    source: str,
+    target: str,
+    patterns: Tuple[str, ...],
+    interval: float,
+) -> None:
+    import time
+
+    converter = _default_transpiler()
+    index = _load_index(output_dir, source, target)
+    click.echo(f"Watching {input_dir} for changes (Ctrl+C to stop)...")
+    first = True
+    try:
+        while True:
+            try:
+                # Known failures are printed on the first pass only, not on every scan.
+                summary = _convert_tree(
+                    converter,
+                    input_dir,
+                    output_dir,
+                    source,
+                    target,
+                    patterns,
+                    1,
+                    "thread",
+                    index,
+                    quiet_repeats=not first,
+                )
+            except PipeForgeError as exc:
+                click.secho(f"Error: {exc}", fg="red", err=True)
+                raise click.Abort()
+            fresh_failures = len(summary.failures) - (0 if first else summary.repeated)
+            first = False
+            if summary.converted or fresh_failures or summary.removed:
+                click.echo(
+                    f"[{time.strftime('%H:%M:%S')}] Re-converted {summary.converted} spec(s), "
+                    f"rewrote {summary.written} output(s), removed {summary.removed}, "
+                    f"{len(summary.failures)} failed."
+                )
+            time.sleep(interval)
+    except KeyboardInterrupt:
+        click.echo("Stopped watching.")
+
+
+@dataclass
+class _TreeSummary:
+    converted: int = 0
+    unchanged: int = 0
+    written: int = 0
+    removed: int = 0
+    failures: List[Tuple[Path, PipeForgeError]] = field(default_factory=list)
+    # Failures of unchanged inputs, reported again from the index.
+    repeated: int = 0
+
+
+def _load_index(
+    output_dir: Path,
+    source: str,
+    target: str,
+    fold_matrix: bool = False,
+    paths: Dict[str, PathFilter] | None = None,
+    validate: bool = False,
+) -> FileStateIndex:
+    settings: Dict[str, Any] = {"source": source, "target": target, "pipeforge": __about__.__version__}
+    if fold_matrix:
+        settings["fold_matrix"] = True
+    if validate:
+        settings["validate"] = True
+    if paths:
+        from pipeforge.changes import describe_path_map
+
+        # Changed filters change the outputs, so they invalidate the index.
+        settings["paths"] = digest_bytes(describe_path_map(paths).encode("utf-8"))
+    return FileStateIndex.load(output_dir / INDEX_FILENAME, settings)
+
+
+def _convert_tree(
+    converter: PipelineTranspiler,
+    input_dir: Path,
+    output_dir: Path,
+    source: str,
+    target: str,
+    patterns: Iterable[str],
+    jobs: int | None,
+    executor: str,
+    index: FileStateIndex | None,
+    *,
+    shard: Shard | None = None,
+    shard_by: str = "hash",
+    report: BatchReport | None = None,
+    quiet_repeats: bool = False,
+) -> _TreeSummary:
+    """Converts the specs under ``input_dir``; with an index, only the changed ones.
+
+    Unchanged inputs that failed before count as failures again, without
+    being reconverted; ``quiet_repeats`` stops them from being printed.
+    With a ``shard``, only the specs assigned to it are converted; outputs of
+    specs that belong to other shards are left alone.
+    """
+    import time
+
+    start = time.perf_counter()
+    summary = _TreeSummary()
+    discovered = _discover_specs(input_dir, patterns, exclude=output_dir)
+    keys = {spec: spec.relative_to(input_dir).as_posix() for spec in discovered}
+    sizes = _spec_sizes(discovered) if report is not None or shard_by == "size" else {}
+    specs = discovered
+    if shard is not None:
+        items = [(keys[spec], sizes.get(spec, 0)) for spec in discovered]
+        specs = [discovered[position] for position in select(items, shard, by=shard_by)]
+    pending: List[Path] = specs
+    states: Dict[Path, Tuple[os.stat_result, str]] = {}
+
+    if index is not None:
+        # Staleness is judged against every discovered spec so shards never
+        # delete outputs that belong to another shard.
+        for key in index.stale_keys(keys.values()):
+            state = index.forget(key)
+            for output in state.outputs if state else ():
+                try:
+                    (output_dir / output).unlink()
+                    summary.removed += 1
+                except OSError:
+                    pass
+        pending = []
+        for spec in specs:
+            try:
+                changed, stat, digest = index.check(keys[spec], spec, output_dir)
+                # Hash before converting so an edit made mid-run is caught next pass.
+                if changed and digest is None:
+                    digest = digest_bytes(spec.read_bytes())
+            except OSError:
+                continue
+            if changed:
+                pending.append(spec)
+                states[spec] = (stat, digest)
+                continue
+            error = index.entries[keys[spec]].error
+            if error is not None:
+                relative = spec.relative_to(input_dir)
+                summary.failures.append((relative, PipeForgeError(error)))
+                summary.repeated += 1
+                if not quiet_repeats:
+                    click.secho(f"Failed {relative} (unchanged): {error}", fg="red", err=True)
+                if report is not None:
+                    report.add(keys[spec], "failed", size=sizes.get(spec, 0), error=error)
+            else:
+                summary.unchanged += 1
+                if report is not None:
+                    report.add(keys[spec], "unchanged", size=sizes.get(spec, 0))
+
+    results = converter.convert_many(
+        pending,
+        source=source,
+        target=target,
+        ordered=False,
+        executor=executor,
+        max_workers=jobs,
+    )
+    for result in results:
+        relative = result.input_path.relative_to(input_dir)
+        if report is not None:
+            report.add(
+                relative.as_posix(),
+                "failed" if result.error is not None else "converted",
+                seconds=result.seconds,
+                size=sizes.get(result.input_path, 0),
+                error=str(result.error) if result.error is not None else None,
+            )
+        if result.error is not None:
+            summary.failures.append((relative, result.error))
+            click.secho(f"Failed {relative}: {result.error}", fg="red", err=True)
+            if index is not None:
+                # Indexed with its error, so it is reported again but only retried once edited.
+                stat, digest = states[result.input_path]
+                index.record(relative.as_posix(), stat, digest, {}, str(result.error))
+            continue
+        rendered = result.rendered or ""
+        if write_if_changed(output_dir / relative, rendered):
+            summary.written += 1
+        summary.converted += 1
+        if index is not None:
+            stat, digest = states[result.input_path]
+            outputs = {relative.as_posix(): digest_bytes(rendered.encode("utf-8"))}
+            index.record(relative.as_posix(), stat, digest, outputs)
+
+    if index is not None:
+        index.save()
+    if report is not None:
+        report.wall_s = time.perf_counter() - start
+    return summary
+
+
+def _spec_sizes(specs: Iterable[Path]) -> Dict[Path, int]:
+    sizes: Dict[Path, int] = {}
+    for spec in specs:
+        try:
+            sizes[spec] = spec.stat().st_size
+        except OSError:
+            sizes[spec] = 0
+    return sizes
+
+
+def _discover_specs(root: Path, patterns: Iterable[str], exclude: Path | None = None) -> List[Path]:
+    """Returns the sorted spec files under ``root`` matching any of ``patterns``."""
+    excluded = exclude.resolve() if exclude else None
+    found = set()
+    for pattern in patterns:
+        for path in root.rglob(pattern):
+            if not path.is_file():
+                continue
+            if excluded and excluded in path.resolve().parents:
+                continue
+            found.add(path)
+    return sorted(found)
+
+
+@app.command(help="Estimate the critical path, parallelism, and wall time of each target's schedule.")
+@click.argument(
+    "input",
+    type=click.Path(exists=True, dir_okay=False, readable=True, path_type=Path),
+)
+@click.option("-s", "--source", default="bamboo", show_default=True, help="Source CI format.")
+@click.option(
+    "-t",
+    "--target",
+    "targets",
+    multiple=True,
+    default=("all",),
+    show_default=True,
+    help="Target schedules to estimate. Repeat for several targets.",
+)
+@click.option(
+    "--durations",
+    type=click.Path(exists=True, dir_okay=False, readable=True, path_type=Path),
+    help="JSON mapping job names to seconds, or to lists of past durations (the median is used).",
+)
+@click.option(
+    "--default-duration",
+    type=click.FloatRange(min=0),
+    default=60.0,
+    show_default=True,
+    help="Seconds assumed for jobs without duration data.",
+)
+@click.option("--format", "output_format", type=click.Choice(["table", "json"]), default="table", show_default=True)
+@click.option("--name", help="Override the pipeline name.")
+def analyze(
+    input: Path,
+    source: str,
+    targets: Tuple[str, ...],
+    durations: Path | None,
+    default_duration: float,
+    output_format: str,
+    name: str | None,
+) -> None:
+    import json
+
+    from pipeforge.analysis import analyze as analyze_pipeline
+    from pipeforge.analysis import format_analysis, load_durations
+
+    converter = _default_transpiler()
+    try:
+        pipeline = converter.parse_path(input, source=source, name=name)
+        schedules = {
+            slug: converter.renderers.get(slug).schedule(pipeline) for slug in converter.resolve_targets(targets)
+        }
+        known = load_durations(durations) if durations else {}
+        analysis = analyze_pipeline(pipeline, schedules, known, default_duration)
     except PipeForgeError as exc:
         click.secho(f"Error: {exc}", fg="red", err=True)
         raise click.Abort()
 
+    if output_format == "json":
+        click.echo(json.dumps(analysis.to_dict(), indent=2))
+    else:
+        click.echo(format_analysis(analysis))
+
+
+@app.command(help="Check rendered pipeline files against the bundled target schemas, offline.")
+@click.argument(
+    "files",
+    nargs=-1,
+    required=True,
+    type=click.Path(exists=True, dir_okay=False, readable=True, path_type=Path),
+)
+@click.option(
+    "-t",
+    "--target",
+    help="Target format of every file. Inferred from names like .gitlab-ci.yml when omitted.",
+)
+@click.pass_context
+def validate(ctx: click.Context, files: Tuple[Path, ...], target: str | None) -> None:
+    from pipeforge.validation import has_schema, target_for_path, validate_text
+
+    invalid = 0
+    for path in files:
+        slug = target or target_for_path(path)
+        if slug is None:
+            raise click.UsageError(f"Cannot tell the target of {path}; pass --target.")
+        if not has_schema(slug):
+            raise click.UsageError(f"No schema is bundled for target '{slug}'.")
+        try:
+            issues = validate_text(slug, path.read_text(encoding="utf-8"), str(path))
+        except (OSError, PipeForgeError) as exc:
+            click.secho(f"Error: {exc}", fg="red", err=True)
+            raise click.Abort()
+        if not issues:
+            click.echo(f"{path}: valid {slug} pipeline")
+            continue
+        invalid += 1
+        click.secho(f"{path}: {len(issues)} problem(s) for {slug}", fg="red")
+        for issue in issues:
+            click.echo(f"  - {issue}")
+    if invalid:
+        ctx.exit(1)
+
+
+@app.command("merge-reports", help="Combine the JSON reports of several shards into one summary.")
+@click.argument(
+    "reports",
+    nargs=-1,
+    required=True,
+    type=click.Path(exists=True, dir_okay=False, readable=True, path_type=Path),
+)
+@click.option(
+    "-o",
+    "--output",
+    type=click.Path(dir_okay=False, path_type=Path),
+    help="Also write the merged summary as JSON.",
+)
+@click.option("--slowest", type=click.IntRange(min=0), default=10, show_default=True, help="Inputs to list by time.")
+@click.pass_context
+def merge_reports_command(ctx: click.Context, reports: Tuple[Path, ...], output: Path | None, slowest: int) -> None:
+    import json
+
+    try:
+        summary = merge_reports([BatchReport.load(path) for path in reports], slowest=slowest)
+    except PipeForgeError as exc:
+        click.secho(f"Error: {exc}", fg="red", err=True)
+        raise click.Abort()
+
+    click.echo(format_merged(summary))
+    if summary["missing_shards"]:
+        missing = ", ".join(str(index) for index in summary["missing_shards"])
+        click.secho(f"Warning: no report for shard(s) {missing}.", fg="yellow", err=True)
+    if summary["mixed_shard_counts"]:
+        click.secho("Warning: reports were sharded with different shard counts.", fg="yellow", err=True)
+    if summary["duplicates"]:
+        click.secho(f"Warning: {len(summary['duplicates'])} input(s) appear in several reports.", fg="yellow", err=True)
     if output:
         output.parent.mkdir(parents=True, exist_ok=True)
-        output.write_text(rendered, encoding="utf-8")
-        click.echo(f"Wrote {target} pipeline to {output}")
-    else:
-        click.echo(rendered)
+        output.write_text(json.dumps(summary, indent=1) + "\n", encoding="utf-8")
+    if summary["failed"]:
+        ctx.exit(1)
+
+
+@app.command(help="Serve conversions over local HTTP with a warm transpiler.")
+@click.option("--host", default="127.0.0.1", show_default=True, help="Interface to bind.")
+@click.option("--port", type=click.IntRange(min=0, max=65535), default=8765, show_default=True)
+@click.option(
+    "--socket",
+    "socket_path",
+    type=click.Path(dir_okay=False, path_type=Path),
+    help="Listen on this Unix socket instead of TCP.",
+)
+@click.option("-w", "--workers", type=click.IntRange(min=1), default=4, show_default=True)
+@click.option(
+    "--backlog",
+    type=click.IntRange(min=0),
+    default=16,
+    show_default=True,
+    help="Requests allowed to wait for a worker before new ones get 503.",
+)
+@click.option("-v", "--verbose", is_flag=True, help="Log every request to stderr.")
+@_cache_options
+def serve(
+    host: str,
+    port: int,
+    socket_path: Path | None,
+    workers: int,
+    backlog: int,
+    verbose: bool,
+    use_cache: bool,
+    cache_dir: Path | None,
+    cache_max_mb: int,
+) -> None:
+    from pipeforge.server import create_server
+
+    converter = _transpiler_for(use_cache, cache_dir, cache_max_mb)
+    # Resolve every provider up front so the first request is already warm.
+    for slug in converter.available_sources():
+        converter.parsers.get(slug)
+    for slug in converter.available_targets():
+        converter.renderers.get(slug)
+
+    try:
+        server = create_server(
+            converter,
+            host=host,
+            port=port,
+            socket_path=str(socket_path) if socket_path else None,
+            workers=workers,
+            backlog=backlog,
+            verbose=verbose,
+        )
+    except (OSError, PipeForgeError) as exc:
+        click.secho(f"Error: {exc}", fg="red", err=True)
+        raise click.Abort()
+
+    where = socket_path or "http://{}:{}".format(*server.server_address[:2])
+    click.echo(f"Serving conversions on {where} with {workers} worker(s) (Ctrl+C to stop)...")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if socket_path:
+            socket_path.unlink(missing_ok=True)
+    click.echo("Server stopped.")
+
+
+@app.group(help="Inspect or empty the conversion cache.")
+@click.option(
+    "--cache-dir",
+    type=click.Path(file_okay=False, path_type=Path),
+    envvar="PIPEFORGE_CACHE_DIR",
+    help="Cache location. Defaults to $XDG_CACHE_HOME/pipeforge.",
+)
+@click.option(
+    "--cache-max-mb",
+    type=click.IntRange(min=1),
+    default=DEFAULT_MAX_SIZE // (1024 * 1024),
+    show_default=True,
+    help="Configured size limit, reported by 'stats'.",
+)
+@click.pass_context
+def cache(ctx: click.Context, cache_dir: Path | None, cache_max_mb: int) -> None:
+    ctx.obj = _make_cache(cache_dir, cache_max_mb)
+
+
+@cache.command("stats")
+@click.pass_obj
+def cache_stats(store: ConversionCache) -> None:
+    """Show the cache location, entry count, and size."""
+    stats = store.stats()
+    click.echo(f"Directory: {stats.directory}")
+    click.echo(f"Entries:   {stats.entries}")
+    click.echo(f"Size:      {_format_size(stats.size)} of {_format_size(stats.max_size)}")
+
+
+@cache.command("clear")
+@click.pass_obj
+def cache_clear(store: ConversionCache) -> None:
+    """Remove every cached conversion."""
+    removed = store.clear()
+    click.echo(f"Removed {removed} cached conversion(s) from {store.directory}")
+
+
+def _rendered_size(rendered: str) -> str:
+    return _format_size(len(rendered.encode("utf-8")))
+
+
+def _format_size(size: int) -> str:
+    value = float(size)
+    for unit in ("B", "KiB", "MiB"):
+        if value < 1024:
+            return f"{value:.0f} {unit}" if unit == "B" else f"{value:.1f} {unit}"
+        value /= 1024
+    return f"{value:.1f} GiB"
 
 
 @app.command("list")
 def list_formats() -> None:
     """Show supported source and target formats."""
+    # Registries list slugs without importing parsers, renderers, or plugins.
+    from pipeforge.parsers import default_parser_registry
+    from pipeforge.renderers import default_renderer_registry
+
     click.echo("Sources:")
-    for slug in transpiler.available_sources():
+    for slug in default_parser_registry().slugs():
         click.echo(f"  - {slug}")
     click.echo("\nTargets:")
-    for slug in transpiler.available_targets():
+    for slug in default_renderer_registry().slugs():
         click.echo(f"  - {slug}")
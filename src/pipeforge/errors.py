@@ -2,6 +2,9 @@
 #
 # SPDX-License-Identifier: MIT
 
+from typing import List
+
+
 class PipeForgeError(Exception):
     """Base exception for PipeForge failures."""
 
@@ -16,3 +19,29 @@ class RendererNotFoundError(PipeForgeError):
 
 class InvalidPipelineSpecError(PipeForgeError):
     """Raised when an input pipeline specification cannot be understood."""
+
+
+class DocumentError(PipeForgeError):
+    """Raised when one document of a multi-document stream cannot be converted."""
+
+    def __init__(self, document: int, message: str) -> None:
+        super().__init__(f"Document {document}: {message}")
+        self.document = document
+        self.message = message
+
+    def __reduce__(self):
+        return type(self), (self.document, self.message)
+
+
+class OutputValidationError(PipeForgeError):
+    """Raised when rendered output does not match the target's bundled schema."""
+
+    def __init__(self, target: str, origin: str, issues: List[str]) -> None:
+        listed = "".join(f"\n  - {issue}" for issue in issues)
+        super().__init__(f"{target} output for {origin} does not match its schema:{listed}")
+        self.target = target
+        self.origin = origin
+        self.issues = issues
+
+    def __reduce__(self):
+        return type(self), (self.target, self.origin, self.issues)
@@ -0,0 +1,128 @@
+# SPDX-FileCopyrightText: 2025-present U.N. Owen <void@some.where>
+#
+# SPDX-License-Identifier: MIT
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tempfile
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+INDEX_FILENAME = ".pipeforge-index.json"
+INDEX_VERSION = 2
+
+
+def digest_bytes(content: bytes) -> str:
+    return hashlib.sha256(content).hexdigest()
+
+
+@dataclass
+class FileState:
+    """Last converted state of one input and the outputs it produced, or the error it failed with."""
+
+    mtime_ns: int
+    size: int
+    digest: str
+    outputs: Dict[str, str] = field(default_factory=dict)
+    error: Optional[str] = None
+
+
+class FileStateIndex:
+    """Persistent ``input -> (mtime, size, content hash) -> outputs`` map.
+
+    Inputs are keyed by their path relative to the input root and outputs by
+    their path relative to the output root, so the index survives moving the
+    whole tree. ``settings`` captures everything else that changes the output
+    (source, target, version); when it differs the index starts over.
+    """
+
+    def __init__(self, path: Path, settings: Optional[Dict[str, Any]] = None) -> None:
+        self.path = path
+        self.settings: Dict[str, Any] = dict(settings or {})
+        self.entries: Dict[str, FileState] = {}
+
+    @classmethod
+    def load(cls, path: Path, settings: Dict[str, Any]) -> FileStateIndex:
+        """Reads the index at ``path``; a missing, corrupt, or stale index starts empty."""
+        index = cls(path, settings)
+        try:
+            payload = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return index
+        if payload.get("version") != INDEX_VERSION or payload.get("settings") != index.settings:
+            return index
+        for key, state in payload.get("entries", {}).items():
+            try:
+                index.entries[key] = FileState(**state)
+            except TypeError:
+                continue
+        return index
+
+    def save(self) -> None:
+        payload = {
+            "version": INDEX_VERSION,
+            "settings": self.settings,
+            "entries": {key: asdict(state) for key, state in sorted(self.entries.items())},
+        }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=self.path.parent, prefix=".tmp-index-")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as handle:
+                json.dump(payload, handle, indent=1)
+            os.replace(tmp_name, self.path)
+        except BaseException:
+            Path(tmp_name).unlink()
+            raise
+
+    def check(self, key: str, path: Path, output_root: Path) -> Tuple[bool, os.stat_result, Optional[str]]:
+        """Returns ``(changed, stat, digest)`` for the input at ``path``.
+
+        Matching mtime and size short-circuit without reading the file. When
+        only the metadata moved (touch, checkout) the content hash decides and
+        the stored metadata is refreshed. Missing outputs always count as a
+        change. ``digest`` is ``None`` when the file was not hashed.
+        """
+        stat = path.stat()
+        state = self.entries.get(key)
+        if state is None or not all((output_root / output).exists() for output in state.outputs):
+            return True, stat, None
+        if state.mtime_ns == stat.st_mtime_ns and state.size == stat.st_size:
+            return False, stat, state.digest
+        digest = digest_bytes(path.read_bytes())
+        if digest != state.digest:
+            return True, stat, digest
+        state.mtime_ns, state.size = stat.st_mtime_ns, stat.st_size
+        return False, stat, digest
+
+    def record(
+        self, key: str, stat: os.stat_result, digest: str, outputs: Dict[str, str], error: Optional[str] = None
+    ) -> None:
+        self.entries[key] = FileState(stat.st_mtime_ns, stat.st_size, digest, dict(outputs), error)
+
+    def forget(self, key: str) -> Optional[FileState]:
+        return self.entries.pop(key, None)
+
+    def stale_keys(self, present: Iterable[str]) -> List[str]:
+        """Keys of indexed inputs that are no longer present."""
+        return sorted(set(self.entries) - set(present))
+
+
+def write_if_changed(destination: Path, rendered: str) -> bool:
+    """Writes ``rendered`` unless the file already holds exactly that content.
+
+    Skipping identical writes keeps mtimes stable, so watchers, build tools,
+    and git see no churn. Returns whether the file was written.
+    """
+    data = rendered.encode("utf-8")
+    try:
+        if destination.stat().st_size == len(data) and destination.read_bytes() == data:
+            return False
+    except OSError:
+        pass
+    destination.parent.mkdir(parents=True, exist_ok=True)
+    destination.write_bytes(data)
+    return True
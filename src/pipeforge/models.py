@@ -4,27 +4,253 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass, field
-from typing import Dict, List, Optional
+import sys
+import weakref
+from dataclasses import dataclass, field, fields
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Tuple, Type, TypeVar
 
+from pipeforge.errors import InvalidPipelineSpecError
 
+_T = TypeVar("_T")
+
+
+def _slotted(cls: Type[_T]) -> Type[_T]:
+    """Rebuilds a dataclass with ``__slots__``, like ``dataclass(slots=True)`` on 3.10+.
+
+    Slotted instances drop the per-object ``__dict__``, which dominates the
+    footprint of large IRs.
+    """
+    cls_dict = dict(cls.__dict__)
+    field_names = tuple(item.name for item in fields(cls))
+    cls_dict["__slots__"] = field_names
+    for name in field_names:
+        cls_dict.pop(name, None)
+    cls_dict.pop("__dict__", None)
+    cls_dict.pop("__weakref__", None)
+    slotted = type(cls)(cls.__name__, cls.__bases__, cls_dict)
+    slotted.__qualname__ = cls.__qualname__
+    return slotted
+
+
+class EnvMapping(Mapping[str, str]):
+    """Immutable, hashable ``str -> str`` mapping used for IR environments.
+
+    Build instances with ``freeze_env()`` so equal environments share a single
+    object across steps, jobs, and pipelines.
+    """
+
+    __slots__ = ("_data", "_hash", "__weakref__")
+
+    def __init__(self, data: Optional[Mapping[str, str]] = None) -> None:
+        self._data: Dict[str, str] = dict(data or {})
+        self._hash: Optional[int] = None
+
+    def __getitem__(self, key: str) -> str:
+        return self._data[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._data)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __hash__(self) -> int:
+        if self._hash is None:
+            # Order-independent, like ``__eq__``.
+            self._hash = hash(frozenset(self._data.items()))
+        return self._hash
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, EnvMapping):
+            return self._data == other._data
+        if isinstance(other, Mapping):
+            return self._data == dict(other)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"EnvMapping({self._data!r})"
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        return (freeze_env, (self._data,))
+
+
+_ENV_POOL: "weakref.WeakValueDictionary[Tuple[Tuple[str, str], ...], EnvMapping]" = weakref.WeakValueDictionary()
+EMPTY_ENV = EnvMapping()
+
+
+def freeze_env(env: Optional[Mapping[str, str]]) -> EnvMapping:
+    """Returns the shared immutable mapping for ``env``, interning keys and values."""
+    if isinstance(env, EnvMapping):
+        return env
+    if not env:
+        return EMPTY_ENV
+    items = tuple((sys.intern(str(key)), sys.intern(str(value))) for key, value in env.items())
+    try:
+        return _ENV_POOL[items]
+    except KeyError:
+        frozen = EnvMapping(dict(items))
+        _ENV_POOL[items] = frozen
+        return frozen
+
+
+def intern_commands(commands: List[str]) -> List[str]:
+    """Interns command strings so repeated commands share one object."""
+    return [sys.intern(command) if type(command) is str else command for command in commands]
+
+
+@_slotted
 @dataclass
 class Step:
     """A single unit of work inside a job."""
 
     name: str
     commands: List[str] = field(default_factory=list)
-    env: Dict[str, str] = field(default_factory=dict)
+    env: Mapping[str, str] = EMPTY_ENV
+
+    def __post_init__(self) -> None:
+        self.name = sys.intern(self.name) if type(self.name) is str else self.name
+        self.commands = intern_commands(self.commands)
+        self.env = freeze_env(self.env)
+
 
+@_slotted
+@dataclass(frozen=True)
+class Cache:
+    """A directory worth persisting between runs, such as a package manager's download cache.
 
+    ``paths`` are the tool's default locations (``~`` is the home directory)
+    and ``key_files`` are globs whose contents invalidate the cache.
+    ``relocate`` maps environment variables to templates that point the tool
+    at another directory (``{path}``), for targets that only cache inside
+    the project.
+    """
+
+    name: str
+    paths: Tuple[str, ...] = ()
+    key_files: Tuple[str, ...] = ()
+    relocate: Mapping[str, str] = EMPTY_ENV
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "paths", tuple(self.paths))
+        object.__setattr__(self, "key_files", tuple(self.key_files))
+        object.__setattr__(self, "relocate", freeze_env(self.relocate))
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        # Frozen slotted instances cannot use the default slot-state pickling.
+        return (type(self), (self.name, self.paths, self.key_files, self.relocate))
+
+
+@_slotted
+@dataclass(frozen=True)
+class Artifact:
+    """Files a job publishes: ``pattern`` is a glob relative to ``location``."""
+
+    name: str
+    pattern: str
+    location: str = ""
+    shared: bool = True
+
+    @property
+    def path(self) -> str:
+        return f"{self.location.rstrip('/')}/{self.pattern}" if self.location else self.pattern
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        return (type(self), (self.name, self.pattern, self.location, self.shared))
+
+
+@_slotted
+@dataclass(frozen=True)
+class Subscription:
+    """A job's request for an artifact published by an earlier job."""
+
+    artifact: str
+    destination: str = ""
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        return (type(self), (self.artifact, self.destination))
+
+
+@_slotted
+@dataclass(frozen=True)
+class PathFilter:
+    """The changed files that matter, as globs relative to the repository root.
+
+    An empty ``include`` matches every path and ``exclude`` drops matches
+    again; a filter with neither matches every change.
+    """
+
+    include: Tuple[str, ...] = ()
+    exclude: Tuple[str, ...] = ()
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "include", tuple(self.include))
+        object.__setattr__(self, "exclude", tuple(self.exclude))
+
+    def __bool__(self) -> bool:
+        return bool(self.include or self.exclude)
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        return (type(self), (self.include, self.exclude))
+
+
+ANY_PATH = PathFilter()
+
+
+@_slotted
+@dataclass(frozen=True)
+class Trigger:
+    """What starts the pipeline: ``push`` for new commits, or ``schedule`` with a five-field ``cron``."""
+
+    kind: str
+    cron: Optional[str] = None
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        return (type(self), (self.kind, self.cron))
+
+
+@_slotted
 @dataclass
 class Job:
-    """A collection of steps executed together."""
+    """A collection of steps executed together.
+
+    ``stage`` is the source stage the job belongs to and ``needs`` names the
+    jobs that must finish before it starts. ``caches`` are restored before
+    the steps run and saved afterwards. ``artifacts`` are published when the
+    job finishes and ``subscriptions`` name the artifacts it downloads.
+    A non-empty ``matrix`` runs the job once per entry, with that entry's
+    variables added to ``env``. ``paths`` limits the job to changes that
+    touch matching files.
+    """
 
     name: str
     steps: List[Step] = field(default_factory=list)
     image: Optional[str] = None
-    env: Dict[str, str] = field(default_factory=dict)
+    env: Mapping[str, str] = EMPTY_ENV
+    stage: Optional[str] = None
+    needs: Tuple[str, ...] = ()
+    caches: Tuple[Cache, ...] = ()
+    artifacts: Tuple[Artifact, ...] = ()
+    subscriptions: Tuple[Subscription, ...] = ()
+    matrix: Tuple[Mapping[str, str], ...] = ()
+    paths: PathFilter = ANY_PATH
+
+    def __post_init__(self) -> None:
+        if type(self.image) is str:
+            self.image = sys.intern(self.image)
+        if type(self.stage) is str:
+            self.stage = sys.intern(self.stage)
+        self.env = freeze_env(self.env)
+        self.needs = tuple(self.needs)
+        self.caches = tuple(self.caches)
+        self.artifacts = tuple(self.artifacts)
+        self.subscriptions = tuple(self.subscriptions)
+        self.matrix = tuple(freeze_env(variant) for variant in self.matrix)
+
+    def variants(self) -> List[Mapping[str, str]]:
+        """The env of every run of this job: one per matrix entry, or just ``env``."""
+        if not self.matrix:
+            return [self.env]
+        return [freeze_env({**self.env, **variant}) for variant in self.matrix]
 
     def combined_script(self) -> List[str]:
         """Flattens all step commands for renderers that use single script blocks."""
@@ -34,17 +260,94 @@ class Job:
         return script
 
 
+@_slotted
 @dataclass
 class Pipeline:
-    """Internal representation that every renderer consumes."""
+    """Internal representation that every renderer consumes.
+
+    ``triggers`` are the events that start the pipeline (none means the
+    target's default, usually every push) and ``paths`` limits push-started
+    runs to changes that touch matching files.
+    """
 
     name: str
     jobs: List[Job] = field(default_factory=list)
-    variables: Dict[str, str] = field(default_factory=dict)
-    triggers: List[str] = field(default_factory=list)
+    variables: Mapping[str, str] = EMPTY_ENV
+    triggers: List[Trigger] = field(default_factory=list)
+    stages: List[str] = field(default_factory=list)
+    paths: PathFilter = ANY_PATH
+
+    def __post_init__(self) -> None:
+        self.variables = freeze_env(self.variables)
 
     def ensure_default_job_names(self) -> None:
-        """Assigns deterministic names when parsing omitted them."""
+        """Assigns deterministic names when parsing omitted them.
+
+        Duplicate names get a ``-<n>`` suffix so ``needs`` can refer to every
+        job unambiguously.
+        """
+        used = set()
         for index, job in enumerate(self.jobs, start=1):
-            if not job.name:
-                job.name = f"job-{index}"
+            base = job.name or f"job-{index}"
+            name, suffix = base, 1
+            while name in used:
+                suffix += 1
+                name = f"{base}-{suffix}"
+            used.add(name)
+            job.name = name
+
+    def chain_stages(self) -> None:
+        """Makes every job need all jobs of the previous stage, in ``stages`` order."""
+        members: Dict[Optional[str], List[Job]] = {}
+        for job in self.jobs:
+            members.setdefault(job.stage, []).append(job)
+        previous: Tuple[str, ...] = ()
+        for stage in self.stages:
+            stage_jobs = members.get(stage, [])
+            for job in stage_jobs:
+                # One shared tuple per stage keeps wide plans small.
+                job.needs = previous
+            previous = tuple(job.name for job in stage_jobs)
+
+    def artifact_producers(self) -> Dict[str, Job]:
+        """Maps artifact names to the job that publishes them."""
+        return {artifact.name: job for job in self.jobs for artifact in job.artifacts}
+
+    def job_levels(self) -> List[List[Job]]:
+        """Groups jobs by dependency depth, so each job runs as early as its ``needs`` allow.
+
+        Every job lands one level after the deepest job it needs; jobs within a
+        level are independent of each other and keep their original order.
+        """
+        by_name = {job.name: job for job in self.jobs}
+        depth: Dict[str, int] = {}
+        for root in self.jobs:
+            if root.name in depth:
+                continue
+            # Iterative depth-first walk so long chains cannot hit the recursion limit.
+            visiting = {root.name}
+            stack = [(root, iter(root.needs))]
+            while stack:
+                job, needs = stack[-1]
+                for need in needs:
+                    if need in depth:
+                        continue
+                    if need in visiting:
+                        raise InvalidPipelineSpecError(f"Job '{job.name}' is part of a dependency cycle.")
+                    if need not in by_name:
+                        raise InvalidPipelineSpecError(f"Job '{job.name}' needs unknown job '{need}'.")
+                    visiting.add(need)
+                    stack.append((by_name[need], iter(by_name[need].needs)))
+                    break
+                else:
+                    stack.pop()
+                    visiting.discard(job.name)
+                    depth[job.name] = 1 + max((depth[need] for need in job.needs), default=-1)
+
+        levels: List[List[Job]] = []
+        for job in self.jobs:
+            level = depth[job.name]
+            while len(levels) <= level:
+                levels.append([])
+            levels[level].append(job)
+        return levels
@@ -0,0 +1,121 @@
+# SPDX-FileCopyrightText: 2025-present U.N. Owen <void@some.where>
+#
+# SPDX-License-Identifier: MIT
+
+"""Optional passes that rewrite the IR before rendering.
+
+``fold_matrix`` collapses jobs that only differ in a few env values into one
+job with a ``matrix``, which targets with native matrix builds render as a
+single job definition instead of one copy per variant.
+"""
+
+from __future__ import annotations
+
+import os
+import re
+from dataclasses import dataclass
+from typing import Dict, List, Tuple
+
+from pipeforge.models import Job, Pipeline, freeze_env
+
+DEFAULT_MAX_KEYS = 2
+# GitLab caps ``parallel:matrix`` at 200 jobs and GitHub a matrix at 256.
+DEFAULT_MAX_VARIANTS = 200
+
+
+@dataclass
+class FoldStats:
+    """How many source jobs were folded into how many matrix jobs."""
+
+    jobs: int = 0
+    matrices: int = 0
+
+    def add(self, other: FoldStats) -> None:
+        self.jobs += other.jobs
+        self.matrices += other.matrices
+
+    def __str__(self) -> str:
+        return f"Folded {self.jobs} job(s) into {self.matrices} matrix job(s)."
+
+
+def fold_matrix(
+    pipeline: Pipeline,
+    *,
+    max_keys: int = DEFAULT_MAX_KEYS,
+    max_variants: int = DEFAULT_MAX_VARIANTS,
+) -> FoldStats:
+    """Folds near-identical jobs of ``pipeline`` into matrix jobs, in place.
+
+    Jobs are folded when they share steps, image, stage, needs, caches,
+    subscriptions and path filter, have the same env keys, and their env
+    values differ in at most ``max_keys`` keys. Jobs that publish artifacts
+    are left alone, as is any group that a later job only partly needs, since
+    a matrix job can only be needed as a whole.
+    """
+    groups: Dict[Tuple[object, ...], List[int]] = {}
+    for position, job in enumerate(pipeline.jobs):
+        if job.matrix or job.artifacts:
+            continue
+        groups.setdefault(_signature(job), []).append(position)
+
+    needed_by: Dict[str, List[int]] = {}
+    for position, job in enumerate(pipeline.jobs):
+        for need in job.needs:
+            needed_by.setdefault(need, []).append(position)
+
+    stats = FoldStats()
+    names = {job.name for job in pipeline.jobs}
+    renamed: Dict[str, str] = {}
+    dropped = set()
+    for members in groups.values():
+        if not 2 <= len(members) <= max_variants:
+            continue
+        jobs = [pipeline.jobs[position] for position in members]
+        varying = [key for key in jobs[0].env if len({job.env[key] for job in jobs}) > 1]
+        if not varying or len(varying) > max_keys:
+            continue
+        matrix = [tuple(job.env[key] for key in varying) for job in jobs]
+        if len(set(matrix)) < len(matrix):
+            continue
+        dependents = {position for job in jobs for position in needed_by.get(job.name, ())}
+        member_names = {job.name for job in jobs}
+        if any(not member_names <= set(pipeline.jobs[position].needs) for position in dependents):
+            continue
+
+        first = jobs[0]
+        name = _common_name([job.name for job in jobs])
+        if not name or (name in names and name not in member_names):
+            name = first.name
+        names.add(name)
+        for job in jobs:
+            renamed[job.name] = name
+        first.name = name
+        first.env = freeze_env({key: value for key, value in first.env.items() if key not in varying})
+        first.matrix = tuple(freeze_env(dict(zip(varying, values))) for values in matrix)
+        dropped.update(members[1:])
+        stats.jobs += len(jobs)
+        stats.matrices += 1
+
+    if not stats.matrices:
+        return stats
+    pipeline.jobs = [job for position, job in enumerate(pipeline.jobs) if position not in dropped]
+    # Stage chaining shares one ``needs`` tuple per stage; rewrite each tuple once.
+    rewritten: Dict[Tuple[str, ...], Tuple[str, ...]] = {}
+    for job in pipeline.jobs:
+        if job.needs not in rewritten:
+            rewritten[job.needs] = tuple(dict.fromkeys(renamed.get(need, need) for need in job.needs))
+        job.needs = rewritten[job.needs]
+    return stats
+
+
+def _signature(job: Job) -> Tuple[object, ...]:
+    steps = tuple((step.name, tuple(step.commands), step.env) for step in job.steps)
+    return (steps, job.image, job.stage, job.needs, job.caches, job.subscriptions, job.paths, tuple(job.env))
+
+
+def _common_name(names: List[str]) -> str:
+    """The shared prefix of ``names``, trimmed back to a word boundary."""
+    prefix = os.path.commonprefix(names)
+    if any(len(name) > len(prefix) and prefix[-1:].isalnum() and name[len(prefix)].isalnum() for name in names):
+        prefix = re.sub(r"[A-Za-z0-9]+$", "", prefix)
+    return prefix.rstrip(" -_.:/(")
@@ -2,7 +2,11 @@
 #
 # SPDX-License-Identifier: MIT
 
-from .bamboo import BambooSpecParser
+from __future__ import annotations
+
+import importlib
+from typing import Any
+
 from .registry import ParserRegistry, default_parser_registry
 
 __all__ = [
@@ -10,3 +14,14 @@ __all__ = [
     "ParserRegistry",
     "default_parser_registry",
 ]
+
+# Parser implementations are imported on first access to keep CLI startup cheap.
+_LAZY_EXPORTS = {
+    "BambooSpecParser": ".bamboo",
+}
+
+
+def __getattr__(name: str) -> Any:
+    if name in _LAZY_EXPORTS:
+        return getattr(importlib.import_module(_LAZY_EXPORTS[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -4,18 +4,54 @@
 
 from __future__ import annotations
 
-from typing import Any, Dict, Iterable, List, Optional
+import itertools
+import re
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
+from pipeforge.caches import cache_from_hint, detect_caches
+from pipeforge.changes import combine_filters
 from pipeforge.errors import InvalidPipelineSpecError
-from pipeforge.models import Job, Pipeline, Step
+from pipeforge.models import ANY_PATH, Artifact, Cache, Job, PathFilter, Pipeline, Step, Subscription, Trigger
 
 from .base import BaseParser
 
 
+DEFAULT_STAGE = "Default Stage"
+
+# Converted YAML nodes keyed by identity (and position, for single tasks).
+_Memo = Dict[Any, Tuple[Any, List[Step]]]
+
+# Bamboo triggers that run the plan on a clock; every other kind reacts to commits.
+SCHEDULE_TRIGGERS = frozenset({"cron", "scheduled"})
+# Largest value of each five-field cron field, for ``start/step`` ranges.
+_CRON_MAXIMA = (59, 23, 31, 12, 6)
+# A change-detection regex becomes at most this many globs.
+_MAX_GLOBS = 8
+
+
 class BambooSpecParser(BaseParser):
     """Parses Atlassian Bamboo Specs YAML into the internal IR.
 
     The parser is intentionally forgiving so early POCs can reuse partial specs.
+    Bamboo runs stages in order and the jobs of a stage in parallel, so every
+    job needs all jobs of the previous stage. A flat ``jobs:`` list is one
+    stage, like Bamboo's ``Default Stage``.
+
+    Bamboo agents keep dependency caches between builds implicitly, so each
+    job gets the caches named in its ``caches:`` hint plus those detected from
+    package-manager commands; ``caches: false`` turns both off. Artifacts and
+    artifact subscriptions are kept; a subscription must name an artifact of
+    a job in an earlier stage.
+
+    YAML aliases load as the same Python object, so task lists and tasks are
+    converted once per node and every alias shares the resulting ``Step``
+    objects; renderers anchor the parts built from them.
+
+    ``cron``/``scheduled`` triggers become schedules (Quartz expressions are
+    rewritten as five-field cron) and other triggers push triggers. The
+    repositories' ``change-detection`` include/exclude regexes become the
+    pipeline's path filter where they translate to globs; a regex that does
+    not is dropped, so the pipeline runs on every change rather than too few.
     """
 
     slug = "bamboo"
@@ -28,41 +64,54 @@ class BambooSpecParser(BaseParser):
         plan_block = raw.get("plan") if isinstance(raw.get("plan"), dict) else {}
         name = name_override or plan_block.get("name") or raw.get("name") or "bamboo-pipeline"
         variables = _safe_mapping(raw.get("variables"))
-        triggers = raw.get("triggers") if isinstance(raw.get("triggers"), list) else []
+        triggers = _triggers(raw.get("triggers"))
+        paths = _change_detection(raw.get("repositories"))
 
         job_entries = self._extract_job_entries(raw)
         if not job_entries:
             raise InvalidPipelineSpecError("No jobs/stages were found in the Bamboo spec.")
 
-        jobs: List[Job] = [self._parse_job(entry) for entry in job_entries]
+        memo: _Memo = {}
+        jobs: List[Job] = [self._parse_job(entry, stage, memo) for stage, entry in job_entries]
+        stages = list(dict.fromkeys(stage for stage, _ in job_entries))
 
-        pipeline = Pipeline(name=name, jobs=jobs, variables=variables, triggers=triggers)
+        pipeline = Pipeline(
+            name=name, jobs=jobs, variables=variables, triggers=triggers, stages=stages, paths=paths
+        )
         pipeline.ensure_default_job_names()
+        pipeline.chain_stages()
+        _check_subscriptions(pipeline)
         return pipeline
 
-    def _extract_job_entries(self, raw: Dict[str, Any]) -> List[Any]:
-        """Returns a flat list of job definitions pulled from jobs or stages."""
+    def _extract_job_entries(self, raw: Dict[str, Any]) -> List[Tuple[str, Any]]:
+        """Returns ``(stage name, job definition)`` pairs pulled from jobs or stages."""
         jobs_section = raw.get("jobs")
         if isinstance(jobs_section, list):
-            return jobs_section
+            return [(DEFAULT_STAGE, entry) for entry in jobs_section]
 
         stages = raw.get("stages")
-        collected: List[Any] = []
+        collected: List[Tuple[str, Any]] = []
+        seen: Dict[str, int] = {}
         if isinstance(stages, list):
             for stage in stages:
                 if not isinstance(stage, dict):
                     continue
-                for stage_body in stage.values():
+                for stage_name, stage_body in stage.items():
                     if isinstance(stage_body, dict):
                         stage_jobs = stage_body.get("jobs")
                         if isinstance(stage_jobs, list):
-                            collected.extend(stage_jobs)
+                            label = _unique_stage_name(str(stage_name), seen)
+                            collected.extend((label, entry) for entry in stage_jobs)
         return collected
 
-    def _parse_job(self, entry: Any) -> Job:
-        """Parses a single job entry into a Job object."""
+    def _parse_job(self, entry: Any, stage: Optional[str] = None, memo: Optional[_Memo] = None) -> Job:
+        """Parses a single job entry into a Job object.
+
+        ``memo`` maps already converted task nodes (by identity) to their steps.
+        """
+        memo = {} if memo is None else memo
         if isinstance(entry, str):
-            return Job(name=entry, steps=[Step(name="default", commands=["echo TODO: add tasks"])])
+            return Job(name=entry, steps=[Step(name="default", commands=["echo TODO: add tasks"])], stage=stage)
 
         if not isinstance(entry, dict):
             raise InvalidPipelineSpecError(f"Unsupported job entry format: {entry!r}")
@@ -75,10 +124,7 @@ class BambooSpecParser(BaseParser):
             job_name = entry.get("name") or ""
             job_map = entry
 
-        tasks = self._normalize_tasks(job_map.get("tasks") or job_map.get("steps"))
-        steps = [self._convert_task(task, index) for index, task in enumerate(tasks, start=1)]
-        if not steps:
-            steps = [Step(name="default", commands=["echo TODO: add tasks"])]
+        steps = self._convert_tasks(job_map.get("tasks") or job_map.get("steps"), memo)
 
         image = None
         docker_block = job_map.get("docker")
@@ -87,8 +133,30 @@ class BambooSpecParser(BaseParser):
         image = image or job_map.get("image")
 
         env = _safe_mapping(job_map.get("variables"))
-
-        return Job(name=job_name, steps=steps, image=image, env=env)
+        caches = self._parse_caches(job_map.get("caches"), steps)
+        artifacts = [_artifact(entry) for entry in self._normalize_tasks(job_map.get("artifacts"))]
+        subscriptions = [
+            _subscription(entry) for entry in self._normalize_tasks(job_map.get("artifact-subscriptions"))
+        ]
+
+        return Job(
+            name=job_name,
+            steps=steps,
+            image=image,
+            env=env,
+            stage=stage,
+            caches=caches,
+            artifacts=artifacts,
+            subscriptions=subscriptions,
+        )
+
+    def _parse_caches(self, hints: Any, steps: List[Step]) -> List[Cache]:
+        if hints is False:
+            return []
+        caches = [cache_from_hint(hint) for hint in self._normalize_tasks(hints)]
+        detected = detect_caches(command for step in steps for command in step.commands)
+        names = {cache.name for cache in caches}
+        return caches + [cache for cache in detected if cache.name not in names]
 
     def _normalize_tasks(self, tasks: Any) -> List[Any]:
         if tasks is None:
@@ -97,6 +165,28 @@ class BambooSpecParser(BaseParser):
             return tasks
         return [tasks]
 
+    def _convert_tasks(self, value: Any, memo: _Memo) -> List[Step]:
+        """Converts a job's tasks, reusing the steps of a task list or task seen before."""
+        if isinstance(value, list) and id(value) in memo:
+            return list(memo[id(value)][1])
+        steps: List[Step] = []
+        for index, task in enumerate(self._normalize_tasks(value), start=1):
+            if isinstance(task, dict):
+                # Default step names depend on the position, so key on it too.
+                key = (id(task), index)
+                if key not in memo:
+                    memo[key] = (task, [self._convert_task(task, index)])
+                steps.append(memo[key][1][0])
+            else:
+                steps.append(self._convert_task(task, index))
+        if not steps:
+            steps = [Step(name="default", commands=["echo TODO: add tasks"])]
+        if isinstance(value, list):
+            # The node is kept alongside so its id cannot be reused mid-parse.
+            memo[id(value)] = (value, steps)
+            return list(steps)
+        return steps
+
     def _convert_task(self, task: Any, index: int) -> Step:
         if isinstance(task, str):
             return Step(name=f"task-{index}", commands=[task])
@@ -121,6 +211,170 @@ def _normalize_commands(value: Any) -> List[str]:
     return [str(value)]
 
 
+def _artifact(entry: Any) -> Artifact:
+    if isinstance(entry, str):
+        return Artifact(name=entry, pattern=entry)
+    if isinstance(entry, dict) and entry.get("pattern"):
+        pattern = str(entry["pattern"])
+        return Artifact(
+            name=str(entry.get("name") or pattern),
+            pattern=pattern,
+            location=str(entry.get("location") or ""),
+            shared=bool(entry.get("shared", True)),
+        )
+    raise InvalidPipelineSpecError(f"Unsupported artifact entry: {entry!r}")
+
+
+def _subscription(entry: Any) -> Subscription:
+    if isinstance(entry, str):
+        return Subscription(artifact=entry)
+    if isinstance(entry, dict) and entry.get("artifact"):
+        return Subscription(artifact=str(entry["artifact"]), destination=str(entry.get("destination") or ""))
+    raise InvalidPipelineSpecError(f"Unsupported artifact subscription: {entry!r}")
+
+
+def _check_subscriptions(pipeline: Pipeline) -> None:
+    producers = pipeline.artifact_producers()
+    order = {stage: position for position, stage in enumerate(pipeline.stages)}
+    for job in pipeline.jobs:
+        for subscription in job.subscriptions:
+            producer = producers.get(subscription.artifact)
+            if producer is None:
+                raise InvalidPipelineSpecError(
+                    f"Job '{job.name}' subscribes to unknown artifact '{subscription.artifact}'."
+                )
+            if order.get(producer.stage, 0) >= order.get(job.stage, 0):
+                raise InvalidPipelineSpecError(
+                    f"Job '{job.name}' subscribes to artifact '{subscription.artifact}' "
+                    f"from job '{producer.name}', which is not in an earlier stage."
+                )
+
+
+def _triggers(value: Any) -> List[Trigger]:
+    """Push and schedule triggers of the plan; schedules Quartz cannot express in cron are skipped."""
+    triggers: List[Trigger] = []
+    for entry in value if isinstance(value, list) else []:
+        if isinstance(entry, dict) and len(entry) == 1:
+            kind, body = next(iter(entry.items()))
+        else:
+            kind, body = entry, None
+        if str(kind) not in SCHEDULE_TRIGGERS:
+            trigger = Trigger("push")
+        else:
+            expression = body.get("expression") if isinstance(body, dict) else body
+            cron = _cron(str(expression)) if expression else None
+            if cron is None:
+                continue
+            trigger = Trigger("schedule", cron)
+        if trigger not in triggers:
+            triggers.append(trigger)
+    return triggers
+
+
+def _cron(expression: str) -> Optional[str]:
+    """Rewrites a Quartz expression (seconds first, optional year) as five-field cron, if it can be."""
+    fields = expression.split()
+    if len(fields) not in (6, 7) or fields[6:] not in ([], ["*"]):
+        return None
+    minute, hour, day, month, weekday = fields[1:6]
+    # Last-day, nearest-weekday and nth-weekday markers have no cron equivalent.
+    if any(marker in day for marker in "LW#") or any(marker in weekday for marker in "L#"):
+        return None
+    # Quartz numbers weekdays 1 (Sunday) to 7, cron 0 to 6.
+    weekday = re.sub(r"(?<![/\d])\d+", lambda match: str(int(match.group()) - 1), weekday)
+    converted = []
+    for value, maximum in zip((minute, hour, day, month, weekday), _CRON_MAXIMA):
+        value = "*" if value == "?" else value
+        # ``5/15`` means "from 5 every 15" in Quartz; cron wants a range.
+        value = re.sub(r"^(\d+)/", lambda match: f"{match.group(1)}-{maximum}/", value)
+        converted.append(value)
+    return " ".join(converted)
+
+
+def _change_detection(repositories: Any) -> PathFilter:
+    """Path filter of the plan's repositories; one without change detection matches every change."""
+    combined: Optional[PathFilter] = None
+    for entry in repositories if isinstance(repositories, list) else []:
+        body = next(iter(entry.values()), None) if isinstance(entry, dict) and len(entry) == 1 else entry
+        detection = body.get("change-detection") if isinstance(body, dict) else None
+        if not isinstance(detection, dict):
+            return ANY_PATH
+        include = _regex_globs(detection.get("include"))
+        exclude = _regex_globs(detection.get("exclude"))
+        current = PathFilter(include or (), exclude or ())
+        combined = current if combined is None else combine_filters(combined, current)
+    return combined or ANY_PATH
+
+
+def _regex_globs(pattern: Any) -> Optional[Tuple[str, ...]]:
+    """Globs matching at least what a simple change-detection regex matches, or ``None``.
+
+    Handles literal paths, ``.`` and ``.*``/``.+`` wildcards, ``[^/]*`` and
+    ``|`` alternatives, also inside unrepeated groups; anything else returns
+    ``None``.
+    """
+    if not isinstance(pattern, str) or not pattern:
+        return None
+    patterns = [pattern]
+    while any("(" in item or ")" in item for item in patterns):
+        expanded: List[str] = []
+        for item in patterns:
+            group = re.search(r"\((?:\?:)?([^()]*)\)", item)
+            if group is None or item[group.end() : group.end() + 1] in ("*", "+", "?", "{"):
+                return None
+            head, tail = item[: group.start()], item[group.end() :]
+            expanded.extend(head + option + tail for option in group.group(1).split("|"))
+        if len(expanded) > _MAX_GLOBS:
+            return None
+        patterns = expanded
+    globs: List[str] = []
+    for alternative in (option for item in patterns for option in item.split("|")):
+        converted = _regex_alternative(alternative[1:] if alternative.startswith("^") else alternative)
+        if converted is None:
+            return None
+        globs.extend(glob for glob in converted if glob not in globs)
+    return tuple(globs) if len(globs) <= _MAX_GLOBS else None
+
+
+def _regex_alternative(pattern: str) -> Optional[List[str]]:
+    if pattern.endswith("$") and not pattern.endswith("\\$"):
+        pattern = pattern[:-1]
+    tokens = re.findall(r"\\.|\.[*+]|\[\^/\][*+]|.", pattern)
+    # Each token becomes a list of glob alternatives; a ``.*`` may cross
+    # directories, so inside a segment it needs a second form with ``**``.
+    pieces: List[List[str]] = []
+    for index, token in enumerate(tokens):
+        following = tokens[index + 1] if index + 1 < len(tokens) else None
+        if token in (".*", ".+"):
+            text_follows = following is not None and following != "/"
+            if not pieces or pieces[-1] == ["/"]:
+                pieces.append(["**/*" if text_follows else "**"])
+            else:
+                pieces.append(["*", "*/**/*" if text_follows else "*/**"])
+        elif token in ("[^/]*", "[^/]+"):
+            pieces.append(["*"])
+        elif token == ".":
+            # A regex dot also matches a separator, which ``?`` never does.
+            pieces.append(["?", "/"])
+        elif token.startswith("\\") and not token[1].isalnum():
+            if token[1] in "*?[]{}":
+                return None
+            pieces.append([token[1]])
+        elif token.startswith("\\") or token in "*+?{}[]^$\\":
+            return None
+        else:
+            pieces.append([token])
+    if sum(len(options) > 1 for options in pieces) > 3:
+        return None
+    return ["".join(parts) for parts in itertools.product(*pieces)]
+
+
+def _unique_stage_name(name: str, seen: Dict[str, int]) -> str:
+    # Repeated stage names are still separate, sequential stages in Bamboo.
+    seen[name] = seen.get(name, 0) + 1
+    return name if seen[name] == 1 else f"{name} ({seen[name]})"
+
+
 def _safe_mapping(value: Any) -> Dict[str, str]:
     if not isinstance(value, dict):
         return {}
@@ -4,40 +4,83 @@
 
 from __future__ import annotations
 
-from typing import Dict, Iterable
+from typing import TYPE_CHECKING, Dict, Iterable, Mapping
 
+from pipeforge import plugins
 from pipeforge.errors import ParserNotFoundError
 
-from .base import BaseParser
-from .bamboo import BambooSpecParser
+if TYPE_CHECKING:
+    from .base import BaseParser
+
+BUILTIN_PARSERS: Dict[str, str] = {
+    "bamboo": "pipeforge.parsers.bamboo:BambooSpecParser",
+}
 
 
 class ParserRegistry:
-    """Simple registry that maps source slugs to parser instances."""
+    """Simple registry that maps source slugs to parser instances.
+
+    Parsers can also be registered lazily by reference, in which case their
+    module is only imported the first time ``get()`` asks for the slug.
+    """
 
-    def __init__(self, parsers: Iterable[BaseParser] | None = None) -> None:
+    def __init__(
+        self,
+        parsers: Iterable[BaseParser] | None = None,
+        *,
+        lazy: Mapping[str, plugins.Reference] | None = None,
+    ) -> None:
         self._parsers: Dict[str, BaseParser] = {}
+        self._lazy: Dict[str, plugins.Reference] = {}
         if parsers:
             for parser in parsers:
                 self.register(parser)
+        if lazy:
+            for slug, reference in lazy.items():
+                self.register_lazy(slug, reference)
 
     def register(self, parser: BaseParser) -> None:
+        self._lazy.pop(parser.slug, None)
         self._parsers[parser.slug] = parser
 
+    def register_lazy(self, slug: str, reference: plugins.Reference) -> None:
+        """Registers a ``"module:Class"`` string or entry point under ``slug``."""
+        self._parsers.pop(slug, None)
+        self._lazy[slug] = reference
+
+    def load_entry_points(self, group: str = plugins.PARSER_GROUP) -> None:
+        """Registers installed plugins lazily; built-in slugs take precedence."""
+        for entry_point in plugins.entry_points(group):
+            if entry_point.name not in self._parsers and entry_point.name not in self._lazy:
+                self.register_lazy(entry_point.name, entry_point)
+
     def get(self, slug: str) -> BaseParser:
         try:
             return self._parsers[slug]
+        except KeyError:
+            pass
+        try:
+            reference = self._lazy[slug]
         except KeyError as exc:
             raise ParserNotFoundError(f"Unknown source parser '{slug}'.") from exc
+        try:
+            parser = plugins.instantiate(reference)
+        except Exception as exc:
+            # A broken plugin must not crash callers that only handle PipeForgeError.
+            raise ParserNotFoundError(
+                f"Failed to load source parser '{slug}' from {plugins.describe(reference)}: {exc}"
+            ) from exc
+        self._lazy.pop(slug, None)
+        self._parsers[slug] = parser
+        return parser
 
     def slugs(self) -> list[str]:
-        return sorted(self._parsers.keys())
+        return sorted({*self._parsers, *self._lazy})
 
 
-def default_parser_registry() -> ParserRegistry:
-    """Creates the default registry with built-in parsers."""
-    return ParserRegistry(
-        parsers=[
-            BambooSpecParser(),
-        ]
-    )
+def default_parser_registry(*, include_plugins: bool = True) -> ParserRegistry:
+    """Creates the default registry with built-in parsers and installed plugins."""
+    registry = ParserRegistry(lazy=BUILTIN_PARSERS)
+    if include_plugins:
+        registry.load_entry_points()
+    return registry
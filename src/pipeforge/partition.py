@@ -0,0 +1,241 @@
+# SPDX-FileCopyrightText: 2025-present U.N. Owen <void@some.where>
+#
+# SPDX-License-Identifier: MIT
+
+"""Splitting one pipeline into smaller pipelines, for targets with per-file job limits.
+
+``split_pipeline`` cuts the job graph into parts of similar weight. Parts
+only depend on earlier parts, so a parent pipeline can run them in order
+(and side by side where they are independent) while each part keeps the
+``needs`` between its own jobs.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, replace
+from typing import Dict, List, Mapping, Optional, Set, Tuple
+
+from pipeforge.models import Job, Pipeline
+
+
+@dataclass
+class Part:
+    """One piece of a split pipeline; ``needs`` are the indexes of earlier parts it waits for."""
+
+    pipeline: Pipeline
+    needs: Tuple[int, ...] = ()
+
+
+def job_weights(
+    pipeline: Pipeline,
+    durations: Optional[Mapping[str, float]] = None,
+    default: float = 1.0,
+) -> Dict[str, float]:
+    """Weight of every job: its duration (or ``default``) times its number of runs."""
+    durations = durations or {}
+    return {job.name: durations.get(job.name, default) * (len(job.matrix) or 1) for job in pipeline.jobs}
+
+
+def partition_jobs(pipeline: Pipeline, parts: int, weights: Optional[Mapping[str, float]] = None) -> List[List[Job]]:
+    """Groups ``pipeline.jobs`` into at most ``parts`` lists of similar total weight.
+
+    Consecutive dependency levels are gathered into bands of roughly
+    ``total / parts`` weight, and heavy bands are split further along jobs
+    that do not depend on each other, so parts of one band can run side by
+    side. A job stays with the producers of the artifacts it subscribes to,
+    since separate pipelines cannot hand artifacts to each other, and so does
+    every job on a dependency path between them. A job only ever needs jobs
+    of its own or earlier groups. Weights default to ``job_weights()``, one
+    per run.
+    """
+    pipeline.job_levels()  # Rejects unknown needs and cycles up front.
+    weights = weights if weights is not None else job_weights(pipeline)
+    units = _units(pipeline)
+
+    members: Dict[str, List[Job]] = {}
+    edges: Dict[str, Set[str]] = {}
+    for job in pipeline.jobs:
+        members.setdefault(units[job.name], []).append(job)
+        for need in job.needs:
+            if units[need] != units[job.name]:
+                edges.setdefault(units[need], set()).add(units[job.name])
+    unit_weight = {unit: sum(weights[job.name] for job in jobs) for unit, jobs in members.items()}
+
+    levels: List[List[str]] = []
+    for unit, depth in _depths(list(members), edges).items():
+        while len(levels) <= depth:
+            levels.append([])
+        levels[depth].append(unit)
+    target = sum(unit_weight.values()) / max(1, parts)
+    bands: List[List[str]] = []
+    band_weights: List[float] = []
+    for level in levels:
+        weight = sum(unit_weight[unit] for unit in level)
+        if bands and band_weights[-1] + weight <= target:
+            bands[-1].extend(level)
+            band_weights[-1] += weight
+        else:
+            bands.append(list(level))
+            band_weights.append(weight)
+    while len(bands) > max(1, parts):
+        # Merging neighbours keeps every dependency pointing forward.
+        index = min(range(len(bands) - 1), key=lambda item: band_weights[item] + band_weights[item + 1])
+        bands[index : index + 2] = [bands[index] + bands[index + 1]]
+        band_weights[index : index + 2] = [band_weights[index] + band_weights[index + 1]]
+
+    # Spare parts go to the heaviest bands that have independent pieces to spread.
+    components = [_components(band, edges) for band in bands]
+    shares = [1] * len(bands)
+    for _ in range(max(1, parts) - len(bands)):
+        open_bands = [index for index in range(len(bands)) if len(components[index]) > shares[index]]
+        if not open_bands:
+            break
+        index = max(open_bands, key=lambda item: band_weights[item] / shares[item])
+        shares[index] += 1
+
+    position = {job.name: index for index, job in enumerate(pipeline.jobs)}
+    groups: List[List[Job]] = []
+    for band_components, share in zip(components, shares):
+        # Largest pieces first, each into the lightest part so far.
+        loads = [0.0] * share
+        picked: List[List[Job]] = [[] for _ in range(share)]
+        for component in sorted(band_components, key=lambda item: -sum(unit_weight[unit] for unit in item)):
+            index = loads.index(min(loads))
+            loads[index] += sum(unit_weight[unit] for unit in component)
+            picked[index].extend(job for unit in component for job in members[unit])
+        groups.extend(sorted(group, key=lambda job: position[job.name]) for group in picked if group)
+    return groups
+
+
+def split_pipeline(pipeline: Pipeline, parts: int, weights: Optional[Mapping[str, float]] = None) -> List[Part]:
+    """Splits ``pipeline`` into pipelines built from ``partition_jobs()``.
+
+    Each part keeps the plan's variables and stages; its jobs drop the
+    ``needs`` on other parts, which become the part's own ``needs``.
+    """
+    groups = partition_jobs(pipeline, parts, weights)
+    owner = {job.name: index for index, group in enumerate(groups) for job in group}
+    result: List[Part] = []
+    for index, group in enumerate(groups):
+        # Stage-chained jobs share one needs tuple; filter each tuple once.
+        filtered: Dict[Tuple[str, ...], Tuple[str, ...]] = {}
+        jobs: List[Job] = []
+        for job in group:
+            if job.needs not in filtered:
+                filtered[job.needs] = tuple(need for need in job.needs if owner[need] == index)
+            jobs.append(replace(job, needs=filtered[job.needs]))
+        needs = sorted({owner[need] for job in group for need in job.needs} - {index})
+        name = f"{pipeline.name} ({index + 1}/{len(groups)})"
+        result.append(Part(replace(pipeline, name=name, jobs=jobs), tuple(needs)))
+    return result
+
+
+def _units(pipeline: Pipeline) -> Dict[str, str]:
+    """Maps each job to the representative of the jobs that must share its part."""
+    parent = {job.name: job.name for job in pipeline.jobs}
+
+    def find(name: str) -> str:
+        while parent[name] != name:
+            parent[name] = parent[parent[name]]
+            name = parent[name]
+        return name
+
+    producers = pipeline.artifact_producers()
+    for job in pipeline.jobs:
+        for subscription in job.subscriptions:
+            parent[find(job.name)] = find(producers[subscription.artifact].name)
+
+    # Merging artifact groups can create cycles between units (a job needing
+    # the producer while a subscriber needs that job); fold every cycle into
+    # one unit.
+    edges: Dict[str, Set[str]] = {}
+    for job in pipeline.jobs:
+        for need in job.needs:
+            source, target = find(need), find(job.name)
+            if source != target:
+                edges.setdefault(source, set()).add(target)
+    for component in _cycles({find(job.name) for job in pipeline.jobs}, edges):
+        for unit in component[1:]:
+            parent[find(unit)] = find(component[0])
+    return {job.name: find(job.name) for job in pipeline.jobs}
+
+
+def _depths(units: List[str], edges: Mapping[str, Set[str]]) -> Dict[str, int]:
+    """Longest path from a root to every unit of the (acyclic) unit graph, keeping ``units`` order."""
+    incoming = {unit: 0 for unit in units}
+    for targets in edges.values():
+        for unit in targets:
+            incoming[unit] += 1
+    depths = {unit: 0 for unit in units}
+    ready = [unit for unit in units if not incoming[unit]]
+    while ready:
+        unit = ready.pop()
+        for target in edges.get(unit, ()):
+            depths[target] = max(depths[target], depths[unit] + 1)
+            incoming[target] -= 1
+            if not incoming[target]:
+                ready.append(target)
+    return depths
+
+
+def _components(band: List[str], edges: Mapping[str, Set[str]]) -> List[List[str]]:
+    """Splits ``band`` into groups of units linked by dependencies inside the band."""
+    inside = set(band)
+    parent = {unit: unit for unit in band}
+
+    def find(unit: str) -> str:
+        while parent[unit] != unit:
+            parent[unit] = parent[parent[unit]]
+            unit = parent[unit]
+        return unit
+
+    for unit in band:
+        for target in edges.get(unit, ()):
+            if target in inside:
+                parent[find(target)] = find(unit)
+    components: Dict[str, List[str]] = {}
+    for unit in band:
+        components.setdefault(find(unit), []).append(unit)
+    return list(components.values())
+
+
+def _cycles(nodes: Set[str], edges: Mapping[str, Set[str]]) -> List[List[str]]:
+    """Strongly connected components with more than one node (iterative Tarjan)."""
+    index: Dict[str, int] = {}
+    low: Dict[str, int] = {}
+    stack: List[str] = []
+    on_stack: Set[str] = set()
+    components: List[List[str]] = []
+    for root in sorted(nodes):
+        if root in index:
+            continue
+        work = [(root, iter(sorted(edges.get(root, ()))))]
+        index[root] = low[root] = len(index)
+        stack.append(root)
+        on_stack.add(root)
+        while work:
+            node, children = work[-1]
+            for child in children:
+                if child not in index:
+                    index[child] = low[child] = len(index)
+                    stack.append(child)
+                    on_stack.add(child)
+                    work.append((child, iter(sorted(edges.get(child, ())))))
+                    break
+                if child in on_stack:
+                    low[node] = min(low[node], index[child])
+            else:
+                work.pop()
+                if work:
+                    low[work[-1][0]] = min(low[work[-1][0]], low[node])
+                if low[node] == index[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == node:
+                            break
+                    if len(component) > 1:
+                        components.append(component)
+    return components
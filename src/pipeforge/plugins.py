@@ -0,0 +1,54 @@
+# SPDX-FileCopyrightText: 2025-present U.N. Owen <void@some.where>
+#
+# SPDX-License-Identifier: MIT
+
+"""Deferred loading helpers shared by the parser and renderer registries.
+
+Third-party packages expose extra providers through the ``pipeforge.parsers``
+and ``pipeforge.renderers`` entry-point groups. The entry-point name is the
+slug and the object is a ``BaseParser``/``BaseRenderer`` subclass or instance;
+it is only imported when that slug is first requested.
+"""
+
+from __future__ import annotations
+
+import importlib
+from typing import Any, List, Union
+
+PARSER_GROUP = "pipeforge.parsers"
+RENDERER_GROUP = "pipeforge.renderers"
+
+# Either a ``"package.module:Attribute"`` string or an entry point.
+Reference = Union[str, Any]
+
+
+def entry_points(group: str) -> List[Any]:
+    """Returns the installed entry points of ``group`` without loading them."""
+    from importlib import metadata
+
+    discovered = metadata.entry_points()
+    if hasattr(discovered, "select"):
+        return list(discovered.select(group=group))
+    return list(discovered.get(group, []))  # Python < 3.10
+
+
+def describe(reference: Reference) -> str:
+    """The ``"module:Attribute"`` text of ``reference``, for error messages."""
+    return reference if isinstance(reference, str) else str(getattr(reference, "value", reference))
+
+
+def load(reference: Reference) -> Any:
+    """Imports the object behind ``reference``."""
+    if not isinstance(reference, str):
+        return reference.load()
+    module_name, _, attribute = reference.partition(":")
+    obj: Any = importlib.import_module(module_name)
+    for part in filter(None, attribute.split(".")):
+        obj = getattr(obj, part)
+    return obj
+
+
+def instantiate(reference: Reference) -> Any:
+    """Loads ``reference`` and instantiates it when it points at a class."""
+    obj = load(reference)
+    return obj() if isinstance(obj, type) else obj
@@ -0,0 +1,151 @@
+# SPDX-FileCopyrightText: 2025-present U.N. Owen <void@some.where>
+#
+# SPDX-License-Identifier: MIT
+
+"""Per-phase instrumentation for conversions.
+
+``PipelineTranspiler(profiler=Profiler())`` records one ``PhaseRecord`` for
+every ``read``, ``load``, ``parse``, ``render``, and ``dump`` it performs
+(and ``optimize`` or ``validate`` when enabled), with wall time, the calling
+thread's CPU time, and object counts (bytes, jobs, steps, commands). Records can be summarised per phase or exported as
+Chrome trace JSON for ``chrome://tracing`` or Perfetto.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+PHASES = ("read", "load", "parse", "optimize", "render", "dump", "validate")
+
+
+@dataclass
+class PhaseRecord:
+    """One timed phase. ``start`` is a ``time.perf_counter()`` reading."""
+
+    phase: str
+    start: float
+    wall_s: float
+    cpu_s: float
+    label: Optional[str] = None
+    counts: Dict[str, int] = field(default_factory=dict)
+    pid: int = 0
+    tid: int = 0
+
+
+@dataclass
+class PhaseSummary:
+    phase: str
+    calls: int = 0
+    wall_s: float = 0.0
+    cpu_s: float = 0.0
+    counts: Dict[str, int] = field(default_factory=dict)
+
+
+class Profiler:
+    """Thread-safe collector of ``PhaseRecord``s."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.records: List[PhaseRecord] = []
+
+    @contextmanager
+    def phase(self, name: str, label: Optional[str] = None) -> Iterator[Dict[str, int]]:
+        """Times the block; add object counts to the yielded dict."""
+        counts: Dict[str, int] = {}
+        cpu = time.thread_time()
+        start = time.perf_counter()
+        try:
+            yield counts
+        finally:
+            wall = time.perf_counter() - start
+            record = PhaseRecord(
+                phase=name,
+                start=start,
+                wall_s=wall,
+                cpu_s=time.thread_time() - cpu,
+                label=label,
+                counts=counts,
+                pid=os.getpid(),
+                tid=threading.get_ident(),
+            )
+            with self._lock:
+                self.records.append(record)
+
+    def extend(self, records: Iterable[PhaseRecord]) -> None:
+        """Adds records collected elsewhere, e.g. by a worker process."""
+        with self._lock:
+            self.records.extend(records)
+
+    def summary(self) -> List[PhaseSummary]:
+        """Totals per phase, in pipeline order with unknown phases last."""
+        totals: Dict[str, PhaseSummary] = {}
+        with self._lock:
+            records = list(self.records)
+        for record in records:
+            total = totals.setdefault(record.phase, PhaseSummary(record.phase))
+            total.calls += 1
+            total.wall_s += record.wall_s
+            total.cpu_s += record.cpu_s
+            for key, value in record.counts.items():
+                total.counts[key] = total.counts.get(key, 0) + value
+        order = {phase: position for position, phase in enumerate(PHASES)}
+        return sorted(totals.values(), key=lambda total: (order.get(total.phase, len(order)), total.phase))
+
+    def chrome_trace(self) -> Dict[str, Any]:
+        """Returns the records as Chrome trace "complete" events."""
+        with self._lock:
+            records = sorted(self.records, key=lambda record: record.start)
+        origin = records[0].start if records else 0.0
+        events = []
+        for record in records:
+            args: Dict[str, Any] = {"cpu_ms": round(record.cpu_s * 1000, 3), **record.counts}
+            if record.label is not None:
+                args["label"] = record.label
+            events.append(
+                {
+                    "name": record.phase,
+                    "cat": "pipeforge",
+                    "ph": "X",
+                    "ts": round((record.start - origin) * 1_000_000, 3),
+                    "dur": round(record.wall_s * 1_000_000, 3),
+                    "pid": record.pid,
+                    "tid": record.tid,
+                    "args": args,
+                }
+            )
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def write_trace(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.chrome_trace()), encoding="utf-8")
+
+
+def format_summary(summaries: Iterable[PhaseSummary]) -> str:
+    """Renders phase totals as a plain-text table."""
+    lines = [f"{'phase':<8} {'calls':>6} {'wall ms':>10} {'cpu ms':>10}  counts"]
+    for total in summaries:
+        counts = " ".join(f"{key}={value}" for key, value in sorted(total.counts.items()))
+        lines.append(
+            f"{total.phase:<8} {total.calls:>6} {total.wall_s * 1000:>10.3f} {total.cpu_s * 1000:>10.3f}  {counts}"
+        )
+    return "\n".join(lines)
+
+
+class _NoPhase:
+    """Stand-in for ``Profiler.phase`` when profiling is off."""
+
+    def __enter__(self) -> Dict[str, int]:
+        return {}
+
+    def __exit__(self, *exc_info: Any) -> None:
+        return None
+
+
+NO_PHASE = _NoPhase()
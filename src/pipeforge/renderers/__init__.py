@@ -2,10 +2,11 @@
 #
 # SPDX-License-Identifier: MIT
 
-from .base import BaseRenderer
-from .bitbucket import BitbucketRenderer
-from .github import GitHubActionsRenderer
-from .gitlab import GitLabRenderer
+from __future__ import annotations
+
+import importlib
+from typing import Any
+
 from .registry import RendererRegistry, default_renderer_registry
 
 __all__ = [
@@ -16,3 +17,18 @@ __all__ = [
     "RendererRegistry",
     "default_renderer_registry",
 ]
+
+# Renderer implementations (and yaml) are imported on first access to keep CLI
+# startup cheap.
+_LAZY_EXPORTS = {
+    "BaseRenderer": ".base",
+    "BitbucketRenderer": ".bitbucket",
+    "GitHubActionsRenderer": ".github",
+    "GitLabRenderer": ".gitlab",
+}
+
+
+def __getattr__(name: str) -> Any:
+    if name in _LAZY_EXPORTS:
+        return getattr(importlib.import_module(_LAZY_EXPORTS[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -4,19 +4,82 @@
 
 from __future__ import annotations
 
-from abc import ABC, abstractmethod
-from typing import Optional
+import inspect
+import io
+from abc import ABC
+from typing import IO, Any, Dict, Optional, Tuple
 
+from pipeforge import yamlio
 from pipeforge.models import Pipeline
 
 
 class BaseRenderer(ABC):
-    """Renders the internal pipeline IR into a vendor-specific YAML."""
+    """Renders the internal pipeline IR into a vendor-specific YAML.
+
+    Subclasses implement ``stream_document`` (or, for small documents,
+    ``build_document``) and inherit ``render_to``, which writes that document
+    to a text stream, and ``render``, which returns the same text as a
+    string. Renderers with unusual output may override ``render`` directly
+    instead. A subclass that implements none of these fails when it is
+    defined.
+    """
 
     slug: str
     description: str
     output_hint: Optional[str] = None
 
-    @abstractmethod
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        # Checked when the class is defined, so a broken plugin fails while
+        # loading (a ``RendererNotFoundError``) rather than halfway through a
+        # conversion. Abstract intermediate bases are left alone.
+        hooks = ("stream_document", "build_document", "render")
+        if inspect.isabstract(cls) or any(getattr(cls, hook) is not getattr(BaseRenderer, hook) for hook in hooks):
+            return
+        raise TypeError(f"Renderer {cls.__name__} must implement stream_document() or build_document().")
+
+    def stream_document(self, pipeline: Pipeline) -> Dict[str, Any]:
+        """Returns the target document, with per-job collections produced lazily.
+
+        Lazy parts are generators (sequences) or ``yamlio.LazyMapping``
+        (mappings), so ``render_to`` writes each job as it is built.
+        """
+        if type(self).build_document is BaseRenderer.build_document:
+            raise NotImplementedError
+        return self.build_document(pipeline)
+
+    def build_document(self, pipeline: Pipeline) -> Dict[str, Any]:
+        """Returns the target document as plain YAML-serialisable data."""
+        return yamlio.materialize(self.stream_document(pipeline))
+
+    def render_to(self, pipeline: Pipeline, stream: IO[str]) -> None:
+        """Writes the rendered YAML to ``stream`` as jobs are visited."""
+        if type(self).render is not BaseRenderer.render:
+            stream.write(self.render(pipeline))
+            return
+        yamlio.dump(self.stream_document(pipeline), stream)
+
     def render(self, pipeline: Pipeline) -> str:
-        raise NotImplementedError
+        buffer = io.StringIO()
+        self.render_to(pipeline, buffer)
+        return buffer.getvalue()
+
+    def render_files(self, pipeline: Pipeline) -> Dict[str, str]:
+        """Renders the pipeline as a set of files, keyed by path relative to the repository root.
+
+        Most targets are a single file at ``default_output_path()``; renderers
+        that spread a pipeline over several files override this.
+        """
+        return {self.default_output_path(): self.render(pipeline)}
+
+    def schedule(self, pipeline: Pipeline) -> Dict[str, Tuple[str, ...]]:
+        """Maps every job to the jobs that must finish before it starts in the rendered output.
+
+        The default is the IR's own ``needs``; renderers whose target orders
+        jobs more coarsely (levels, stages) override it.
+        """
+        return {job.name: job.needs for job in pipeline.jobs}
+
+    def default_output_path(self) -> str:
+        """Relative path the rendered file conventionally lives at."""
+        return self.output_hint or f"{self.slug}.yml"
@@ -4,40 +4,184 @@
 
 from __future__ import annotations
 
-from typing import Any, Dict, List
+from collections import Counter
+from typing import Any, Dict, Iterator, List, Mapping, Tuple
 
-import yaml
-
-from pipeforge.models import Pipeline
+from pipeforge.caches import KNOWN_CACHES
+from pipeforge.changes import job_filters
+from pipeforge.models import Cache, Job, PathFilter, Pipeline
+from pipeforge.yamlio import SharedDict, SharedList
 
 from .base import BaseRenderer
-from .helpers import export_block
+from .helpers import exports, shared_exports, step_ids
+
+
+# Catalog caches that Bitbucket predefines under the same name.
+PREDEFINED_CACHES = frozenset({"maven", "gradle", "pip"})
 
 
 class BitbucketRenderer(BaseRenderer):
+    """Renders Bitbucket Pipelines.
+
+    Bitbucket filters changes per step only, so every step gets a
+    ``condition.changesets`` built from its job's path filter, or the
+    pipeline's when the job has none. Schedules are set up in Bitbucket's UI.
+    """
+
     slug = "bitbucket"
     description = "Bitbucket Pipelines"
     output_hint = "bitbucket-pipelines.yml"
 
-    def render(self, pipeline: Pipeline) -> str:
-        doc: Dict[str, Any] = {"pipelines": {"default": []}}
+    def stream_document(self, pipeline: Pipeline) -> Dict[str, Any]:
+        definitions: Dict[str, Any] = {}
+        cache_names = _cache_names(pipeline.jobs, definitions)
+        # Bitbucket has no file-level variables, so environments repeated
+        # across jobs become one anchored export block that steps alias.
+        shared = shared_exports(
+            env
+            for job in pipeline.jobs
+            for env in (pipeline.variables, *job.variants(), *(step.env for step in job.steps))
+        )
+
+        doc: Dict[str, Any] = {}
+        if definitions:
+            doc["definitions"] = {"caches": definitions}
+        doc["pipelines"] = {"default": self._levels(pipeline, cache_names, shared)}
+        return doc
 
-        for job in pipeline.jobs:
-            script = self._compose_script(pipeline, job)
-            step_body: Dict[str, Any] = {"name": job.name or "job", "script": script}
-            if job.image:
-                step_body["image"] = job.image
-            doc["pipelines"]["default"].append({"step": step_body})
+    def _levels(
+        self,
+        pipeline: Pipeline,
+        cache_names: Mapping[Tuple[Cache, ...], List[str]],
+        shared: Mapping[Mapping[str, str], str],
+    ) -> Iterator[Dict[str, Any]]:
+        # Bitbucket has no job-level dependencies: each dependency level runs
+        # as one ``parallel:`` group after the previous level has finished.
+        # Steps download every earlier artifact by default; steps that do not
+        # subscribe to any opt out with ``download: false``. Bitbucket has no
+        # matrix builds either, so matrix jobs become one step per entry.
+        # Steps with the same env and the very same IR steps (aliased tasks in
+        # the source) share one anchored ``script:`` list.
+        script_uses = Counter((env, step_ids(job)) for job in pipeline.jobs for _, env in _variants(job))
+        scripts: Dict[Tuple[Mapping[str, str], Tuple[int, ...]], List[str]] = {}
+        conditions = _conditions(pipeline)
+        produced = False
+        for level in pipeline.job_levels():
+            steps = []
+            for job in level:
+                for name, env in _variants(job):
+                    key = (env, step_ids(job))
+                    if key not in scripts:
+                        script = self._compose_script(pipeline, job, env, shared)
+                        scripts[key] = SharedList(script) if key[1] and script_uses[key] > 1 else script
+                    step_body = self._render_step(job, name, scripts[key])
+                    if job.name in conditions:
+                        step_body["condition"] = conditions[job.name]
+                    if job.caches:
+                        step_body["caches"] = cache_names[job.caches]
+                    paths = [artifact.path for artifact in job.artifacts]
+                    if produced and not job.subscriptions:
+                        step_body["artifacts"] = {"download": False, **({"paths": paths} if paths else {})}
+                    elif paths:
+                        step_body["artifacts"] = paths
+                    steps.append({"step": step_body})
+            produced = produced or any(job.artifacts for job in level)
+            yield steps[0] if len(steps) == 1 else {"parallel": steps}
 
-        return yaml.safe_dump(doc, sort_keys=False)
+    def schedule(self, pipeline: Pipeline) -> Dict[str, Tuple[str, ...]]:
+        # Every step waits for the whole previous level.
+        waits: Dict[str, Tuple[str, ...]] = {}
+        previous: Tuple[str, ...] = ()
+        for level in pipeline.job_levels():
+            for job in level:
+                waits[job.name] = previous
+            previous = tuple(job.name for job in level)
+        return waits
 
-    def _compose_script(self, pipeline: Pipeline, job) -> List[str]:
+    def _render_step(self, job: Job, name: str, script: List[str]) -> Dict[str, Any]:
+        step_body: Dict[str, Any] = {"name": name, "script": script}
+        if job.image:
+            step_body["image"] = job.image
+        return step_body
+
+    def _compose_script(
+        self,
+        pipeline: Pipeline,
+        job: Job,
+        env: Mapping[str, str],
+        shared: Mapping[Mapping[str, str], str],
+    ) -> List[str]:
         script: List[str] = []
-        script.extend(export_block(pipeline.variables))
-        script.extend(export_block(job.env))
+        script.extend(exports(pipeline.variables, shared))
+        script.extend(exports(env, shared))
         for step in job.steps:
-            script.extend(export_block(step.env))
+            script.extend(exports(step.env, shared))
             script.extend(step.commands)
         if not script:
             script.append("echo TODO: add commands")
         return script
+
+
+def _conditions(pipeline: Pipeline) -> Dict[str, Dict[str, Any]]:
+    """``condition:`` of every filtered job, one shared mapping per distinct filter."""
+    filters = job_filters(pipeline)
+    merged: Dict[str, PathFilter] = {}
+    for job in pipeline.jobs:
+        own = filters[job.name]
+        exclude = tuple(dict.fromkeys(own.exclude + pipeline.paths.exclude))
+        merged[job.name] = PathFilter(own.include or pipeline.paths.include, exclude)
+    uses = Counter(item for item in merged.values() if item)
+    bodies: Dict[PathFilter, Dict[str, Any]] = {}
+    for item, count in uses.items():
+        changesets: Dict[str, List[str]] = {}
+        if item.include:
+            changesets["includePaths"] = list(item.include)
+        if item.exclude:
+            changesets["excludePaths"] = list(item.exclude)
+        body = {"changesets": changesets}
+        bodies[item] = SharedDict(body) if count > 1 else body
+    return {name: bodies[item] for name, item in merged.items() if item}
+
+
+def _variants(job: Job) -> List[Tuple[str, Mapping[str, str]]]:
+    """Step name and env of every run of ``job``."""
+    name = job.name or "job"
+    if not job.matrix:
+        return [(name, job.env)]
+    return [
+        (f"{name} ({', '.join(entry.values())})", env) for entry, env in zip(job.matrix, job.variants())
+    ]
+
+
+def _cache_names(jobs: List[Job], definitions: Dict[str, Any]) -> Dict[Tuple[Cache, ...], List[str]]:
+    """Returns the cache names of every distinct job cache set, shared where repeated."""
+    names: Dict[Tuple[Cache, ...], List[str]] = {}
+    uses: Counter[Tuple[Cache, ...]] = Counter()
+    for job in jobs:
+        if job.caches:
+            uses[job.caches] += len(job.matrix) or 1
+    for caches, count in uses.items():
+        defined = _define_caches(caches, definitions)
+        names[caches] = SharedList(defined) if count > 1 else defined
+    return names
+
+
+def _define_caches(caches: Tuple[Cache, ...], definitions: Dict[str, Any]) -> List[str]:
+    """Returns the step's cache names, adding custom caches to ``definitions``.
+
+    Custom Bitbucket caches hold a single directory, so caches with several
+    paths become ``<name>``, ``<name>-2``, and so on.
+    """
+    names: List[str] = []
+    for cache in caches:
+        if cache.name in PREDEFINED_CACHES and cache == KNOWN_CACHES[cache.name]:
+            names.append(cache.name)
+            continue
+        for index, path in enumerate(cache.paths, start=1):
+            name = cache.name if index == 1 else f"{cache.name}-{index}"
+            if cache.key_files:
+                definitions.setdefault(name, {"key": {"files": list(cache.key_files)}, "path": path})
+            else:
+                definitions.setdefault(name, path)
+            names.append(name)
+    return names
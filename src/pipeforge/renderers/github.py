@@ -5,52 +5,115 @@
 from __future__ import annotations
 
 import re
-from typing import Any, Dict, List
+from collections import Counter
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple
 
-import yaml
-
-from pipeforge.models import Pipeline
+from pipeforge.changes import job_filters
+from pipeforge.models import Artifact, Cache, Job, PathFilter, Pipeline, Step, Subscription
+from pipeforge.yamlio import LazyMapping, LiteralBlock, SharedDict
 
 from .base import BaseRenderer
+from .helpers import job_ids, matrix_axes, matrix_entries
 
 
 class GitHubActionsRenderer(BaseRenderer):
+    """Renders a GitHub Actions workflow.
+
+    The pipeline's path filter becomes ``on.push.paths`` and its schedules
+    ``on.schedule``. Jobs with path filters of their own wait for a
+    ``changes`` job that runs ``dorny/paths-filter`` and only run when it
+    reports a match (or on a schedule); jobs that need a job a filter can
+    skip still run once it is skipped.
+    """
+
     slug = "github"
     description = "GitHub Actions"
     output_hint = ".github/workflows/pipeforge.yml"
 
-    def render(self, pipeline: Pipeline) -> str:
-        doc: Dict[str, Any] = {
+    def stream_document(self, pipeline: Pipeline) -> Dict[str, Any]:
+        return {
             "name": pipeline.name or "PipeForge workflow",
-            "on": ["push"],
-            "jobs": {},
+            "on": _events(pipeline),
+            "jobs": LazyMapping(self._jobs(pipeline)),
         }
 
-        for index, job in enumerate(pipeline.jobs, start=1):
-            job_id = _slugify(job.name or f"job-{index}")
-            doc["jobs"][job_id] = self._render_job(pipeline, job)
-
-        return yaml.safe_dump(doc, sort_keys=False)
+    def _jobs(self, pipeline: Pipeline) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        ids = job_ids(pipeline.jobs, _slugify)
+        # One step mapping per cache, shared (and so anchored) across jobs.
+        cache_uses = Counter(cache for job in pipeline.jobs for cache in job.caches)
+        cache_steps = {
+            cache: SharedDict(_cache_step(cache)) if count > 1 else _cache_step(cache)
+            for cache, count in cache_uses.items()
+        }
+        producers = pipeline.artifact_producers()
+        # A step the parser shared between jobs (an aliased task) becomes one
+        # anchored step mapping, as long as the jobs also share their env.
+        step_uses = Counter(_step_key(job, step) for job in pipeline.jobs for step in job.steps)
+        step_bodies: Dict[Tuple[Any, ...], Dict[str, Any]] = {}
+        filtered = {ids[name]: item.include for name, item in job_filters(pipeline).items() if item.include}
+        changes = _unique_id("changes", ids.values())
+        if filtered:
+            yield changes, _changes_job(filtered)
+        schedules = any(trigger.kind == "schedule" for trigger in pipeline.triggers)
+        for job in pipeline.jobs:
+            needs = [ids[need] for need in job.needs]
+            yield ids[job.name], self._render_job(
+                pipeline,
+                job,
+                [changes, *needs] if ids[job.name] in filtered else needs,
+                _condition(ids[job.name], needs, filtered, changes, schedules),
+                [cache_steps[cache] for cache in job.caches],
+                producers,
+                step_uses,
+                step_bodies,
+            )
 
-    def _render_job(self, pipeline: Pipeline, job) -> Dict[str, Any]:
-        job_env = {**pipeline.variables, **job.env}
+    def _render_job(
+        self,
+        pipeline: Pipeline,
+        job: Job,
+        needs: List[str],
+        condition: Optional[str],
+        cache_steps: List[Dict[str, Any]],
+        producers: Mapping[str, Job],
+        step_uses: Mapping[Tuple[Any, ...], int],
+        step_bodies: Dict[Tuple[Any, ...], Dict[str, Any]],
+    ) -> Dict[str, Any]:
+        job_env: Dict[str, str] = {**pipeline.variables, **job.env}
+        if job.matrix:
+            job_env.update((key, f"${{{{ matrix.{key} }}}}") for key in job.matrix[0])
+        if job_env and any(not step.env for step in job.steps):
+            # Steps without their own env repeat the job's, so share it.
+            job_env = SharedDict(job_env)
         steps = [
             {"name": "Checkout", "uses": "actions/checkout@v4"},
+            *cache_steps,
+            *(_download_step(subscription, producers) for subscription in job.subscriptions),
         ]
         for step in job.steps:
-            step_body: Dict[str, Any] = {
-                "name": step.name or "Run commands",
-                "run": "\n".join(step.commands) if step.commands else "echo TODO: add commands",
-            }
-            step_env = {**job_env, **step.env} if step.env else job_env
-            if step_env:
-                step_body["env"] = step_env
-            steps.append(step_body)
-
-        job_body: Dict[str, Any] = {
-            "runs-on": "ubuntu-latest",
-            "steps": steps,
-        }
+            key = _step_key(job, step)
+            if key not in step_bodies:
+                step_body: Dict[str, Any] = {
+                    "name": step.name or "Run commands",
+                    "run": "\n".join(step.commands) if step.commands else "echo TODO: add commands",
+                }
+                step_env = {**job_env, **step.env} if step.env else job_env
+                if step_env:
+                    step_body["env"] = step_env
+                step_bodies[key] = SharedDict(step_body) if step_uses[key] > 1 else step_body
+            steps.append(step_bodies[key])
+
+        steps.extend(_upload_step(artifact) for artifact in job.artifacts)
+
+        job_body: Dict[str, Any] = {"runs-on": "ubuntu-latest"}
+        if job.matrix:
+            axes = matrix_axes(job.matrix)
+            job_body["strategy"] = {"matrix": axes if axes is not None else {"include": matrix_entries(job.matrix)}}
+        if needs:
+            job_body["needs"] = needs
+        if condition:
+            job_body["if"] = condition
+        job_body["steps"] = steps
         if job_env:
             job_body["env"] = job_env
         if job.image:
@@ -58,6 +121,124 @@ class GitHubActionsRenderer(BaseRenderer):
         return job_body
 
 
+def _events(pipeline: Pipeline) -> Any:
+    """The ``on:`` block: every push unless the pipeline filters paths or has other triggers."""
+    if not pipeline.triggers and not pipeline.paths:
+        return ["push"]
+    events: Dict[str, Any] = {}
+    if not pipeline.triggers or any(trigger.kind == "push" for trigger in pipeline.triggers):
+        events["push"] = _push_filter(pipeline.paths)
+    schedules = [{"cron": trigger.cron} for trigger in pipeline.triggers if trigger.kind == "schedule"]
+    if schedules:
+        events["schedule"] = schedules
+    return events
+
+
+def _push_filter(paths: PathFilter) -> Dict[str, Any]:
+    # ``paths`` and ``paths-ignore`` cannot be combined; ``!`` patterns exclude within ``paths``.
+    if paths.include:
+        return {"paths": [*paths.include, *(f"!{pattern}" for pattern in paths.exclude)]}
+    if paths.exclude:
+        return {"paths-ignore": list(paths.exclude)}
+    return {}
+
+
+def _changes_job(filtered: Mapping[str, Tuple[str, ...]]) -> Dict[str, Any]:
+    """Job reporting, per filtered job id, whether the push changed a matching path."""
+    lines: List[str] = []
+    for job_id, patterns in filtered.items():
+        lines.append(f"{job_id}:")
+        # Single-quoted, since globs may start with ``*`` or ``!``.
+        lines.extend("  - '{}'".format(pattern.replace("'", "''")) for pattern in patterns)
+    return {
+        "runs-on": "ubuntu-latest",
+        "outputs": {job_id: f"${{{{ steps.filter.outputs.{job_id} }}}}" for job_id in filtered},
+        "steps": [
+            {"name": "Checkout", "uses": "actions/checkout@v4"},
+            {
+                "name": "Detect changed paths",
+                "id": "filter",
+                "uses": "dorny/paths-filter@v3",
+                "with": {"filters": LiteralBlock("\n".join(lines))},
+            },
+        ],
+    }
+
+
+def _condition(
+    job_id: str,
+    needs: List[str],
+    filtered: Mapping[str, Tuple[str, ...]],
+    changes: str,
+    schedules: bool,
+) -> Optional[str]:
+    checks = []
+    if any(need in filtered for need in needs):
+        # A skipped need would skip this job too unless it checks the status itself.
+        checks.append("!failure() && !cancelled()")
+    if job_id in filtered:
+        check = f"needs.{changes}.outputs.{job_id} == 'true'"
+        checks.append(f"(github.event_name == 'schedule' || {check})" if schedules else check)
+    return f"${{{{ {' && '.join(checks)} }}}}" if checks else None
+
+
+def _unique_id(base: str, taken: Iterable[str]) -> str:
+    used = set(taken)
+    candidate, index = base, 1
+    while candidate in used:
+        index += 1
+        candidate = f"{base}_{index}"
+    return candidate
+
+
+def _step_key(job: Job, step: Step) -> Tuple[Any, ...]:
+    # The step's env mapping includes the job's, so both are part of the key.
+    return (id(step), job.env, tuple(job.matrix[0]) if job.matrix else ())
+
+
+def _cache_step(cache: Cache) -> Dict[str, Any]:
+    """``actions/cache`` step keyed on the OS and a hash of the cache's key files."""
+    prefix = f"${{{{ runner.os }}}}-{cache.name}-"
+    if cache.key_files:
+        patterns = ", ".join(f"'{pattern}'" for pattern in cache.key_files)
+        key = f"{prefix}${{{{ hashFiles({patterns}) }}}}"
+    else:
+        key = f"{prefix}${{{{ github.sha }}}}"
+    return {
+        "name": f"Cache {cache.name}",
+        "uses": "actions/cache@v4",
+        "with": {"path": _paths(cache.paths), "key": key, "restore-keys": prefix},
+    }
+
+
+def _upload_step(artifact: Artifact) -> Dict[str, Any]:
+    return {
+        "name": f"Upload {artifact.name}",
+        "uses": "actions/upload-artifact@v4",
+        "with": {"name": _artifact_name(artifact.name), "path": artifact.path},
+    }
+
+
+def _download_step(subscription: Subscription, producers: Mapping[str, Job]) -> Dict[str, Any]:
+    # upload-artifact stores files relative to their common directory, so
+    # restore them under the producer's location unless told otherwise.
+    artifact = next(item for item in producers[subscription.artifact].artifacts if item.name == subscription.artifact)
+    return {
+        "name": f"Download {artifact.name}",
+        "uses": "actions/download-artifact@v4",
+        "with": {"name": _artifact_name(artifact.name), "path": subscription.destination or artifact.location or "."},
+    }
+
+
+def _artifact_name(name: str) -> str:
+    # Artifact names may not contain these characters.
+    return re.sub(r'[":<>|*?\\/\r\n]', "-", name)
+
+
+def _paths(paths: Tuple[str, ...]) -> str:
+    return paths[0] if len(paths) == 1 else LiteralBlock("\n".join(paths))
+
+
 def _slugify(value: str) -> str:
     value = value.strip().lower()
     value = re.sub(r"\s+", "_", value)
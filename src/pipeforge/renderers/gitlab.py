@@ -5,54 +5,384 @@
 from __future__ import annotations
 
 import re
-from typing import Any, Dict, List
+from collections import Counter
+from dataclasses import replace
+from typing import Any, Dict, FrozenSet, Iterator, List, Mapping, Optional, Set, Tuple
 
-import yaml
-
-from pipeforge.models import Pipeline
+from pipeforge import yamlio
+from pipeforge.analysis import DEFAULT_DURATION
+from pipeforge.changes import combine_filters, job_filters
+from pipeforge.models import ANY_PATH, Cache, Job, PathFilter, Pipeline
+from pipeforge.partition import Part, job_weights, split_pipeline
+from pipeforge.yamlio import LazyMapping, SharedDict, SharedList
 
 from .base import BaseRenderer
-from .helpers import export_block
+from .helpers import exports, job_ids, matrix_axes, matrix_entries, shared_exports, step_ids
+
+# GitLab rejects jobs with more entries in ``needs:``; such jobs fall back to
+# plain stage ordering, which is still correct, just less eager.
+MAX_NEEDS = 50
+# GitLab limits jobs to four caches and cache keys to two files.
+MAX_CACHES = 4
+MAX_KEY_FILES = 2
+# Child pipelines of a split plan, relative to the repository root.
+CHILD_PIPELINE_DIR = ".gitlab/ci"
+SPLIT_STRATEGIES = ("jobs", "cost")
 
 
 class GitLabRenderer(BaseRenderer):
+    """Renders GitLab CI/CD, optionally split into child pipelines.
+
+    With ``split`` above one, ``render_files()`` spreads the jobs over that
+    many child pipelines under ``CHILD_PIPELINE_DIR``, balanced by job runs or,
+    with ``split_by="cost"``, by ``durations`` (seconds per job name), and
+    writes a parent ``.gitlab-ci.yml`` whose trigger jobs start each child
+    with ``strategy: depend`` once the children it depends on have passed.
+    ``render()`` always returns the whole pipeline as one file.
+
+    Path filters become ``rules:changes`` (GitLab has no exclude globs, so
+    only includes are kept) and schedule triggers a ``workflow:`` rule; the
+    schedules themselves are set up in GitLab's UI. Needs on jobs that a
+    filter can skip are ``optional``. A split plan filters whole child
+    pipelines from the parent, since ``changes`` always matches inside a
+    child pipeline.
+    """
+
     slug = "gitlab"
     description = "GitLab CI/CD"
     output_hint = ".gitlab-ci.yml"
 
-    def render(self, pipeline: Pipeline) -> str:
-        doc: Dict[str, Any] = {}
+    def __init__(
+        self,
+        *,
+        split: int = 0,
+        split_by: str = "jobs",
+        durations: Optional[Mapping[str, float]] = None,
+    ) -> None:
+        if split_by not in SPLIT_STRATEGIES:
+            raise ValueError(f"Unknown split strategy '{split_by}', expected 'jobs' or 'cost'.")
+        self.split = split
+        self.split_by = split_by
+        self.durations = dict(durations or {})
+
+    def render_files(self, pipeline: Pipeline) -> Dict[str, str]:
+        if self.split < 2:
+            return super().render_files(pipeline)
+        weights = job_weights(pipeline, self.durations, DEFAULT_DURATION) if self.split_by == "cost" else None
+        parts = split_pipeline(pipeline, self.split, weights)
+        if len(parts) < 2:
+            return super().render_files(pipeline)
+        paths = [f"{CHILD_PIPELINE_DIR}/part-{index}.yml" for index in range(1, len(parts) + 1)]
+        files = {self.default_output_path(): yamlio.dump(_parent_document(pipeline, parts, paths)) or ""}
+        for part, path in zip(parts, paths):
+            # The parent decides whether a child runs at all.
+            files[path] = self.render(replace(part.pipeline, triggers=[], paths=ANY_PATH))
+        return files
 
+    def stream_document(self, pipeline: Pipeline) -> Dict[str, Any]:
+        return LazyMapping(self._entries(pipeline))
+
+    def _entries(self, pipeline: Pipeline) -> Iterator[Tuple[str, Any]]:
+        workflow = _workflow(pipeline)
+        if workflow:
+            yield "workflow", workflow
         if pipeline.variables:
-            doc["variables"] = pipeline.variables
+            yield "variables", dict(pipeline.variables)
+
+        # Plan variables live in the top-level ``variables:`` block. Jobs with
+        # the same env and caches share one ``variables:`` mapping and one
+        # ``cache:`` list, and steps with the same env share one export block,
+        # so the emitter anchors them instead of repeating them.
+        cache_uses = Counter(job.caches for job in pipeline.jobs)
+        cache_configs = {caches: _cache_config(caches, pipeline.variables) for caches in cache_uses}
+        for caches, (entries, redirects) in cache_configs.items():
+            if entries and cache_uses[caches] > 1:
+                cache_configs[caches] = (SharedList(entries), redirects)
+        job_variables: Dict[Tuple[Mapping[str, str], Tuple[Cache, ...]], Dict[str, str]] = {}
+        for key, count in Counter((job.env, job.caches) for job in pipeline.jobs).items():
+            env, redirects = key[0], cache_configs[key[1]][1]
+            variables = {**{name: value for name, value in redirects.items() if name not in env}, **env}
+            job_variables[key] = SharedDict(variables) if count > 1 else variables
+        shared = shared_exports(step.env for job in pipeline.jobs for step in job.steps)
+        # Jobs whose steps are the very same objects (aliased tasks in the
+        # source) share one anchored ``script:`` list.
+        script_uses = Counter(step_ids(job) for job in pipeline.jobs)
+        scripts: Dict[Tuple[int, ...], List[str]] = {}
+        ids = job_ids(pipeline.jobs, _slugify)
+        positions, labels = _assign_stages(pipeline)
+        earlier = _earlier_stage_counts(positions)
+        by_name = {job.name: job for job in pipeline.jobs}
+        closures: Dict[Tuple[str, ...], FrozenSet[str]] = {}
+        producers = pipeline.artifact_producers()
+        first_producer = min((positions[job.name] for job in producers.values()), default=None)
+        # Jobs with the same globs share one anchored ``rules:`` list.
+        filters = job_filters(pipeline)
+        rule_uses = Counter(item.include for item in filters.values() if item.include)
+        rules = {
+            include: SharedList(_change_rules(include)) if count > 1 else _change_rules(include)
+            for include, count in rule_uses.items()
+        }
+        skippable = {ids[name] for name, item in filters.items() if item.include}
 
-        stages: List[str] = []
+        for job in pipeline.jobs:
+            position = positions[job.name]
+            # Stage order alone already waits for every job in earlier stages;
+            # ``needs:`` is only emitted where it lets the job start sooner.
+            links: Dict[str, Any] = {}
+            sources = list(dict.fromkeys(ids[producers[item.artifact].name] for item in job.subscriptions))
+            if _uses_needs(job, earlier[position], by_name, closures):
+                needs: List[Any] = [ids[need] for need in job.needs]
+                if producers:
+                    # Only fetch artifacts from the jobs this one subscribes to.
+                    needs = [{"job": need, "artifacts": need in sources} for need in needs] + [
+                        {"job": source, "artifacts": True} for source in sources if source not in needs
+                    ]
+                if skippable:
+                    needs = [_optional_need(need, skippable) for need in needs]
+                links["needs"] = needs
+            elif first_producer is not None and position > first_producer:
+                # Without ``needs:``, jobs download every earlier artifact unless told otherwise.
+                links["dependencies"] = sources
+            if filters[job.name].include:
+                links["rules"] = rules[filters[job.name].include]
+            key = step_ids(job)
+            if key not in scripts:
+                script = self._script(job, shared)
+                scripts[key] = SharedList(script) if key and script_uses[key] > 1 else script
+            yield ids[job.name], self._render_job(
+                labels[position],
+                links,
+                job,
+                cache_configs[job.caches][0],
+                job_variables[(job.env, job.caches)],
+                scripts[key],
+            )
 
-        for index, job in enumerate(pipeline.jobs, start=1):
-            job_stage = "build" if index == 1 else "test"
-            stages.append(job_stage)
-            job_id = _slugify(job.name or f"job-{index}")
-            doc[job_id] = self._render_job(job_stage, pipeline, job)
+        if positions:
+            yield "stages", [labels[position] for position in sorted(set(positions.values()))]
 
-        if stages:
-            doc["stages"] = list(dict.fromkeys(stages))
+    def schedule(self, pipeline: Pipeline) -> Dict[str, Tuple[str, ...]]:
+        # Jobs with ``needs:`` wait for those (and their artifact sources);
+        # the rest wait for every job in an earlier stage.
+        positions, _ = _assign_stages(pipeline)
+        earlier = _earlier_stage_counts(positions)
+        by_name = {job.name: job for job in pipeline.jobs}
+        closures: Dict[Tuple[str, ...], FrozenSet[str]] = {}
+        producers = pipeline.artifact_producers()
+        before: Dict[int, Tuple[str, ...]] = {}
+        ordered = sorted(pipeline.jobs, key=lambda job: positions[job.name])
+        for position in set(positions.values()):
+            before[position] = tuple(job.name for job in ordered[: earlier[position]])
 
-        return yaml.safe_dump(doc, sort_keys=False)
+        waits: Dict[str, Tuple[str, ...]] = {}
+        for job in pipeline.jobs:
+            if _uses_needs(job, earlier[positions[job.name]], by_name, closures):
+                sources = (producers[item.artifact].name for item in job.subscriptions)
+                waits[job.name] = tuple(dict.fromkeys((*job.needs, *sources)))
+            else:
+                waits[job.name] = before[positions[job.name]]
+        return waits
 
-    def _render_job(self, stage: str, pipeline: Pipeline, job) -> Dict[str, Any]:
+    def _script(self, job: Job, shared: Mapping[Mapping[str, str], str]) -> List[str]:
         script: List[str] = []
-        script.extend(export_block(pipeline.variables))
-        script.extend(export_block(job.env))
         for step in job.steps:
-            script.extend(export_block(step.env))
+            script.extend(exports(step.env, shared))
             script.extend(step.commands)
+        return script or ["echo TODO: add commands"]
 
-        job_body: Dict[str, Any] = {"stage": stage, "script": script or ["echo TODO: add commands"]}
+    def _render_job(
+        self,
+        stage: str,
+        links: Dict[str, Any],
+        job: Job,
+        cache_entries: List[Dict[str, Any]],
+        variables: Dict[str, str],
+        script: List[str],
+    ) -> Dict[str, Any]:
+        job_body: Dict[str, Any] = {"stage": stage, **links}
+        if variables:
+            job_body["variables"] = variables
+        if cache_entries:
+            job_body["cache"] = cache_entries
+        job_body["script"] = script
         if job.image:
             job_body["image"] = job.image
+        if job.matrix:
+            # GitLab sets each entry's values as variables of its own copy of the job.
+            axes = matrix_axes(job.matrix)
+            job_body["parallel"] = {"matrix": [axes] if axes is not None else matrix_entries(job.matrix)}
+        if job.artifacts:
+            job_body["artifacts"] = {"paths": [artifact.path for artifact in job.artifacts]}
         return job_body
 
 
+def _parent_document(pipeline: Pipeline, parts: List[Part], paths: List[str]) -> Dict[str, Any]:
+    """Trigger jobs for the child pipelines, staged by how deep each part sits in the part graph.
+
+    A child whose jobs all have path filters only runs for changes that
+    match one of them.
+    """
+    filters = job_filters(pipeline)
+    part_filters: List[PathFilter] = []
+    for part in parts:
+        combined = filters[part.pipeline.jobs[0].name]
+        for job in part.pipeline.jobs[1:]:
+            combined = combine_filters(combined, filters[job.name])
+        part_filters.append(combined)
+    skippable = {f"part_{index + 1}" for index, item in enumerate(part_filters) if item.include}
+    depths: List[int] = []
+    ancestors: List[FrozenSet[int]] = []
+    for part in parts:
+        depths.append(max((depths[need] + 1 for need in part.needs), default=0))
+        ancestors.append(frozenset(part.needs).union(*(ancestors[need] for need in part.needs)))
+    document: Dict[str, Any] = {}
+    workflow = _workflow(pipeline)
+    if workflow:
+        document["workflow"] = workflow
+    for index, (part, path) in enumerate(zip(parts, paths)):
+        body: Dict[str, Any] = {"stage": f"stage-{depths[index] + 1}"}
+        # As for jobs, ``needs:`` is only worth it when it lets the child start sooner.
+        earlier = sum(1 for depth in depths if depth < depths[index])
+        if len(ancestors[index]) != earlier and len(part.needs) <= MAX_NEEDS:
+            body["needs"] = [_optional_need(f"part_{need + 1}", skippable) for need in part.needs]
+        if part_filters[index].include:
+            body["rules"] = _change_rules(part_filters[index].include)
+        body["trigger"] = {"include": path, "strategy": "depend"}
+        document[f"part_{index + 1}"] = body
+    document["stages"] = [f"stage-{depth + 1}" for depth in range(max(depths) + 1)]
+    return document
+
+
+def _workflow(pipeline: Pipeline) -> Optional[Dict[str, Any]]:
+    """``workflow:`` rules for the pipeline's triggers and path filter, if it needs any."""
+    schedules = any(trigger.kind == "schedule" for trigger in pipeline.triggers)
+    pushes = not pipeline.triggers or any(trigger.kind == "push" for trigger in pipeline.triggers)
+    if pushes and not pipeline.paths.include:
+        return None
+    rules: List[Dict[str, Any]] = []
+    if schedules:
+        rules.append({"if": '$CI_PIPELINE_SOURCE == "schedule"'})
+    if pushes:
+        rules.extend(_change_rules(pipeline.paths.include))
+    return {"rules": rules}
+
+
+def _change_rules(include: Tuple[str, ...]) -> List[Dict[str, Any]]:
+    return [{"changes": list(include)}]
+
+
+def _optional_need(need: Any, skippable: Set[str]) -> Any:
+    """Marks a ``needs:`` entry optional when its job may be skipped by a path filter."""
+    name = need["job"] if isinstance(need, dict) else need
+    if name not in skippable:
+        return need
+    return {**need, "optional": True} if isinstance(need, dict) else {"job": need, "optional": True}
+
+
+def _cache_config(
+    caches: Tuple[Cache, ...],
+    plan_variables: Mapping[str, str],
+) -> Tuple[List[Dict[str, Any]], Dict[str, str]]:
+    """Returns ``cache:`` entries and the variables that redirect tools into them.
+
+    GitLab only caches paths inside the project, so relocatable caches move to
+    ``.cache/<name>`` and other caches keep just their project-relative paths.
+    Variables the plan already sets are left alone.
+    """
+    entries: List[Dict[str, Any]] = []
+    redirects: Dict[str, str] = {}
+    for cache in caches:
+        if len(entries) == MAX_CACHES:
+            break
+        if cache.relocate:
+            paths = [f".cache/{cache.name}"]
+            for key, template in cache.relocate.items():
+                if key not in plan_variables:
+                    redirects[key] = template.format(path=f"$CI_PROJECT_DIR/{paths[0]}")
+        else:
+            paths = [path for path in cache.paths if not path.startswith(("~", "/", "$"))]
+            if not paths:
+                continue
+        # ``key:files`` takes literal paths; globbed key files fall back to a fixed key.
+        files = [path[3:] if path.startswith("**/") else path for path in cache.key_files]
+        files = [path for path in files if not any(char in path for char in "*?[")][:MAX_KEY_FILES]
+        key: Any = {"files": files, "prefix": cache.name} if files else cache.name
+        entries.append({"key": key, "paths": paths})
+    return entries, redirects
+
+
+def _assign_stages(pipeline: Pipeline) -> Tuple[Dict[str, int], Dict[int, str]]:
+    """Places each job in its source stage, or later when one of its needs is not earlier.
+
+    Returns job positions and the label of every position. Positions past the
+    source stages (or all of them, for an IR without stages) are named
+    ``stage-<n>``.
+    """
+    order = {stage: position for position, stage in enumerate(pipeline.stages)}
+    positions: Dict[str, int] = {}
+    for level in pipeline.job_levels():
+        for job in level:
+            base = order.get(job.stage, 0) if job.stage is not None else 0
+            positions[job.name] = max([base, *(positions[need] + 1 for need in job.needs)])
+    labels = {
+        position: pipeline.stages[position] if position < len(pipeline.stages) else f"stage-{position + 1}"
+        for position in set(positions.values())
+    }
+    return positions, labels
+
+
+def _earlier_stage_counts(positions: Mapping[str, int]) -> Dict[int, int]:
+    """Number of jobs placed before each position."""
+    sizes: Dict[int, int] = {}
+    for position in positions.values():
+        sizes[position] = sizes.get(position, 0) + 1
+    counts: Dict[int, int] = {}
+    running = 0
+    for position in sorted(sizes):
+        counts[position] = running
+        running += sizes[position]
+    return counts
+
+
+def _uses_needs(
+    job: Job,
+    earlier: int,
+    by_name: Mapping[str, Job],
+    closures: Dict[Tuple[str, ...], FrozenSet[str]],
+) -> bool:
+    """Whether ``needs:`` lets the job start before all ``earlier`` jobs of previous stages finish."""
+    return len(_ancestors(job.needs, by_name, closures)) != earlier and len(job.needs) <= MAX_NEEDS
+
+
+def _ancestors(
+    needs: Tuple[str, ...],
+    by_name: Mapping[str, Job],
+    closures: Dict[Tuple[str, ...], FrozenSet[str]],
+) -> FrozenSet[str]:
+    """Transitive dependencies of ``needs``, memoised per needs tuple.
+
+    Jobs chained by stage share one needs tuple, so wide plans compute each
+    closure once per stage rather than once per job.
+    """
+    cached = closures.get(needs)
+    if cached is not None:
+        return cached
+    result = set(needs)
+    pending = list(needs)
+    while pending:
+        parent = by_name[pending.pop()]
+        known = closures.get(parent.needs)
+        if known is not None:
+            result.update(known)
+            continue
+        for need in parent.needs:
+            if need not in result:
+                result.add(need)
+                pending.append(need)
+    closures[needs] = frozenset(result)
+    return closures[needs]
+
+
 def _slugify(value: str) -> str:
     value = value.strip().lower()
     value = re.sub(r"\s+", "_", value)
@@ -4,9 +4,70 @@
 
 from __future__ import annotations
 
-from typing import Dict, List
+from collections import Counter
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
 
+from pipeforge.models import Job
+from pipeforge.yamlio import SharedBlock
 
-def export_block(env: Dict[str, str]) -> List[str]:
+
+def export_block(env: Mapping[str, str]) -> List[str]:
     """Returns shell export commands for the given environment mapping."""
     return [f"export {key}=\"{value}\"" for key, value in env.items()]
+
+
+def shared_exports(envs: Iterable[Mapping[str, str]]) -> Dict[Mapping[str, str], SharedBlock]:
+    """Returns one literal export block for every environment used more than once.
+
+    The YAML emitter anchors the first use of each block and aliases the rest,
+    so repeated exports are written once per file instead of once per job.
+    """
+    counts = Counter(env for env in envs if env)
+    return {env: SharedBlock("\n".join(export_block(env))) for env, count in counts.items() if count > 1}
+
+
+def exports(env: Mapping[str, str], shared: Mapping[Mapping[str, str], SharedBlock]) -> List[str]:
+    """Export commands for ``env``, using its shared block when there is one."""
+    block = shared.get(env) if env else None
+    return [block] if block is not None else export_block(env)
+
+
+def step_ids(job: Job) -> Tuple[int, ...]:
+    """Identity key of a job's steps.
+
+    Parsers hand out the same ``Step`` objects for aliased source tasks, so
+    jobs with equal keys can share (and anchor) whatever is built from them.
+    """
+    return tuple(id(step) for step in job.steps)
+
+
+def job_ids(jobs: Iterable[Job], slugify: Callable[[str], str]) -> Dict[str, str]:
+    """Maps job names to unique target ids, suffixing ids that collide after slugifying."""
+    ids: Dict[str, str] = {}
+    used = set()
+    for index, job in enumerate(jobs, start=1):
+        base = slugify(job.name or f"job-{index}")
+        candidate, suffix = base, 1
+        while candidate in used:
+            suffix += 1
+            candidate = f"{base}_{suffix}"
+        used.add(candidate)
+        ids[job.name] = candidate
+    return ids
+
+
+def matrix_axes(matrix: Sequence[Mapping[str, str]]) -> Optional[Dict[str, List[str]]]:
+    """Returns ``{key: values}`` when ``matrix`` is exactly every combination of them.
+
+    Both GitHub and GitLab expand such axes themselves, which is far shorter
+    than listing every entry; other matrices return ``None``.
+    """
+    axes: Dict[str, List[str]] = {key: list(dict.fromkeys(entry[key] for entry in matrix)) for key in matrix[0]}
+    combinations = 1
+    for values in axes.values():
+        combinations *= len(values)
+    return axes if combinations == len(matrix) else None
+
+
+def matrix_entries(matrix: Sequence[Mapping[str, str]]) -> List[Dict[str, Any]]:
+    return [dict(entry) for entry in matrix]
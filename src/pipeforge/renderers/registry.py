@@ -4,43 +4,85 @@
 
 from __future__ import annotations
 
-from typing import Dict, Iterable
+from typing import TYPE_CHECKING, Dict, Iterable, Mapping
 
+from pipeforge import plugins
 from pipeforge.errors import RendererNotFoundError
 
-from .base import BaseRenderer
-from .bitbucket import BitbucketRenderer
-from .github import GitHubActionsRenderer
-from .gitlab import GitLabRenderer
+if TYPE_CHECKING:
+    from .base import BaseRenderer
+
+BUILTIN_RENDERERS: Dict[str, str] = {
+    "bitbucket": "pipeforge.renderers.bitbucket:BitbucketRenderer",
+    "gitlab": "pipeforge.renderers.gitlab:GitLabRenderer",
+    "github": "pipeforge.renderers.github:GitHubActionsRenderer",
+}
 
 
 class RendererRegistry:
-    """Simple registry that maps targets to renderer instances."""
+    """Simple registry that maps targets to renderer instances.
+
+    Renderers can also be registered lazily by reference, in which case their
+    module is only imported the first time ``get()`` asks for the slug.
+    """
 
-    def __init__(self, renderers: Iterable[BaseRenderer] | None = None) -> None:
+    def __init__(
+        self,
+        renderers: Iterable[BaseRenderer] | None = None,
+        *,
+        lazy: Mapping[str, plugins.Reference] | None = None,
+    ) -> None:
         self._renderers: Dict[str, BaseRenderer] = {}
+        self._lazy: Dict[str, plugins.Reference] = {}
         if renderers:
             for renderer in renderers:
                 self.register(renderer)
+        if lazy:
+            for slug, reference in lazy.items():
+                self.register_lazy(slug, reference)
 
     def register(self, renderer: BaseRenderer) -> None:
+        self._lazy.pop(renderer.slug, None)
         self._renderers[renderer.slug] = renderer
 
+    def register_lazy(self, slug: str, reference: plugins.Reference) -> None:
+        """Registers a ``"module:Class"`` string or entry point under ``slug``."""
+        self._renderers.pop(slug, None)
+        self._lazy[slug] = reference
+
+    def load_entry_points(self, group: str = plugins.RENDERER_GROUP) -> None:
+        """Registers installed plugins lazily; built-in slugs take precedence."""
+        for entry_point in plugins.entry_points(group):
+            if entry_point.name not in self._renderers and entry_point.name not in self._lazy:
+                self.register_lazy(entry_point.name, entry_point)
+
     def get(self, slug: str) -> BaseRenderer:
         try:
             return self._renderers[slug]
+        except KeyError:
+            pass
+        try:
+            reference = self._lazy[slug]
         except KeyError as exc:
             raise RendererNotFoundError(f"Unknown target renderer '{slug}'.") from exc
+        try:
+            renderer = plugins.instantiate(reference)
+        except Exception as exc:
+            # A broken plugin must not crash callers that only handle PipeForgeError.
+            raise RendererNotFoundError(
+                f"Failed to load target renderer '{slug}' from {plugins.describe(reference)}: {exc}"
+            ) from exc
+        self._lazy.pop(slug, None)
+        self._renderers[slug] = renderer
+        return renderer
 
     def slugs(self) -> list[str]:
-        return sorted(self._renderers.keys())
+        return sorted({*self._renderers, *self._lazy})
 
 
-def default_renderer_registry() -> RendererRegistry:
-    return RendererRegistry(
-        renderers=[
-            BitbucketRenderer(),
-            GitLabRenderer(),
-            GitHubActionsRenderer(),
-        ]
-    )
+def default_renderer_registry(*, include_plugins: bool = True) -> RendererRegistry:
+    """Creates the default registry with built-in renderers and installed plugins."""
+    registry = RendererRegistry(lazy=BUILTIN_RENDERERS)
+    if include_plugins:
+        registry.load_entry_points()
+    return registry
@@ -0,0 +1,178 @@
+# SPDX-FileCopyrightText: 2025-present U.N. Owen <void@some.where>
+#
+# SPDX-License-Identifier: MIT
+
+"""JSON reports of batch conversions, and merging the reports of several shards."""
+
+from __future__ import annotations
+
+import json
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from pipeforge import __about__
+from pipeforge.errors import PipeForgeError
+from pipeforge.sharding import Shard
+
+REPORT_VERSION = 1
+STATUSES = ("converted", "failed", "unchanged")
+
+
+@dataclass
+class InputRecord:
+    """What happened to one input: ``status`` is one of ``STATUSES``."""
+
+    path: str
+    status: str
+    seconds: float = 0.0
+    bytes: int = 0
+    error: Optional[str] = None
+
+
+@dataclass
+class BatchReport:
+    """Every input one batch run (or one shard of it) was responsible for."""
+
+    source: str
+    target: str
+    shard: Optional[str] = None
+    strategy: str = "hash"
+    wall_s: float = 0.0
+    inputs: List[InputRecord] = field(default_factory=list)
+
+    def add(self, path: str, status: str, *, seconds: float = 0.0, size: int = 0, error: Optional[str] = None) -> None:
+        self.inputs.append(InputRecord(path, status, round(seconds, 6), size, error))
+
+    def counts(self) -> Dict[str, int]:
+        counts = dict.fromkeys(STATUSES, 0)
+        for record in self.inputs:
+            counts[record.status] = counts.get(record.status, 0) + 1
+        return counts
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "version": REPORT_VERSION,
+            "pipeforge": __about__.__version__,
+            "source": self.source,
+            "target": self.target,
+            "shard": self.shard,
+            "strategy": self.strategy,
+            "wall_s": round(self.wall_s, 6),
+            "counts": self.counts(),
+            "inputs": [asdict(record) for record in self.inputs],
+        }
+
+    def write(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.to_dict(), indent=1) + "\n", encoding="utf-8")
+
+    @classmethod
+    def load(cls, path: Path) -> BatchReport:
+        try:
+            payload = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as exc:
+            raise PipeForgeError(f"Failed to read report {path}: {exc}") from exc
+        if not isinstance(payload, dict) or payload.get("version") != REPORT_VERSION:
+            raise PipeForgeError(f"{path} is not a version {REPORT_VERSION} PipeForge report.")
+        try:
+            if payload.get("shard") is not None:
+                Shard.parse(payload["shard"])
+            return cls(
+                source=payload["source"],
+                target=payload["target"],
+                shard=payload.get("shard"),
+                strategy=payload.get("strategy", "hash"),
+                wall_s=payload.get("wall_s", 0.0),
+                inputs=[InputRecord(**record) for record in payload.get("inputs", [])],
+            )
+        except (KeyError, TypeError, ValueError) as exc:
+            raise PipeForgeError(f"Malformed report {path}: {exc}") from exc
+
+
+def merge_reports(reports: Iterable[BatchReport], slowest: int = 10) -> Dict[str, Any]:
+    """Combines shard reports into one summary.
+
+    Wall time is the slowest shard's, since shards run side by side; busy time
+    sums the per-input conversion times. Missing shards (by ``INDEX/COUNT``)
+    and inputs reported by more than one shard are listed so a broken
+    partition does not go unnoticed.
+    """
+    reports = list(reports)
+    totals = dict.fromkeys(STATUSES, 0)
+    shards: List[Dict[str, Any]] = []
+    failures: List[Dict[str, Any]] = []
+    timings: List[Dict[str, Any]] = []
+    owners: Dict[str, List[str]] = {}
+    seen_shards = set()
+    counts = set()
+
+    for report in reports:
+        label = report.shard or "all"
+        report_counts = report.counts()
+        for status, value in report_counts.items():
+            totals[status] = totals.get(status, 0) + value
+        busy = sum(record.seconds for record in report.inputs)
+        shards.append(
+            {
+                "shard": label,
+                "inputs": len(report.inputs),
+                **report_counts,
+                "bytes": sum(record.bytes for record in report.inputs),
+                "wall_s": round(report.wall_s, 6),
+                "busy_s": round(busy, 6),
+            }
+        )
+        if report.shard:
+            shard = Shard.parse(report.shard)
+            seen_shards.add(shard.index)
+            counts.add(shard.count)
+        for record in report.inputs:
+            owners.setdefault(record.path, []).append(label)
+            if record.status == "failed":
+                failures.append({"path": record.path, "shard": label, "error": record.error})
+            if record.status == "converted":
+                timings.append({"path": record.path, "shard": label, "seconds": record.seconds})
+
+    missing: List[int] = []
+    if len(counts) == 1:
+        missing = sorted(set(range(1, next(iter(counts)) + 1)) - seen_shards)
+    timings.sort(key=lambda item: item["seconds"], reverse=True)
+    return {
+        "reports": len(reports),
+        "inputs": sum(shard["inputs"] for shard in shards),
+        **totals,
+        "wall_s": round(max((report.wall_s for report in reports), default=0.0), 6),
+        "busy_s": round(sum(shard["busy_s"] for shard in shards), 6),
+        "shards": shards,
+        "missing_shards": missing,
+        "mixed_shard_counts": sorted(counts) if len(counts) > 1 else [],
+        "duplicates": {path: labels for path, labels in sorted(owners.items()) if len(labels) > 1},
+        "failures": failures,
+        "slowest": timings[:slowest],
+    }
+
+
+def format_merged(summary: Dict[str, Any]) -> str:
+    """Renders a merged summary as plain text."""
+    lines = [
+        f"Merged {summary['reports']} report(s): {summary['inputs']} input(s), {summary['converted']} converted, "
+        f"{summary['failed']} failed, {summary['unchanged']} unchanged.",
+        f"Wall {summary['wall_s']:.3f}s (slowest shard), busy {summary['busy_s']:.3f}s.",
+        "",
+        f"{'shard':<8} {'inputs':>7} {'failed':>7} {'MiB':>9} {'wall s':>9} {'busy s':>9}",
+    ]
+    for shard in summary["shards"]:
+        lines.append(
+            f"{shard['shard']:<8} {shard['inputs']:>7} {shard['failed']:>7} {shard['bytes'] / 1048576:>9.2f} "
+            f"{shard['wall_s']:>9.3f} {shard['busy_s']:>9.3f}"
+        )
+    if summary["slowest"]:
+        lines.append("")
+        lines.append("Slowest inputs:")
+        lines.extend(f"  {item['seconds']:>8.3f}s  {item['path']} ({item['shard']})" for item in summary["slowest"])
+    if summary["failures"]:
+        lines.append("")
+        lines.append("Failures:")
+        lines.extend(f"  {item['path']} ({item['shard']}): {item['error']}" for item in summary["failures"])
+    return "\n".join(lines)
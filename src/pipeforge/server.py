@@ -0,0 +1,285 @@
+# SPDX-FileCopyrightText: 2025-present U.N. Owen <void@some.where>
+#
+# SPDX-License-Identifier: MIT
+
+"""Local HTTP server that keeps a warm ``PipelineTranspiler`` in memory.
+
+Endpoints:
+
+- ``POST /convert`` with a JSON body ``{"content": "...", "source": "bamboo",
+  "targets": ["gitlab", ...], "name": "..."}`` (``"target"`` is accepted for a
+  single slug) returns ``{"outputs": {"<target>": "<rendered>"}}``.
+- ``GET /healthz`` returns ``{"status": "ok"}``.
+- ``GET /metrics`` returns request counters and latency percentiles.
+
+Requests run on a bounded thread pool. When every worker is busy and the
+backlog is full, new connections get ``503`` with ``Retry-After`` instead of
+queueing without limit.
+"""
+
+from __future__ import annotations
+
+import json
+import socketserver
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler
+from typing import Any, Deque, Dict, Optional, Tuple
+
+from pipeforge.errors import PipeForgeError
+from pipeforge.transpiler import PipelineTranspiler
+
+DEFAULT_MAX_BODY = 10 * 1024 * 1024
+LATENCY_WINDOW = 2048
+
+
+class ServerMetrics:
+    """Thread-safe request counters with a sliding window of latencies."""
+
+    def __init__(self, window: int = LATENCY_WINDOW) -> None:
+        self._lock = threading.Lock()
+        self._latencies: Deque[float] = deque(maxlen=window)
+        self.started = time.time()
+        self.requests = 0
+        self.conversions = 0
+        self.errors = 0
+        self.rejected = 0
+        self.in_flight = 0
+
+    def begin(self) -> None:
+        with self._lock:
+            self.in_flight += 1
+
+    def end(self, seconds: float, *, conversion: bool, failed: bool) -> None:
+        with self._lock:
+            self.in_flight -= 1
+            self.requests += 1
+            if conversion:
+                self.conversions += 1
+                self._latencies.append(seconds)
+            if failed:
+                self.errors += 1
+
+    def reject(self) -> None:
+        with self._lock:
+            self.rejected += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            latencies = sorted(self._latencies)
+            return {
+                "uptime_s": round(time.time() - self.started, 3),
+                "requests": self.requests,
+                "conversions": self.conversions,
+                "errors": self.errors,
+                "rejected": self.rejected,
+                "in_flight": self.in_flight,
+                "latency_ms": {
+                    f"p{percentile}": _percentile(latencies, percentile) for percentile in (50, 90, 99)
+                },
+            }
+
+
+def _percentile(ordered: Any, percentile: int) -> Optional[float]:
+    """Nearest-rank percentile in milliseconds, or ``None`` without samples."""
+    if not ordered:
+        return None
+    rank = max(0, min(len(ordered) - 1, -(-percentile * len(ordered) // 100) - 1))
+    return round(ordered[rank] * 1000, 3)
+
+
+class ConvertRequestHandler(BaseHTTPRequestHandler):
+    server: "_PooledServerMixin"  # type: ignore[assignment]
+    protocol_version = "HTTP/1.1"
+    # Idle keep-alive connections give their worker back after this many seconds.
+    timeout = 30
+
+    def do_GET(self) -> None:
+        metrics = self.server.metrics
+        metrics.begin()
+        start = time.perf_counter()
+        if self.path == "/healthz":
+            self._send_json(HTTPStatus.OK, {"status": "ok"})
+        elif self.path == "/metrics":
+            self._send_json(HTTPStatus.OK, metrics.snapshot())
+        else:
+            self._send_json(HTTPStatus.NOT_FOUND, {"error": f"Unknown path '{self.path}'."})
+        metrics.end(time.perf_counter() - start, conversion=False, failed=False)
+
+    def do_POST(self) -> None:
+        if self.path != "/convert":
+            # The body is never read, so it must not be parsed as the next request.
+            self.close_connection = True
+            self._send_json(HTTPStatus.NOT_FOUND, {"error": f"Unknown path '{self.path}'."})
+            return
+
+        metrics = self.server.metrics
+        metrics.begin()
+        start = time.perf_counter()
+        status = HTTPStatus.OK
+        try:
+            status, payload = self._convert()
+            self._send_json(status, payload)
+        finally:
+            metrics.end(time.perf_counter() - start, conversion=True, failed=status != HTTPStatus.OK)
+
+    def _convert(self) -> Tuple[HTTPStatus, Dict[str, Any]]:
+        try:
+            length = int(self.headers.get("Content-Length", ""))
+        except ValueError:
+            self.close_connection = True
+            return HTTPStatus.LENGTH_REQUIRED, {"error": "A Content-Length header is required."}
+        if length < 0:
+            # Nothing sensible can be read after a bogus length; drop the connection.
+            self.close_connection = True
+            return HTTPStatus.BAD_REQUEST, {"error": "Content-Length must not be negative."}
+        if length > self.server.max_body:
+            # Leave the oversized body unread and drop the connection instead.
+            self.close_connection = True
+            return HTTPStatus.REQUEST_ENTITY_TOO_LARGE, {"error": f"Body exceeds {self.server.max_body} bytes."}
+
+        try:
+            body = json.loads(self.rfile.read(length))
+        except ValueError as exc:
+            return HTTPStatus.BAD_REQUEST, {"error": f"Invalid JSON body: {exc}"}
+        if not isinstance(body, dict) or not isinstance(body.get("content"), str):
+            return HTTPStatus.BAD_REQUEST, {"error": "Expected a JSON object with a 'content' string."}
+
+        problem = _field_problem(body)
+        if problem:
+            return HTTPStatus.BAD_REQUEST, {"error": problem}
+
+        targets = body.get("targets") or [body.get("target") or "bitbucket"]
+        if isinstance(targets, str):
+            targets = [targets]
+        try:
+            outputs = self.server.transpiler.convert_content(
+                body["content"],
+                source=body.get("source") or "bamboo",
+                targets=targets,
+                name=body.get("name"),
+                origin="<request>",
+            )
+        except PipeForgeError as exc:
+            return HTTPStatus.UNPROCESSABLE_ENTITY, {"error": str(exc)}
+        return HTTPStatus.OK, {"outputs": outputs}
+
+    def _send_json(self, status: HTTPStatus, payload: Dict[str, Any]) -> None:
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        if self.close_connection:
+            self.send_header("Connection", "close")
+        self.end_headers()
+        self.wfile.write(data)
+
+    def address_string(self) -> str:
+        # Unix socket peers have no (host, port) tuple.
+        return self.client_address[0] if isinstance(self.client_address, tuple) else "unix"
+
+    def log_message(self, format: str, *args: Any) -> None:
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+def _field_problem(body: Dict[str, Any]) -> Optional[str]:
+    """Why the optional fields of a ``/convert`` body are unusable, if they are."""
+    targets = body.get("targets")
+    if targets is not None and not isinstance(targets, str):
+        if not isinstance(targets, list) or not all(isinstance(target, str) for target in targets):
+            return "'targets' must be a string or a list of strings."
+    for key in ("target", "source", "name"):
+        if body.get(key) is not None and not isinstance(body[key], str):
+            return f"'{key}' must be a string or null."
+    return None
+
+
+_REJECTION = json.dumps({"error": "Server busy, retry later."}).encode("utf-8")
+
+
+class _PooledServerMixin:
+    """Dispatches connections to a bounded pool and rejects overflow with 503."""
+
+    transpiler: PipelineTranspiler
+    metrics: ServerMetrics
+    max_body: int
+    verbose: bool
+
+    def _setup_pool(self, workers: int, backlog: int) -> None:
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="pipeforge-serve")
+        self._slots = threading.BoundedSemaphore(workers + backlog)
+
+    def process_request(self, request: Any, client_address: Any) -> None:
+        if not self._slots.acquire(blocking=False):
+            self.metrics.reject()
+            self._reject(request)
+            return
+        self._pool.submit(self._process, request, client_address)
+
+    def _process(self, request: Any, client_address: Any) -> None:
+        try:
+            self.finish_request(request, client_address)  # type: ignore[attr-defined]
+        except Exception:
+            self.handle_error(request, client_address)  # type: ignore[attr-defined]
+        finally:
+            self.shutdown_request(request)  # type: ignore[attr-defined]
+            self._slots.release()
+
+    def _reject(self, request: Any) -> None:
+        try:
+            request.sendall(
+                b"HTTP/1.1 503 Service Unavailable\r\n"
+                b"Content-Type: application/json\r\n"
+                b"Retry-After: 1\r\n"
+                b"Connection: close\r\n"
+                + f"Content-Length: {len(_REJECTION)}\r\n\r\n".encode("ascii")
+                + _REJECTION
+            )
+        except OSError:
+            pass
+        finally:
+            self.shutdown_request(request)  # type: ignore[attr-defined]
+
+    def server_close(self) -> None:
+        super().server_close()  # type: ignore[misc]
+        self._pool.shutdown(wait=True)
+
+
+class ConversionServer(_PooledServerMixin, socketserver.TCPServer):
+    allow_reuse_address = True
+
+
+if hasattr(socketserver, "UnixStreamServer"):
+
+    class UnixConversionServer(_PooledServerMixin, socketserver.UnixStreamServer):
+        pass
+
+
+def create_server(
+    transpiler: PipelineTranspiler,
+    *,
+    host: str = "127.0.0.1",
+    port: int = 8765,
+    socket_path: Optional[str] = None,
+    workers: int = 4,
+    backlog: int = 16,
+    max_body: int = DEFAULT_MAX_BODY,
+    verbose: bool = False,
+) -> socketserver.BaseServer:
+    """Builds a bound server; call ``serve_forever()`` to start handling requests."""
+    if socket_path:
+        if not hasattr(socketserver, "UnixStreamServer"):
+            raise PipeForgeError("Unix sockets are not supported on this platform.")
+        server: Any = UnixConversionServer(socket_path, ConvertRequestHandler)
+    else:
+        server = ConversionServer((host, port), ConvertRequestHandler)
+    server.transpiler = transpiler
+    server.metrics = ServerMetrics()
+    server.max_body = max_body
+    server.verbose = verbose
+    server._setup_pool(workers, backlog)
+    return server
@@ -0,0 +1,105 @@
+# SPDX-FileCopyrightText: 2025-present U.N. Owen <void@some.where>
+#
+# SPDX-License-Identifier: MIT
+
+"""Deterministic partitioning of batch inputs across CI nodes.
+
+Every input is keyed by a stable string (its path relative to the input
+root) and placed with rendezvous hashing: each shard scores the key and the
+highest score wins. Each node computes the same assignment independently,
+and adding or removing inputs never moves the others.
+
+With ``by="size"`` inputs are weighted by their size in bytes and placed with
+bounded loads: an input goes to its best-scoring shard unless that shard
+already holds more than its fair share (plus ``slack``), in which case it
+falls through to the next shard in its ranking. Shards stay balanced and
+only inputs near a full shard move when the input set changes.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import re
+from dataclasses import dataclass
+from typing import List, Sequence, Tuple
+
+STRATEGIES = ("hash", "size")
+DEFAULT_SLACK = 0.1
+
+_MASK = (1 << 64) - 1
+
+
+@dataclass(frozen=True)
+class Shard:
+    """One of ``count`` shards; ``index`` is 1-based, as in ``--shard 2/8``."""
+
+    index: int
+    count: int
+
+    def __post_init__(self) -> None:
+        if self.count < 1 or not 1 <= self.index <= self.count:
+            raise ValueError(f"Shard index must be between 1 and the shard count, got {self}.")
+
+    @classmethod
+    def parse(cls, text: str) -> Shard:
+        match = re.fullmatch(r"\s*(\d+)\s*/\s*(\d+)\s*", text)
+        if not match:
+            raise ValueError(f"Expected INDEX/COUNT (for example 2/8), got '{text}'.")
+        return cls(int(match.group(1)), int(match.group(2)))
+
+    def __str__(self) -> str:
+        return f"{self.index}/{self.count}"
+
+
+def _key_hash(key: str) -> int:
+    return int.from_bytes(hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+def _score(key_hash: int, shard: int) -> int:
+    # splitmix64 finaliser over the key hash and shard number: cheap, and
+    # identical on every platform and Python version, unlike ``hash()``.
+    value = (key_hash ^ ((shard + 1) * 0x9E3779B97F4A7C15)) & _MASK
+    value = ((value ^ (value >> 30)) * 0xBF58476D1CE4E5B9) & _MASK
+    value = ((value ^ (value >> 27)) * 0x94D049BB133111EB) & _MASK
+    return value ^ (value >> 31)
+
+
+def shard_of(key: str, count: int) -> int:
+    """Returns the 0-based shard that ``key`` belongs to by rendezvous hashing."""
+    key_hash = _key_hash(key)
+    return max(range(count), key=lambda shard: _score(key_hash, shard))
+
+
+def assign(
+    items: Sequence[Tuple[str, int]],
+    count: int,
+    *,
+    by: str = "hash",
+    slack: float = DEFAULT_SLACK,
+) -> List[int]:
+    """Returns the 0-based shard of every ``(key, size)`` item, in input order."""
+    if by not in STRATEGIES:
+        raise ValueError(f"Unknown sharding strategy '{by}'. Use one of: {', '.join(STRATEGIES)}.")
+    if by == "hash" or count == 1:
+        return [shard_of(key, count) for key, _ in items]
+
+    hashes = [_key_hash(key) for key, _ in items]
+    weights = [max(1, size) for _, size in items]
+    capacity = (1 + slack) * sum(weights) / count
+    loads = [0] * count
+    shards = [0] * len(items)
+    # Heaviest first (ties broken by hash, never by input order) so large
+    # inputs claim their preferred shard and small ones fill the gaps.
+    for position in sorted(range(len(items)), key=lambda item: (-weights[item], hashes[item])):
+        ranking = sorted(range(count), key=lambda shard: _score(hashes[position], shard), reverse=True)
+        chosen = next((shard for shard in ranking if loads[shard] + weights[position] <= capacity), None)
+        if chosen is None:
+            chosen = min(ranking, key=lambda shard: loads[shard])
+        loads[chosen] += weights[position]
+        shards[position] = chosen
+    return shards
+
+
+def select(items: Sequence[Tuple[str, int]], shard: Shard, *, by: str = "hash") -> List[int]:
+    """Positions of the items that belong to ``shard``."""
+    return [position for position, owner in enumerate(assign(items, shard.count, by=by)) if owner == shard.index - 1]
@@ -4,27 +4,115 @@
 
 from __future__ import annotations
 
-import io
+import os
+import re
+import time
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Optional
+from typing import (
+    IO,
+    TYPE_CHECKING,
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Set,
+    Tuple,
+    TypeVar,
+    Union,
+)
 
-import yaml
-
-from pipeforge.errors import PipeForgeError
+from pipeforge import yamlio
+from pipeforge.cache import ConversionCache
+from pipeforge.changes import apply_path_map, describe_path_map
+from pipeforge.errors import DocumentError, PipeForgeError
+from pipeforge.models import PathFilter, Pipeline
+from pipeforge.optimize import FoldStats, fold_matrix
 from pipeforge.parsers import ParserRegistry, default_parser_registry
+from pipeforge.profiling import NO_PHASE, PhaseRecord, Profiler
 from pipeforge.renderers import RendererRegistry, default_renderer_registry
+from pipeforge.renderers.base import BaseRenderer
+
+if TYPE_CHECKING:
+    from concurrent.futures import Executor, Future
+
+    from pipeforge.parsers.base import BaseParser
+
+_T = TypeVar("_T")
+
+
+@dataclass
+class ConversionResult:
+    """Outcome of converting a single input as part of a batch.
+
+    ``seconds`` is the wall time the worker spent on the input and ``folds``
+    what matrix folding did to it, when enabled.
+    """
+
+    input_path: Path
+    rendered: Optional[str] = None
+    error: Optional[PipeForgeError] = None
+    phases: List[PhaseRecord] = field(default_factory=list)
+    seconds: float = 0.0
+    folds: FoldStats = field(default_factory=FoldStats)
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+@dataclass
+class DocumentResult:
+    """Outcome of converting one document from a multi-document stream."""
+
+    index: int
+    name: str
+    outputs: Dict[str, str] = field(default_factory=dict)
+    error: Optional[DocumentError] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
 
 
 class PipelineTranspiler:
-    """Orchestrates parsing and rendering between CI vendors."""
+    """Orchestrates parsing and rendering between CI vendors.
+
+    With ``fold_matrix`` every parsed pipeline goes through
+    ``optimize.fold_matrix()`` before rendering, and ``folds`` totals what it
+    folded (cache hits are not parsed, so they add nothing). With ``validate``
+    every output, cached or not, is checked against its target's bundled
+    schema and a mismatch raises ``OutputValidationError``; targets without a
+    schema are passed through. ``paths`` maps job names to the path filters
+    set on them after parsing (see ``changes.load_path_map()``).
+    """
 
     def __init__(
         self,
         parser_registry: Optional[ParserRegistry] = None,
         renderer_registry: Optional[RendererRegistry] = None,
+        cache: Optional[ConversionCache] = None,
+        profiler: Optional[Profiler] = None,
+        *,
+        fold_matrix: bool = False,
+        validate: bool = False,
+        paths: Optional[Mapping[str, PathFilter]] = None,
     ) -> None:
         self.parsers = parser_registry or default_parser_registry()
         self.renderers = renderer_registry or default_renderer_registry()
+        self.cache = cache
+        self.profiler = profiler
+        self.fold_matrix = fold_matrix
+        self.validate = validate
+        self.paths = dict(paths or {})
+        self.folds = FoldStats()
 
     def convert_path(
         self,
@@ -34,9 +122,371 @@ class PipelineTranspiler:
         target: str = "bitbucket",
         name: Optional[str] = None,
     ) -> str:
-        raw = self._load(input_path)
-        pipeline = self.parsers.get(source).parse(raw, name_override=name)
-        return self.renderers.get(target).render(pipeline)
+        return self.convert_targets(input_path, source=source, targets=[target], name=name)[target]
+
+    def convert_targets(
+        self,
+        input_path: Path,
+        *,
+        source: str = "bamboo",
+        targets: Iterable[str] = ("bitbucket",),
+        name: Optional[str] = None,
+    ) -> Dict[str, str]:
+        """Renders one input for several targets, keyed by target slug.
+
+        The input is read and parsed into the IR at most once, and every
+        renderer consumes that same ``Pipeline``. ``"all"`` expands to every
+        registered target.
+        """
+        renderers = {slug: self.renderers.get(slug) for slug in self.resolve_targets(targets)}
+        parser = self.parsers.get(source)
+
+        if self.cache is None and self.profiler is None:
+            pipeline = self._optimize(parser.parse(self._load(input_path), name_override=name))
+            return {
+                slug: self._checked(slug, renderer.render(pipeline), input_path) for slug, renderer in renderers.items()
+            }
+
+        # Cached conversions hash the raw bytes, so read them once and reuse
+        # them for loading on a miss. Profiled runs read up front as well so
+        # reading and loading are timed separately.
+        return self.convert_content(
+            self._read(input_path), source=source, targets=renderers, name=name, origin=input_path
+        )
+
+    def convert_files(
+        self,
+        input_path: Path,
+        *,
+        source: str = "bamboo",
+        targets: Iterable[str] = ("bitbucket",),
+        name: Optional[str] = None,
+    ) -> Dict[str, Dict[str, str]]:
+        """Renders one input as each target's set of files (``BaseRenderer.render_files()``).
+
+        Returns ``{target: {relative path: text}}``. Most targets produce a
+        single file at their ``output_hint``; a split ``GitLabRenderer``
+        produces a parent pipeline and its children. The cache is not used.
+        """
+        renderers = {slug: self.renderers.get(slug) for slug in self.resolve_targets(targets)}
+        pipeline = self._parse(self.parsers.get(source), self._load(input_path), name)
+        outputs: Dict[str, Dict[str, str]] = {}
+        for slug, renderer in renderers.items():
+            with self._phase("render", slug):
+                files = renderer.render_files(pipeline)
+            outputs[slug] = {path: self._checked(slug, text, f"{input_path} ({path})") for path, text in files.items()}
+        return outputs
+
+    def parse_path(self, input_path: Path, *, source: str = "bamboo", name: Optional[str] = None) -> Pipeline:
+        """Reads and parses one input into the IR without rendering it."""
+        return self._parse(self.parsers.get(source), self._load(input_path), name)
+
+    def convert_to(
+        self,
+        input_path: Path,
+        stream: IO[str],
+        *,
+        source: str = "bamboo",
+        target: str = "bitbucket",
+        name: Optional[str] = None,
+    ) -> None:
+        """Renders one input for ``target`` straight into a text stream.
+
+        Without a cache, profiler or validation the YAML is written as the
+        renderer visits jobs, so the whole output never sits in memory;
+        otherwise this writes what ``convert_path`` returns.
+        """
+        if self.cache is not None or self.profiler is not None or self.validate:
+            stream.write(self.convert_path(input_path, source=source, target=target, name=name))
+            return
+        renderer = self.renderers.get(target)
+        pipeline = self._optimize(self.parsers.get(source).parse(self._load(input_path), name_override=name))
+        renderer.render_to(pipeline, stream)
+
+    def convert_content(
+        self,
+        content: Union[str, bytes],
+        *,
+        source: str = "bamboo",
+        targets: Iterable[str] = ("bitbucket",),
+        name: Optional[str] = None,
+        origin: Union[Path, str] = "<content>",
+    ) -> Dict[str, str]:
+        """Like ``convert_targets`` but for spec text that is already in memory.
+
+        ``origin`` only labels error messages.
+        """
+        data = content.encode("utf-8") if isinstance(content, str) else content
+        renderers = {slug: self.renderers.get(slug) for slug in self.resolve_targets(targets)}
+        parser = self.parsers.get(source)
+
+        if self.cache is None:
+            pipeline = self._parse(parser, self._load_content(data, origin), name)
+            return {
+                slug: self._checked(slug, self._render(slug, renderer, pipeline), origin)
+                for slug, renderer in renderers.items()
+            }
+
+        options = "fold-matrix" if self.fold_matrix else ""
+        if self.paths:
+            options += f";paths={describe_path_map(self.paths)}"
+        keys = {
+            slug: self.cache.key(data, source=source, target=slug, name=name, options=options) for slug in renderers
+        }
+        outputs: Dict[str, str] = {}
+        pipeline: Optional[Pipeline] = None
+        for slug, renderer in renderers.items():
+            rendered = self.cache.get(keys[slug])
+            if rendered is None:
+                if pipeline is None:
+                    pipeline = self._parse(parser, self._load_content(data, origin), name)
+                rendered = self._render(slug, renderer, pipeline)
+                self.cache.put(keys[slug], rendered)
+            outputs[slug] = self._checked(slug, rendered, origin)
+        return outputs
+
+    def resolve_targets(self, targets: Iterable[str]) -> List[str]:
+        """Expands ``"all"`` and drops duplicates while keeping the given order."""
+        resolved: List[str] = []
+        for slug in targets:
+            for expanded in self.available_targets() if slug == "all" else [slug]:
+                if expanded not in resolved:
+                    resolved.append(expanded)
+        return resolved
+
+    def convert_many(
+        self,
+        input_paths: Iterable[Path],
+        *,
+        source: str = "bamboo",
+        target: str = "bitbucket",
+        name: Optional[str] = None,
+        ordered: bool = True,
+        executor: Union[str, Executor] = "thread",
+        max_workers: Optional[int] = None,
+    ) -> Iterator[ConversionResult]:
+        """Converts many inputs concurrently, yielding one result per input.
+
+        Results come back in input order when ``ordered`` is true, otherwise as
+        soon as each conversion finishes. ``executor`` is ``"thread"``,
+        ``"process"`` or an existing executor, which is left running. A
+        ``PipeForgeError`` for one input is reported on its result instead of
+        aborting the batch. With a profiler attached, phases recorded by the
+        workers (threads or processes) are merged into it as results arrive.
+        """
+        from concurrent.futures import as_completed
+
+        # Fail fast on unknown slugs rather than once per input.
+        self.parsers.get(source)
+        self.renderers.get(target)
+
+        worker, profile = self._batch_worker()
+        pool = self._make_executor(executor, max_workers)
+        futures: List[Future] = []
+        try:
+            for path in input_paths:
+                futures.append(pool.submit(_convert_one, worker, Path(path), source, target, name, profile))
+            pending = futures if ordered else as_completed(futures)
+            for future in pending:
+                yield self._collect(future.result())
+        finally:
+            for future in futures:
+                future.cancel()
+            if pool is not executor:
+                pool.shutdown(wait=True)
+
+    async def aconvert_path(
+        self,
+        input_path: Path,
+        *,
+        source: str = "bamboo",
+        target: str = "bitbucket",
+        name: Optional[str] = None,
+        executor: Optional[Executor] = None,
+    ) -> str:
+        """Coroutine version of ``convert_path``.
+
+        Reading, parsing, and rendering all run on ``executor`` (the event
+        loop's default thread pool when omitted), so the loop is never blocked.
+        """
+        import asyncio
+
+        worker, profile = self._batch_worker()
+        loop = asyncio.get_running_loop()
+        result = self._collect(
+            await loop.run_in_executor(executor, _convert_one, worker, Path(input_path), source, target, name, profile)
+        )
+        if result.error is not None:
+            raise result.error
+        return result.rendered or ""
+
+    async def aconvert_many(
+        self,
+        input_paths: Union[Iterable[Path], AsyncIterable[Path]],
+        *,
+        source: str = "bamboo",
+        target: str = "bitbucket",
+        name: Optional[str] = None,
+        ordered: bool = False,
+        executor: Union[str, Executor, None] = None,
+        max_workers: Optional[int] = None,
+        limit: Optional[int] = None,
+    ) -> AsyncIterator[ConversionResult]:
+        """Async iterator over the results of converting many inputs, like ``convert_many``.
+
+        At most ``limit`` conversions are in flight (by default ``max_workers``
+        or the CPU count); more inputs are only taken from ``input_paths``,
+        which may be an async iterable, as results are handed out. Each runs
+        on ``executor``: the loop's default thread pool when omitted,
+        ``"thread"`` or ``"process"`` for a pool of ``max_workers`` that
+        lives as long as the iteration, or an existing executor. Closing the
+        iterator early, or cancelling the task consuming it, cancels every
+        conversion that has not started yet.
+        """
+        import asyncio
+
+        self.parsers.get(source)
+        self.renderers.get(target)
+        worker, profile = self._batch_worker()
+        loop = asyncio.get_running_loop()
+        pool = None if executor is None else self._make_executor(executor, max_workers)
+        limit = max(1, limit or max_workers or os.cpu_count() or 1)
+        in_flight: List[asyncio.Future] = []
+        try:
+            async for path in _aiterate(input_paths):
+                in_flight.append(
+                    loop.run_in_executor(pool, _convert_one, worker, Path(path), source, target, name, profile)
+                )
+                while len(in_flight) >= limit:
+                    for result in await _next_done(in_flight, ordered):
+                        yield self._collect(result)
+            while in_flight:
+                for result in await _next_done(in_flight, ordered):
+                    yield self._collect(result)
+        finally:
+            for future in in_flight:
+                future.cancel()
+            if pool is not None and pool is not executor:
+                # Waiting here would block the loop; running conversions finish on their own.
+                pool.shutdown(wait=False)
+
+    def convert_archive(
+        self,
+        archive_path: Path,
+        *,
+        source: str = "bamboo",
+        target: str = "bitbucket",
+        name: Optional[str] = None,
+        patterns: Iterable[str] = ("*.yml", "*.yaml"),
+        executor: Union[str, Executor, None] = None,
+        max_workers: Optional[int] = None,
+    ) -> Iterator[ConversionResult]:
+        """Converts the matching members of a zip or tar archive without extracting it.
+
+        Results come back in archive order, with ``input_path`` set to the
+        member name. Without an ``executor`` each member is streamed straight
+        into the YAML loader. With one, members are read in turn and at
+        most two per worker are in flight, so memory stays bounded however
+        large the archive is. Members whose names would escape the output
+        root are reported as failures.
+        """
+        from collections import deque
+
+        from pipeforge.archives import iter_members, safe_member_name
+
+        self.parsers.get(source)
+        self.renderers.get(target)
+        members = iter_members(archive_path, patterns)
+
+        if executor is None:
+            for member, handle in members:
+                origin = f"{archive_path}:{member}"
+                if safe_member_name(member) is None:
+                    yield _unsafe_member(member, origin)
+                    continue
+                result = _convert_member(self, member, handle, origin, source, target, name)
+                self.folds.add(result.folds)
+                yield result
+            return
+
+        worker, profile = self._batch_worker()
+        pool = self._make_executor(executor, max_workers)
+        window = 2 * (max_workers or os.cpu_count() or 1)
+        in_flight: Deque[Future] = deque()
+        try:
+            for member, handle in members:
+                origin = f"{archive_path}:{member}"
+                if safe_member_name(member) is None:
+                    in_flight.append(_done(_unsafe_member(member, origin)))
+                else:
+                    content = handle.read()
+                    in_flight.append(
+                        pool.submit(_convert_member, worker, member, content, origin, source, target, name, profile)
+                    )
+                while len(in_flight) >= window or (in_flight and in_flight[0].done()):
+                    yield self._collect(in_flight.popleft().result())
+            while in_flight:
+                yield self._collect(in_flight.popleft().result())
+        finally:
+            for future in in_flight:
+                future.cancel()
+            if pool is not executor:
+                pool.shutdown(wait=True)
+
+    def _batch_worker(self) -> Tuple[PipelineTranspiler, bool]:
+        """The transpiler to hand to batch workers, and whether they should profile."""
+        if self.profiler is None:
+            return self, False
+        # Profilers hold a lock and cannot be pickled; workers record into
+        # their own and hand the records back on the result.
+        worker = PipelineTranspiler(
+            self.parsers,
+            self.renderers,
+            self.cache,
+            fold_matrix=self.fold_matrix,
+            validate=self.validate,
+            paths=self.paths,
+        )
+        return worker, True
+
+    def _collect(self, result: ConversionResult) -> ConversionResult:
+        if self.profiler is not None:
+            self.profiler.extend(result.phases)
+        self.folds.add(result.folds)
+        return result
+
+    def convert_documents(
+        self,
+        input_path: Path,
+        *,
+        source: str = "bamboo",
+        targets: Iterable[str] = ("bitbucket",),
+        name: Optional[str] = None,
+    ) -> Iterator[DocumentResult]:
+        """Streams a multi-document YAML bundle, converting one document at a time.
+
+        Documents are loaded lazily from the open file, so only the plan being
+        converted is held in memory. Results are named after the plan name
+        (or ``document-<n>``). A document that fails to parse or render is
+        reported on its result; malformed YAML ends the stream with a
+        ``DocumentError`` since later documents cannot be located reliably.
+        """
+        renderers = {slug: self.renderers.get(slug) for slug in self.resolve_targets(targets)}
+        parser = self.parsers.get(source)
+        used_names: Set[str] = set()
+
+        for index, raw in self._load_documents(input_path):
+            try:
+                pipeline = self._parse(parser, raw, name)
+                outputs = {
+                    slug: self._checked(slug, self._render(slug, renderer, pipeline), input_path)
+                    for slug, renderer in renderers.items()
+                }
+            except PipeForgeError as exc:
+                yield DocumentResult(index=index, name=f"document-{index}", error=DocumentError(index, str(exc)))
+                continue
+            stem = _document_stem(name or _declared_name(raw), index, used_names)
+            yield DocumentResult(index=index, name=stem, outputs=outputs)
 
     def available_sources(self) -> list[str]:
         return self.parsers.slugs()
@@ -44,14 +494,254 @@ class PipelineTranspiler:
     def available_targets(self) -> list[str]:
         return self.renderers.slugs()
 
+    def _make_executor(self, executor: Union[str, Executor], max_workers: Optional[int]) -> Executor:
+        # concurrent.futures drags in multiprocessing; only pay for it in batch mode.
+        from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+
+        if isinstance(executor, Executor):
+            return executor
+        if executor == "thread":
+            return ThreadPoolExecutor(max_workers=max_workers)
+        if executor == "process":
+            return ProcessPoolExecutor(max_workers=max_workers)
+        raise ValueError(f"Unknown executor kind '{executor}', expected 'thread' or 'process'.")
+
     def _load(self, path: Path) -> Any:
+        # Hand the binary handle straight to the loader so the document is
+        # streamed from disk instead of being copied into an interim buffer.
         try:
-            with path.open("r", encoding="utf-8") as handle:
-                content = handle.read()
+            handle = path.open("rb")
         except OSError as exc:
             raise PipeForgeError(f"Failed to read {path}: {exc}") from exc
 
+        with handle:
+            return self._load_stream(handle, path)
+
+    def _load_stream(self, handle: IO[bytes], origin: Union[Path, str]) -> Any:
+        try:
+            return yamlio.load(handle) or {}
+        except OSError as exc:
+            raise PipeForgeError(f"Failed to read {origin}: {exc}") from exc
+        except yamlio.YAMLError as exc:
+            raise PipeForgeError(f"Unable to parse YAML from {origin}: {exc}") from exc
+
+    def _load_documents(self, path: Path) -> Iterator[Tuple[int, Any]]:
+        """Yields ``(1-based index, document)`` pairs, skipping empty documents."""
         try:
-            return yaml.safe_load(io.StringIO(content)) or {}
-        except yaml.YAMLError as exc:
-            raise PipeForgeError(f"Unable to parse YAML from {path}: {exc}") from exc
+            handle = path.open("rb")
+        except OSError as exc:
+            raise PipeForgeError(f"Failed to read {path}: {exc}") from exc
+
+        with handle:
+            documents = yamlio.load_all(handle)
+            index = 0
+            while True:
+                index += 1
+                try:
+                    with self._phase("load", f"document {index}"):
+                        raw = next(documents)
+                except StopIteration:
+                    return
+                except OSError as exc:
+                    raise DocumentError(index, f"Failed to read {path}: {exc}") from exc
+                except yamlio.YAMLError as exc:
+                    raise DocumentError(index, f"Unable to parse YAML from {path}: {exc}") from exc
+                if raw is not None:
+                    yield index, raw
+
+    def _read(self, path: Path) -> bytes:
+        with self._phase("read", str(path)) as counts:
+            try:
+                content = path.read_bytes()
+            except OSError as exc:
+                raise PipeForgeError(f"Failed to read {path}: {exc}") from exc
+            counts["bytes"] = len(content)
+        return content
+
+    def _load_content(self, content: bytes, origin: Union[Path, str]) -> Any:
+        with self._phase("load", str(origin)):
+            try:
+                return yamlio.load(content) or {}
+            except yamlio.YAMLError as exc:
+                raise PipeForgeError(f"Unable to parse YAML from {origin}: {exc}") from exc
+
+    def _parse(self, parser: BaseParser, raw: Any, name: Optional[str]) -> Pipeline:
+        with self._phase("parse") as counts:
+            pipeline = parser.parse(raw, name_override=name)
+            if self.profiler is not None:
+                counts.update(_pipeline_counts(pipeline))
+        if self.fold_matrix or self.paths:
+            with self._phase("optimize"):
+                self._optimize(pipeline)
+        return pipeline
+
+    def _optimize(self, pipeline: Pipeline) -> Pipeline:
+        # Filters first, so only jobs with the same filter fold together.
+        if self.paths:
+            apply_path_map(pipeline, self.paths)
+        if self.fold_matrix:
+            self.folds.add(fold_matrix(pipeline))
+        return pipeline
+
+    def _render(self, slug: str, renderer: BaseRenderer, pipeline: Pipeline) -> str:
+        # Split building the document from dumping it when the renderer uses
+        # the default ``render()``; custom renderers are timed as one phase.
+        if self.profiler is None:
+            return renderer.render(pipeline)
+        if type(renderer).render is not BaseRenderer.render:
+            with self._phase("render", slug):
+                return renderer.render(pipeline)
+        with self._phase("render", slug):
+            document = renderer.build_document(pipeline)
+        with self._phase("dump", slug) as counts:
+            rendered = yamlio.dump(document) or ""
+            counts["chars"] = len(rendered)
+        return rendered
+
+    def _checked(self, slug: str, rendered: str, origin: Union[Path, str]) -> str:
+        if self.validate:
+            # Deferred so conversions without --validate never load the schemas.
+            from pipeforge.validation import check_output, has_schema
+
+            if has_schema(slug):
+                with self._phase("validate", slug):
+                    check_output(slug, rendered, str(origin))
+        return rendered
+
+    def _phase(self, name: str, label: Optional[str] = None) -> Any:
+        return NO_PHASE if self.profiler is None else self.profiler.phase(name, label)
+
+
+def _pipeline_counts(pipeline: Pipeline) -> Dict[str, int]:
+    steps = [step for job in pipeline.jobs for step in job.steps]
+    return {
+        "jobs": len(pipeline.jobs),
+        "steps": len(steps),
+        "commands": sum(len(step.commands) for step in steps),
+    }
+
+
+def _declared_name(raw: Any) -> str:
+    """The name a document gives itself (``plan.name`` or ``name``), ignoring parser defaults."""
+    if not isinstance(raw, dict):
+        return ""
+    plan = raw.get("plan")
+    declared = plan.get("name") if isinstance(plan, dict) else None
+    return str(declared or raw.get("name") or "")
+
+
+def _document_stem(name: str, index: int, used: Set[str]) -> str:
+    """Builds a unique, filesystem-safe stem for a document in a bundle."""
+    stem = re.sub(r"[^a-z0-9._-]+", "-", name.strip().lower()).strip("-.")
+    if not stem:
+        stem = f"document-{index}"
+    elif stem in used:
+        stem = f"{stem}-{index}"
+    used.add(stem)
+    return stem
+
+
+def _convert_one(
+    transpiler: PipelineTranspiler,
+    path: Path,
+    source: str,
+    target: str,
+    name: Optional[str],
+    profile: bool = False,
+) -> ConversionResult:
+    """Module-level worker so process pools can pickle it."""
+    return _run_worker(
+        transpiler, path, profile, lambda worker: worker.convert_path(path, source=source, target=target, name=name)
+    )
+
+
+def _convert_member(
+    transpiler: PipelineTranspiler,
+    member: str,
+    content: Union[bytes, IO[bytes]],
+    origin: str,
+    source: str,
+    target: str,
+    name: Optional[str],
+    profile: bool = False,
+) -> ConversionResult:
+    """Worker for one archive member, given its bytes or an open handle to stream from."""
+
+    def convert(worker: PipelineTranspiler) -> str:
+        if isinstance(content, bytes) or worker.cache is not None or worker.profiler is not None:
+            data = content if isinstance(content, bytes) else content.read()
+            return worker.convert_content(data, source=source, targets=[target], name=name, origin=origin)[target]
+        pipeline = worker._parse(worker.parsers.get(source), worker._load_stream(content, origin), name)
+        return worker._checked(target, worker.renderers.get(target).render(pipeline), origin)
+
+    return _run_worker(transpiler, Path(member), profile, convert)
+
+
+def _run_worker(
+    transpiler: PipelineTranspiler,
+    path: Path,
+    profile: bool,
+    convert: Callable[[PipelineTranspiler], str],
+) -> ConversionResult:
+    profiler = Profiler() if profile else None
+    worker = transpiler
+    if profiler is not None or transpiler.fold_matrix:
+        # A fresh transpiler per input keeps its phases and fold counts apart.
+        worker = PipelineTranspiler(
+            transpiler.parsers,
+            transpiler.renderers,
+            transpiler.cache,
+            profiler,
+            fold_matrix=transpiler.fold_matrix,
+            validate=transpiler.validate,
+            paths=transpiler.paths,
+        )
+    start = time.perf_counter()
+    try:
+        result = ConversionResult(input_path=path, rendered=convert(worker))
+    except PipeForgeError as exc:
+        result = ConversionResult(input_path=path, error=exc)
+    result.seconds = time.perf_counter() - start
+    if profiler is not None:
+        result.phases = profiler.records
+    if worker is not transpiler:
+        result.folds = worker.folds
+    return result
+
+
+async def _aiterate(items: Union[Iterable[_T], AsyncIterable[_T]]) -> AsyncIterator[_T]:
+    if isinstance(items, AsyncIterable):
+        async for item in items:
+            yield item
+    else:
+        for item in items:
+            yield item
+
+
+async def _next_done(in_flight: List[Any], ordered: bool) -> List[ConversionResult]:
+    """Waits for the oldest future (``ordered``) or any future, removing what finished."""
+    import asyncio
+
+    if ordered:
+        # Pop only once finished so a cancelled wait still cancels it.
+        result = await in_flight[0]
+        in_flight.pop(0)
+        return [result]
+    await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+    done = [future for future in in_flight if future.done()]
+    in_flight[:] = [future for future in in_flight if not future.done()]
+    return [future.result() for future in done]
+
+
+def _unsafe_member(member: str, origin: str) -> ConversionResult:
+    return ConversionResult(
+        input_path=Path(member), error=PipeForgeError(f"Refusing {origin}: the member path leaves the archive root.")
+    )
+
+
+def _done(result: ConversionResult) -> Future:
+    from concurrent.futures import Future
+
+    future: Future = Future()
+    future.set_result(result)
+    return future
@@ -0,0 +1,434 @@
+# SPDX-FileCopyrightText: 2025-present U.N. Owen <void@some.where>
+#
+# SPDX-License-Identifier: MIT
+
+"""Offline validation of rendered pipelines against bundled target schemas.
+
+Each target has a versioned schema in ``pipeforge/schemas`` written in a
+small subset of JSON Schema (``type``, ``properties``, ``required``,
+``patternProperties``, ``additionalProperties``, ``items``, ``anyOf``,
+``enum``, ``$ref`` to ``#/definitions``, and the numeric, length and size
+bounds). A schema is compiled once into Python source with one function per
+schema node, so validating a document is a walk of plain ``isinstance``
+checks. Compiled code is kept per process and marshalled to
+``<cache dir>/validators``, keyed by the schema's content, so new processes
+(such as batch workers) skip compilation too.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import importlib.util
+import json
+import marshal
+import os
+import re
+import tempfile
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+from pipeforge import yamlio
+from pipeforge.cache import default_cache_dir
+from pipeforge.errors import OutputValidationError, PipeForgeError
+
+SCHEMA_DIR = Path(__file__).parent / "schemas"
+SCHEMAS = {
+    "bitbucket": "bitbucket.v1.json",
+    "gitlab": "gitlab.v1.json",
+    "github": "github.v1.json",
+}
+# Bump when the generated code changes, so stale compiled validators are ignored.
+COMPILER_VERSION = 1
+
+_Path = Tuple[Union[str, int], ...]
+_Errors = List[Tuple[_Path, str]]
+
+_ANNOTATIONS = {"$comment", "title", "description", "version", "definitions", "default", "examples"}
+_TYPE_CHECKS = {
+    "object": "isinstance(value, dict)",
+    "array": "isinstance(value, list)",
+    "string": "isinstance(value, str)",
+    "integer": "(isinstance(value, int) and not isinstance(value, bool))",
+    "number": "(isinstance(value, (int, float)) and not isinstance(value, bool))",
+    "boolean": "isinstance(value, bool)",
+    "null": "value is None",
+}
+
+
+@dataclass(frozen=True)
+class ValidationIssue:
+    """One schema violation; ``job`` names the job it belongs to, when there is one."""
+
+    path: str
+    message: str
+    job: Optional[str] = None
+
+    def __str__(self) -> str:
+        where = f"job '{self.job}'" if self.job is not None else "pipeline"
+        return f"{where}: {self.message} (at {self.path})"
+
+
+class Validator:
+    """A compiled schema for one target."""
+
+    def __init__(self, target: str, version: int, check: Callable[[Any, _Path, _Errors], None]) -> None:
+        self.target = target
+        self.version = version
+        self._check = check
+
+    def validate(self, document: Any) -> List[ValidationIssue]:
+        errors: _Errors = []
+        self._check(document, (), errors)
+        return [ValidationIssue(_format_path(path), message, _job_of(self.target, document, path)) for path, message in errors]
+
+
+def has_schema(target: str) -> bool:
+    return target in SCHEMAS
+
+
+_VALIDATORS: Dict[Tuple[str, Optional[Path]], Validator] = {}
+_LOCK = threading.Lock()
+_DEFAULT = Path()
+
+
+def get_validator(target: str, cache_dir: Optional[Path] = _DEFAULT) -> Validator:
+    """Returns the compiled validator for ``target``, from memory, disk, or a fresh compile.
+
+    ``cache_dir`` defaults to the conversion cache's directory; ``None``
+    keeps compiled validators in memory only.
+    """
+    if cache_dir is _DEFAULT:
+        cache_dir = default_cache_dir()
+    key = (target, cache_dir)
+    validator = _VALIDATORS.get(key)
+    if validator is not None:
+        return validator
+    with _LOCK:
+        if key not in _VALIDATORS:
+            _VALIDATORS[key] = _load_validator(target, cache_dir)
+        return _VALIDATORS[key]
+
+
+def validate_document(target: str, document: Any) -> List[ValidationIssue]:
+    if target == "github" and isinstance(document, dict) and True in document:
+        # YAML 1.1 loads a bare ``on:`` key as the boolean ``True``.
+        document = {("on" if key is True else key): value for key, value in document.items()}
+    return get_validator(target).validate(document)
+
+
+def validate_text(target: str, text: str, origin: str = "<output>") -> List[ValidationIssue]:
+    """Loads rendered YAML and validates it; malformed YAML raises ``PipeForgeError``."""
+    try:
+        document = yamlio.load(text)
+    except yamlio.YAMLError as exc:
+        raise PipeForgeError(f"Unable to parse YAML from {origin}: {exc}") from exc
+    return validate_document(target, document)
+
+
+def check_output(target: str, text: str, origin: str) -> None:
+    """Raises ``OutputValidationError`` if ``text`` does not match the target's schema."""
+    issues = validate_text(target, text, origin)
+    if issues:
+        raise OutputValidationError(target, origin, [str(issue) for issue in issues])
+
+
+def target_for_path(path: Path) -> Optional[str]:
+    """Guesses the target from a conventional file location, e.g. ``.gitlab-ci.yml``."""
+    name = path.name.lower()
+    if name in (".gitlab-ci.yml", ".gitlab-ci.yaml"):
+        return "gitlab"
+    if name in ("bitbucket-pipelines.yml", "bitbucket-pipelines.yaml"):
+        return "bitbucket"
+    if path.parent.name == "workflows" and path.parent.parent.name == ".github":
+        return "github"
+    return None
+
+
+def compile_schema(schema: Dict[str, Any]) -> str:
+    """Returns Python source defining ``validate(value, path, errors)`` for ``schema``."""
+    return _Compiler(schema).source()
+
+
+def _load_validator(target: str, cache_dir: Optional[Path]) -> Validator:
+    try:
+        raw = (SCHEMA_DIR / SCHEMAS[target]).read_bytes()
+    except KeyError:
+        raise PipeForgeError(f"No schema is bundled for target '{target}'.") from None
+    schema = json.loads(raw)
+    version = int(schema.get("version", 1))
+    digest = hashlib.sha256(raw + f"\0{COMPILER_VERSION}".encode()).hexdigest()[:16]
+    cached = cache_dir / "validators" / f"{target}.v{version}-{digest}.bin" if cache_dir else None
+
+    code = _read_code(cached) if cached else None
+    if code is None:
+        code = compile(compile_schema(schema), f"<pipeforge {target} v{version} validator>", "exec")
+        if cached:
+            _write_code(cached, code)
+    namespace: Dict[str, Any] = {"re": re, "_kind": _kind, "_best": _best}
+    exec(code, namespace)
+    return Validator(target, version, namespace["validate"])
+
+
+def _read_code(path: Path) -> Any:
+    try:
+        data = path.read_bytes()
+    except OSError:
+        return None
+    magic = importlib.util.MAGIC_NUMBER
+    if not data.startswith(magic):
+        return None
+    try:
+        return marshal.loads(data[len(magic) :])
+    except (EOFError, ValueError, TypeError):
+        return None
+
+
+def _write_code(path: Path, code: Any) -> None:
+    # Atomic so concurrent workers never read half a file; an unwritable
+    # cache just means compiling again next time.
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+        with os.fdopen(fd, "wb") as handle:
+            handle.write(importlib.util.MAGIC_NUMBER + marshal.dumps(code))
+        os.replace(tmp_name, path)
+    except OSError:
+        pass
+
+
+class _Compiler:
+    """Turns a schema into source with one ``_v<n>(value, path, errors)`` function per node."""
+
+    def __init__(self, schema: Dict[str, Any]) -> None:
+        self.root = schema
+        self.functions: List[str] = []
+        self.constants: List[str] = []
+        self.refs: Dict[str, str] = {}
+        self.count = 0
+
+    def source(self) -> str:
+        entry = self.function(self.root)
+        return "\n\n".join([*self.functions, *self.constants, f"validate = {entry}"]) + "\n"
+
+    def constant(self, expression: str) -> str:
+        name = f"_C{len(self.constants)}"
+        self.constants.append(f"{name} = {expression}")
+        return name
+
+    def ref(self, pointer: str) -> str:
+        if pointer not in self.refs:
+            prefix = "#/definitions/"
+            if not pointer.startswith(prefix) or pointer[len(prefix) :] not in self.root.get("definitions", {}):
+                raise PipeForgeError(f"Unsupported schema reference '{pointer}'.")
+            # Registered before compiling so recursive definitions terminate.
+            self.refs[pointer] = f"_v{self.count}"
+            self.function(self.root["definitions"][pointer[len(prefix) :]])
+        return self.refs[pointer]
+
+    def function(self, schema: Dict[str, Any]) -> str:
+        name = f"_v{self.count}"
+        self.count += 1
+        lines = self.body(schema)
+        self.functions.append(f"def {name}(value, path, errors):\n" + "\n".join(f"    {line}" for line in lines or ["pass"]))
+        return name
+
+    def body(self, schema: Dict[str, Any]) -> List[str]:
+        unknown = set(schema) - _ANNOTATIONS - {
+            "$ref", "type", "enum", "anyOf", "properties", "patternProperties", "additionalProperties",
+            "required", "minProperties", "maxProperties", "items", "minItems", "maxItems",
+            "minimum", "maximum", "pattern",
+        }  # fmt: skip
+        if unknown:
+            raise PipeForgeError(f"Unsupported schema keywords: {', '.join(sorted(unknown))}.")
+        if "$ref" in schema:
+            return [f"{self.ref(schema['$ref'])}(value, path, errors)"]
+
+        lines: List[str] = []
+        if "type" in schema:
+            types = schema["type"] if isinstance(schema["type"], list) else [schema["type"]]
+            check = " or ".join(_TYPE_CHECKS[kind] for kind in types)
+            expected = " or ".join(types)
+            lines += [f"if not ({check}):", f"    errors.append((path, 'expected {expected}, got ' + _kind(value)))", "    return"]
+        if "enum" in schema:
+            choices = self.constant(repr(tuple(schema["enum"])))
+            listed = ", ".join(str(choice) for choice in schema["enum"])
+            lines += [f"if value not in {choices}:", f"    errors.append((path, {('must be one of: ' + listed)!r}))", "    return"]
+        if "anyOf" in schema:
+            branches = self.constant("(" + "".join(f"{self.function(branch)}, " for branch in schema["anyOf"]) + ")")
+            lines += [
+                "failures = []",
+                f"for branch in {branches}:",
+                "    found = []",
+                "    branch(value, path, found)",
+                "    if not found:",
+                "        break",
+                "    failures.append(found)",
+                "else:",
+                "    errors.extend(_best(path, failures))",
+            ]
+        lines += self.numbers(schema) + self.strings(schema) + self.arrays(schema) + self.objects(schema)
+        return lines
+
+    def numbers(self, schema: Dict[str, Any]) -> List[str]:
+        lines: List[str] = []
+        for keyword, operator, text in (("minimum", "<", "at least"), ("maximum", ">", "at most")):
+            if keyword in schema:
+                lines += [
+                    f"if {_TYPE_CHECKS['number']} and value {operator} {schema[keyword]!r}:",
+                    f"    errors.append((path, 'must be {text} {schema[keyword]}'))",
+                ]
+        return lines
+
+    def strings(self, schema: Dict[str, Any]) -> List[str]:
+        if "pattern" not in schema:
+            return []
+        pattern = self.constant(f"re.compile({schema['pattern']!r})")
+        return [
+            f"if isinstance(value, str) and not {pattern}.search(value):",
+            f"    errors.append((path, {('must match ' + schema['pattern'])!r}))",
+        ]
+
+    def arrays(self, schema: Dict[str, Any]) -> List[str]:
+        checks: List[str] = []
+        if "minItems" in schema:
+            checks += [
+                f"if len(value) < {schema['minItems']}:",
+                f"    errors.append((path, 'must have at least {schema['minItems']} item(s)'))",
+            ]
+        if "maxItems" in schema:
+            checks += [
+                f"if len(value) > {schema['maxItems']}:",
+                f"    errors.append((path, 'must have at most {schema['maxItems']} item(s)'))",
+            ]
+        if "items" in schema:
+            item = self.function(schema["items"])
+            checks += ["for index, item in enumerate(value):", f"    {item}(item, path + (index,), errors)"]
+        return ["if isinstance(value, list):", *(f"    {line}" for line in checks)] if checks else []
+
+    def objects(self, schema: Dict[str, Any]) -> List[str]:
+        checks: List[str] = []
+        if schema.get("required"):
+            required = self.constant(repr(tuple(schema["required"])))
+            checks += [
+                f"for key in {required}:",
+                "    if key not in value:",
+                "        errors.append((path, f\"missing required property '{key}'\"))",
+            ]
+        if "minProperties" in schema:
+            checks += [
+                f"if len(value) < {schema['minProperties']}:",
+                f"    errors.append((path, 'must have at least {schema['minProperties']} entr(y/ies)'))",
+            ]
+        if "maxProperties" in schema:
+            checks += [
+                f"if len(value) > {schema['maxProperties']}:",
+                f"    errors.append((path, 'must have at most {schema['maxProperties']} entr(y/ies)'))",
+            ]
+
+        properties = schema.get("properties", {})
+        patterns = schema.get("patternProperties", {})
+        additional = schema.get("additionalProperties", True)
+        if properties or patterns or additional is not True:
+            lookup = self.constant(
+                "{" + "".join(f"{key!r}: {self.function(value)}, " for key, value in properties.items()) + "}"
+            )
+            checks += [
+                "for key, item in value.items():",
+                f"    check = {lookup}.get(key)",
+                "    if check is not None:",
+                "        check(item, path + (key,), errors)",
+                "        continue",
+            ]
+            if patterns:
+                matchers = self.constant(
+                    "("
+                    + "".join(f"(re.compile({key!r}), {self.function(value)}), " for key, value in patterns.items())
+                    + ")"
+                )
+                checks += [
+                    "    matched = False",
+                    f"    for pattern, check in {matchers}:",
+                    "        if isinstance(key, str) and pattern.search(key):",
+                    "            check(item, path + (key,), errors)",
+                    "            matched = True",
+                    "    if matched:",
+                    "        continue",
+                ]
+            if additional is False:
+                checks.append("    errors.append((path + (key,), f\"unknown property '{key}'\"))")
+            elif isinstance(additional, dict):
+                checks.append(f"    {self.function(additional)}(item, path + (key,), errors)")
+        return ["if isinstance(value, dict):", *(f"    {line}" for line in checks)] if checks else []
+
+
+def _kind(value: Any) -> str:
+    if value is None:
+        return "null"
+    if isinstance(value, bool):
+        return "boolean"
+    if isinstance(value, dict):
+        return "object"
+    if isinstance(value, list):
+        return "array"
+    if isinstance(value, str):
+        return "string"
+    if isinstance(value, int):
+        return "integer"
+    if isinstance(value, float):
+        return "number"
+    return type(value).__name__
+
+
+def _best(path: _Path, failures: Sequence[_Errors]) -> _Errors:
+    """Picks the errors to report when no ``anyOf`` branch matched.
+
+    If every branch rejected the value's type outright, or only missed a
+    required property, the alternatives are merged into one message;
+    otherwise the branch that got furthest into the value (deepest error,
+    then fewest errors) explains the failure best.
+    """
+    if all(len(found) == 1 and found[0][0] == path for found in failures):
+        messages = [found[0][1] for found in failures]
+        if all(message.startswith("expected ") for message in messages):
+            expected = [message[len("expected ") :].rsplit(", got ", 1) for message in messages]
+            kinds = list(dict.fromkeys(kind for parts in expected for kind in parts[0].split(" or ")))
+            return [(path, f"expected {' or '.join(kinds)}, got {expected[0][1]}")]
+        if all(message.startswith("missing required property ") for message in messages):
+            names = list(dict.fromkeys(message.rsplit(" ", 1)[1] for message in messages))
+            return [(path, f"missing required property {' or '.join(names)}")]
+    return max(failures, key=lambda found: (max(len(error[0]) for error in found), -len(found)))
+
+
+def _format_path(path: _Path) -> str:
+    text = ""
+    for part in path:
+        text += f"[{part}]" if isinstance(part, int) else (f".{part}" if text else str(part))
+    return text or "<root>"
+
+
+def _job_of(target: str, document: Any, path: _Path) -> Optional[str]:
+    """Names the job an error path points into, per target layout."""
+    if target == "gitlab":
+        if path and isinstance(path[0], str) and path[0] not in _GITLAB_GLOBALS:
+            return path[0]
+    elif target == "github":
+        if len(path) >= 2 and path[0] == "jobs":
+            return str(path[1])
+    elif target == "bitbucket":
+        node, job = document, None
+        for part in path:
+            try:
+                node = node[part]
+            except (KeyError, IndexError, TypeError):
+                break
+            if part == "step":
+                job = node.get("name", "unnamed step") if isinstance(node, dict) else "unnamed step"
+        return job
+    return None
+
+
+_GITLAB_GLOBALS = frozenset(
+    {"stages", "variables", "default", "include", "workflow", "image", "services", "cache", "before_script", "after_script"}
+)
@@ -0,0 +1,329 @@
+# SPDX-FileCopyrightText: 2025-present U.N. Owen <void@some.where>
+#
+# SPDX-License-Identifier: MIT
+
+"""Shared YAML loading plus the direct emitter every renderer writes through.
+
+Loading prefers libyaml and falls back to pure Python; set
+``PIPEFORGE_YAML_BACKEND=python`` to force the pure-Python implementation.
+Writing never goes through PyYAML: ``dump()`` emits block-style YAML straight
+to a text stream, so output is identical whichever loader is active.
+"""
+
+from __future__ import annotations
+
+import io
+import math
+import os
+import re
+from collections.abc import Iterator as _Iterator
+from functools import lru_cache
+from typing import IO, Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+import yaml
+
+YAMLError = yaml.YAMLError
+
+try:
+    from yaml import CSafeLoader as _CSafeLoader
+except ImportError:  # pragma: no cover - depends on how PyYAML was built
+    _CSafeLoader = None
+
+if _CSafeLoader is not None and os.environ.get("PIPEFORGE_YAML_BACKEND", "").lower() != "python":
+    BACKEND = "libyaml"
+    SafeLoader: Any = _CSafeLoader
+else:
+    BACKEND = "python"
+    SafeLoader = yaml.SafeLoader
+
+Stream = Union[str, bytes, IO[str], IO[bytes]]
+
+
+class LiteralBlock(str):
+    """A string emitted in literal block style (``|``)."""
+
+    __slots__ = ()
+
+
+class SharedBlock(LiteralBlock):
+    """A literal block written once with an anchor and aliased on every later use."""
+
+    __slots__ = ()
+
+
+class SharedDict(dict):  # type: ignore[type-arg]
+    """A mapping written once with an anchor and aliased on every later use."""
+
+    __slots__ = ()
+
+
+class SharedList(list):  # type: ignore[type-arg]
+    """A sequence written once with an anchor and aliased on every later use."""
+
+    __slots__ = ()
+
+
+class LazyMapping:
+    """A mapping produced on demand from ``(key, value)`` pairs.
+
+    ``dump()`` writes each pair as it is produced, so renderers can stream
+    one job at a time instead of building the whole document first. Like a
+    generator, it can only be written once.
+    """
+
+    __slots__ = ("pairs",)
+
+    def __init__(self, pairs: Iterable[Tuple[Any, Any]]) -> None:
+        self.pairs = pairs
+
+    def __iter__(self) -> Iterator[Tuple[Any, Any]]:
+        return iter(self.pairs)
+
+
+def materialize(data: Any) -> Any:
+    """Replaces the lazy parts of a document (generators, ``LazyMapping``) with plain data."""
+    if isinstance(data, LazyMapping):
+        return {key: materialize(value) for key, value in data}
+    if isinstance(data, _Iterator):
+        return [materialize(item) for item in data]
+    if type(data) is dict:
+        return {key: materialize(value) for key, value in data.items()}
+    return data
+
+
+def load(stream: Stream) -> Any:
+    """Loads a single document from a string, bytes, or an open file handle."""
+    return yaml.load(stream, Loader=SafeLoader)
+
+
+def load_all(stream: Stream) -> Iterator[Any]:
+    """Lazily yields every document in the stream."""
+    return yaml.load_all(stream, Loader=SafeLoader)
+
+
+def dump(data: Any, stream: Optional[IO[str]] = None) -> Optional[str]:
+    """Writes ``data`` as block-style YAML to ``stream``, or returns it as a string.
+
+    Mappings keep their insertion order and long lines are never folded.
+    Multi-line strings use literal block style where it can represent them.
+    ``Shared*`` values get an anchor on their first use and an alias on every
+    later one; anything else is written out in full each time. Generators and
+    ``LazyMapping`` values are consumed as they are written.
+    """
+    if stream is None:
+        buffer = io.StringIO()
+        _Emitter(buffer).document(data)
+        return buffer.getvalue()
+    _Emitter(stream).document(data)
+    return None
+
+
+_INDENT = 2
+# Keys longer than this use the explicit ``? key`` form, as PyYAML does.
+_SIMPLE_KEY_LIMIT = 128
+_SHARED = (SharedDict, SharedList, SharedBlock)
+_END = object()
+_STR_TAG = "tag:yaml.org,2002:str"
+
+
+class _Emitter:
+    """Writes one document, flushing after every item of a lazy collection."""
+
+    def __init__(self, stream: IO[str]) -> None:
+        self._write = stream.write
+        self._parts: List[str] = []
+        # Anchored values stay referenced so their ids cannot be reused.
+        self._anchors: Dict[int, Tuple[str, Any]] = {}
+
+    def document(self, data: Any) -> None:
+        if isinstance(data, (dict, LazyMapping)):
+            self._mapping(data, 0, lead="", empty="{}\n")
+        elif isinstance(data, (list, tuple, _Iterator)):
+            self._sequence(data, 0, lead="", empty="[]\n")
+        else:
+            self._parts.append("---")
+            self._value(data, 0, in_sequence=False)
+        self._flush()
+
+    def _flush(self) -> None:
+        if self._parts:
+            self._write("".join(self._parts))
+            self._parts.clear()
+
+    def _value(self, data: Any, indent: int, in_sequence: bool) -> None:
+        """Writes ``data`` after a ``key:`` or ``-`` indicator at column ``indent``."""
+        out = self._parts
+        anchor = ""
+        if isinstance(data, _SHARED):
+            known = self._anchors.get(id(data))
+            if known is not None:
+                out.append(f" *{known[0]}\n")
+                return
+            name = f"id{len(self._anchors) + 1:03d}"
+            self._anchors[id(data)] = (name, data)
+            anchor = f" &{name}"
+
+        if isinstance(data, (dict, LazyMapping)):
+            if in_sequence and not anchor:
+                # ``- key: value`` starts the mapping on the indicator's line.
+                self._mapping(data, indent + _INDENT, lead=" ", empty=" {}\n", inline=True)
+            else:
+                self._mapping(data, indent + _INDENT, lead=f"{anchor}\n", empty=f"{anchor} {{}}\n")
+        elif isinstance(data, (list, tuple, _Iterator)):
+            if in_sequence and not anchor:
+                self._sequence(data, indent + _INDENT, lead=" ", empty=" []\n", inline=True)
+            else:
+                # Sequences directly under a key are not indented, like PyYAML's output.
+                nested = indent + _INDENT if in_sequence else indent
+                self._sequence(data, nested, lead=f"{anchor}\n", empty=f"{anchor} []\n")
+        elif isinstance(data, str):
+            literal = _literal(data) if "\n" in data or isinstance(data, LiteralBlock) else None
+            if literal is None:
+                out.append(f"{anchor} {_flow_scalar(data)}\n")
+            else:
+                header, lines = literal
+                pad = " " * (indent + _INDENT)
+                out.append(f"{anchor} {header}\n")
+                out.extend(f"{pad}{line}\n" if line else "\n" for line in lines)
+        else:
+            out.append(f"{anchor} {_other_scalar(data)}\n")
+
+    def _mapping(self, data: Any, indent: int, lead: str, empty: str, inline: bool = False) -> None:
+        """Writes entries at column ``indent``; ``inline`` puts the first one right after ``lead``."""
+        out = self._parts
+        lazy = isinstance(data, LazyMapping)
+        items = iter(data) if lazy else iter(data.items())
+        entry = next(items, _END)
+        if entry is _END:
+            out.append(empty)
+            return
+        out.append(lead)
+        pad = " " * indent
+        while entry is not _END:
+            key, value = entry
+            prefix = "" if inline else pad
+            text = _key(key)
+            if len(text) > _SIMPLE_KEY_LIMIT:
+                out.append(f"{prefix}? {text}\n{pad}:")
+            else:
+                out.append(f"{prefix}{text}:")
+            self._value(value, indent, in_sequence=False)
+            inline = False
+            if lazy:
+                self._flush()
+            entry = next(items, _END)
+
+    def _sequence(self, data: Any, indent: int, lead: str, empty: str, inline: bool = False) -> None:
+        """Writes items with their ``-`` at column ``indent``."""
+        out = self._parts
+        lazy = isinstance(data, _Iterator)
+        items = iter(data)
+        item = next(items, _END)
+        if item is _END:
+            out.append(empty)
+            return
+        out.append(lead)
+        pad = " " * indent
+        while item is not _END:
+            out.append("-" if inline else f"{pad}-")
+            self._value(item, indent, in_sequence=True)
+            inline = False
+            if lazy:
+                self._flush()
+            item = next(items, _END)
+
+
+def _key(key: Any) -> str:
+    return _flow_scalar(key) if isinstance(key, str) else _other_scalar(key)
+
+
+def _other_scalar(value: Any) -> str:
+    if value is None:
+        return "null"
+    if value is True:
+        return "true"
+    if value is False:
+        return "false"
+    if isinstance(value, int):
+        return str(value)
+    if isinstance(value, float):
+        if math.isnan(value):
+            return ".nan"
+        if math.isinf(value):
+            return ".inf" if value > 0 else "-.inf"
+        text = repr(value)
+        if "." in text:
+            return text
+        # Like PyYAML: YAML 1.1 only reads ``1e+20`` as a float when spelled ``1.0e+20``.
+        return text.replace("e", ".0e", 1) if "e" in text else f"{text}.0"
+    raise YAMLError(f"Cannot represent {type(value).__name__} value {value!r}")
+
+
+# Characters YAML allows in a stream, minus the BOM.
+_PRINTABLE = "\t\n\x20-\x7e\x85\xa0-\ud7ff\ue000-\ufefe\uff00-\ufffd\U00010000-\U0010ffff"
+_NON_PRINTABLE = re.compile(f"[^{_PRINTABLE}]")
+_PLAIN_UNSAFE = re.compile(
+    r"^[\s#,\[\]{}&*!|>'\"%@`]"  # leading whitespace or indicator
+    r"|^[-?:](?:\s|$)|^(?:---|\.\.\.)"  # block indicators and document markers
+    r"|: |:$| #|\s$"  # mapping values, comments, trailing whitespace
+    r"|[\t\n\x85\u2028\u2029]"  # tabs and line breaks
+)
+# Non-printable characters, carriage returns, exotic line breaks and
+# whitespace that an editor would strip rule out literal blocks.
+_LITERAL_UNSAFE = re.compile(r"[\r\x85\u2028\u2029]|[ \t](?:\n|$)")
+_ESCAPES = {
+    "\0": "\\0",
+    "\a": "\\a",
+    "\b": "\\b",
+    "\t": "\\t",
+    "\n": "\\n",
+    "\v": "\\v",
+    "\f": "\\f",
+    "\r": "\\r",
+    "\x1b": "\\e",
+    '"': '\\"',
+    "\\": "\\\\",
+    "\x85": "\\N",
+    "\xa0": "\\_",
+    "\u2028": "\\L",
+    "\u2029": "\\P",
+}
+_QUOTE_UNSAFE = re.compile(f"[^{_PRINTABLE}]|[\\t\\n\\x85\\u2028\\u2029]")
+_NEEDS_ESCAPE = re.compile(f'["\\\\\\x85\\xa0\\u2028\\u2029]|[^{_PRINTABLE}]|[\\t\\n]')
+_RESOLVER = yaml.resolver.Resolver()
+
+
+@lru_cache(maxsize=8192)
+def _flow_scalar(value: str) -> str:
+    """Plain, single-quoted, or double-quoted form of a string, in that order of preference."""
+    if not value:
+        return "''"
+    if _PLAIN_UNSAFE.search(value) is None and _NON_PRINTABLE.search(value) is None:
+        if _RESOLVER.resolve(yaml.ScalarNode, value, (True, False)) == _STR_TAG:
+            return value
+    if _QUOTE_UNSAFE.search(value) is None:
+        return "'" + value.replace("'", "''") + "'"
+    return '"' + _NEEDS_ESCAPE.sub(_escape, value) + '"'
+
+
+def _escape(match: "re.Match[str]") -> str:
+    char = match.group()
+    escaped = _ESCAPES.get(char)
+    if escaped is not None:
+        return escaped
+    code = ord(char)
+    return f"\\x{code:02X}" if code <= 0xFF else f"\\u{code:04X}" if code <= 0xFFFF else f"\\U{code:08X}"
+
+
+@lru_cache(maxsize=4096)
+def _literal(value: str) -> Optional[Tuple[str, Tuple[str, ...]]]:
+    """Returns the ``|`` header and content lines for ``value``, or None when literal style cannot hold it."""
+    body = value.rstrip("\n")
+    if not body or _LITERAL_UNSAFE.search(value) or _NON_PRINTABLE.search(value):
+        return None
+    trailing = len(value) - len(body)
+    chomp = "-" if trailing == 0 else "" if trailing == 1 else "+"
+    # Content that starts with whitespace or a blank line needs an explicit indentation.
+    header = "|" + (str(_INDENT) if value[0] in " \n" else "") + chomp
+    return header, tuple(body.split("\n")) + ("",) * max(0, trailing - 1)
+
@@ -0,0 +1,61 @@
+# SPDX-FileCopyrightText: 2025-present U.N. Owen <void@some.where>
+#
+# SPDX-License-Identifier: MIT
+
+import json
+
+import pytest
+
+from pipeforge.analysis import analyze, load_durations
+from pipeforge.errors import PipeForgeError
+from pipeforge.models import Job, Pipeline
+from pipeforge.renderers.bitbucket import BitbucketRenderer
+from pipeforge.renderers.github import GitHubActionsRenderer
+from pipeforge.renderers.gitlab import GitLabRenderer
+
+DURATIONS = {"fetch": 10, "build": 100, "docs": 100, "publish": 10}
+
+
+def _pipeline():
+    return Pipeline(
+        name="Crossed",
+        jobs=[
+            Job(name="fetch"),
+            Job(name="build"),
+            Job(name="docs", needs=("fetch",)),
+            Job(name="publish", needs=("build",)),
+        ],
+    )
+
+
+def test_analysis_compares_target_schedules_with_the_critical_path():
+    pipeline = _pipeline()
+    renderers = [BitbucketRenderer(), GitLabRenderer(), GitHubActionsRenderer()]
+    analysis = analyze(pipeline, {renderer.slug: renderer.schedule(pipeline) for renderer in renderers}, DURATIONS)
+
+    assert analysis.critical_s == 110
+    assert analysis.critical_path in (["fetch", "docs"], ["build", "publish"])
+    assert analysis.runner_s == 220
+    assert analysis.max_width == 2
+    walls = {schedule.name: (schedule.wall_s, schedule.ratio) for schedule in analysis.schedules}
+    # Bitbucket levels make ``docs`` wait for ``build`` as well.
+    assert walls["bitbucket"] == (200, pytest.approx(1.818, abs=0.001))
+    assert walls["github"] == walls["gitlab"] == walls["source"] == (110, 1.0)
+
+
+def test_missing_durations_use_the_default():
+    analysis = analyze(_pipeline(), {}, {"build": 30}, default=5)
+
+    assert analysis.defaulted == 3
+    assert analysis.critical_path == ["build", "publish"]
+    assert analysis.critical_s == 35
+
+
+def test_load_durations_takes_medians(tmp_path):
+    path = tmp_path / "durations.json"
+    path.write_text(json.dumps({"jobs": {"build": [90, 300, 100], "test": 12}}), encoding="utf-8")
+    assert load_durations(path) == {"build": 100.0, "test": 12.0}
+
+    path.write_text(json.dumps({"build": "slow"}), encoding="utf-8")
+    with pytest.raises(PipeForgeError, match="job 'build'"):
+        load_durations(path)
@@ -0,0 +1,39 @@
+# SPDX-FileCopyrightText: 2025-present U.N. Owen <void@some.where>
+#
+# SPDX-License-Identifier: MIT
+
+import yaml
+
+from benchmarks.run import StageTiming, compare, run_scenario
+from benchmarks.specgen import SpecShape, generate_spec_text
+from pipeforge.parsers import BambooSpecParser
+
+
+def test_generated_specs_parse_in_both_layouts():
+    for layout in ("stages", "jobs"):
+        shape = SpecShape(stages=3, jobs=4, tasks=2, variables=6, layout=layout)
+        pipeline = BambooSpecParser().parse(yaml.safe_load(generate_spec_text(shape)))
+
+        assert len(pipeline.jobs) == shape.total_jobs
+        assert len(pipeline.variables) == 6
+        assert all(len(job.steps) == 2 for job in pipeline.jobs)
+
+
+def test_run_scenario_times_every_stage():
+    timings = run_scenario(SpecShape(stages=1, jobs=2, tasks=1, variables=1), ["gitlab"], repeat=1)
+
+    assert [(timing.stage, timing.target) for timing in timings] == [
+        ("load", None),
+        ("parse", None),
+        ("render", "gitlab"),
+        ("dump", "gitlab"),
+    ]
+
+
+def test_compare_flags_only_slowdowns_past_threshold():
+    baseline = [StageTiming("s", "parse", None, 1.0, 1.0, 1), StageTiming("s", "dump", "gitlab", 1.0, 1.0, 1)]
+    current = [StageTiming("s", "parse", None, 1.05, 1.05, 1), StageTiming("s", "dump", "gitlab", 1.5, 1.5, 1)]
+
+    regressions = compare(current, baseline, threshold=0.1)
+
+    assert [(regression.stage, regression.target) for regression in regressions] == [("dump", "gitlab")]
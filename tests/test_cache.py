@@ -0,0 +1,73 @@
+# SPDX-FileCopyrightText: 2025-present U.N. Owen <void@some.where>
+#
+# SPDX-License-Identifier: MIT
+
+import os
+
+from click.testing import CliRunner
+
+from pipeforge import PipelineTranspiler
+from pipeforge.cache import ConversionCache
+from pipeforge.cli import app
+
+SPEC = """
+plan:
+  name: Cached Plan
+jobs:
+  - name: build
+    tasks:
+      - script: make
+"""
+
+
+def test_cache_hit_skips_loading(tmp_path, monkeypatch):
+    spec = tmp_path / "bamboo.yml"
+    spec.write_text(SPEC, encoding="utf-8")
+    transpiler = PipelineTranspiler(cache=ConversionCache(tmp_path / "cache"))
+
+    first = transpiler.convert_path(spec, target="gitlab")
+
+    def _fail(*args, **kwargs):
+        raise AssertionError("cache hit should not reload the spec")
+
+    monkeypatch.setattr(transpiler, "_load_content", _fail)
+    assert transpiler.convert_path(spec, target="gitlab") == first
+    assert transpiler.cache.stats().entries == 1
+
+
+def test_cache_key_covers_target_and_name():
+    cache = ConversionCache()
+    base = cache.key(b"spec", source="bamboo", target="gitlab")
+
+    assert base == cache.key(b"spec", source="bamboo", target="gitlab")
+    assert base != cache.key(b"spec", source="bamboo", target="github")
+    assert base != cache.key(b"spec", source="bamboo", target="gitlab", name="Other")
+    assert base != cache.key(b"spec2", source="bamboo", target="gitlab")
+
+
+def test_eviction_drops_least_recently_used(tmp_path):
+    cache = ConversionCache(tmp_path)
+    for index, key in enumerate(["aa01", "bb02", "cc03"]):
+        cache.put(key, "x" * 100)
+        os.utime(cache._entry_path(key), (index, index))
+
+    cache.max_size = 200
+    assert cache.evict() == 2
+
+    assert cache.get("aa01") is None
+    assert cache.get("bb02") is None
+    assert cache.get("cc03") == "x" * 100
+
+
+def test_cache_stats_and_clear_commands(tmp_path):
+    cache = ConversionCache(tmp_path)
+    cache.put("abcd", "rendered")
+    runner = CliRunner()
+
+    stats = runner.invoke(app, ["cache", "--cache-dir", str(tmp_path), "stats"])
+    assert stats.exit_code == 0
+    assert "Entries:   1" in stats.output
+
+    cleared = runner.invoke(app, ["cache", "--cache-dir", str(tmp_path), "clear"])
+    assert "Removed 1" in cleared.output
+    assert cache.stats().entries == 0
@@ -0,0 +1,52 @@
+# SPDX-FileCopyrightText: 2025-present U.N. Owen <void@some.where>
+#
+# SPDX-License-Identifier: MIT
+
+import pytest
+
+from pipeforge import PipelineTranspiler, yamlio
+from pipeforge.caches import KNOWN_CACHES, cache_from_hint, detect_caches
+from pipeforge.errors import InvalidPipelineSpecError
+
+SPEC = """
+jobs:
+  - name: build
+    caches: [{name: sbt, paths: [target/sbt], key-files: [build.sbt]}]
+    tasks: [{script: ["./mvnw -B package", "npm ci && npm run build"]}]
+  - name: lint
+    caches: false
+    tasks: [{script: pip install -r requirements.txt}]
+"""
+
+
+def test_detects_package_manager_commands():
+    names = [cache.name for cache in detect_caches(["./gradlew build", "python -m pip install .", "echo mvn"])]
+
+    assert names == ["gradle", "pip"]
+    assert detect_caches(["npm run build"]) == []
+
+
+def test_cache_hints():
+    assert cache_from_hint("maven") is KNOWN_CACHES["maven"]
+    with pytest.raises(InvalidPipelineSpecError):
+        cache_from_hint("cargo")
+    with pytest.raises(InvalidPipelineSpecError):
+        cache_from_hint({"name": "custom"})
+
+
+def test_renderers_emit_native_caches():
+    outputs = PipelineTranspiler().convert_content(SPEC, targets=["all"])
+
+    bitbucket = yamlio.load(outputs["bitbucket"])
+    steps = [entry["step"] for entry in bitbucket["pipelines"]["default"][0]["parallel"]]
+    assert steps[0]["caches"] == ["sbt", "maven", "npm"]
+    assert "caches" not in steps[1]
+    assert bitbucket["definitions"]["caches"]["npm"] == {"key": {"files": ["**/package-lock.json"]}, "path": "~/.npm"}
+
+    build = yamlio.load(outputs["gitlab"])["build"]
+    assert build["variables"]["MAVEN_OPTS"] == "-Dmaven.repo.local=$CI_PROJECT_DIR/.cache/maven"
+    assert build["cache"][1] == {"key": {"files": ["pom.xml"], "prefix": "maven"}, "paths": [".cache/maven"]}
+
+    github_steps = yamlio.load(outputs["github"])["jobs"]["build"]["steps"]
+    assert github_steps[2]["uses"] == "actions/cache@v4"
+    assert github_steps[2]["with"]["key"] == "${{ runner.os }}-maven-${{ hashFiles('**/pom.xml') }}"
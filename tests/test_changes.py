@@ -0,0 +1,143 @@
+# SPDX-FileCopyrightText: 2025-present U.N. Owen <void@some.where>
+#
+# SPDX-License-Identifier: MIT
+
+import pytest
+
+from pipeforge import PipelineTranspiler, yamlio
+from pipeforge.changes import job_filters, load_path_map
+from pipeforge.errors import PipeForgeError
+from pipeforge.models import Job, PathFilter, Pipeline, Step, Trigger
+from pipeforge.parsers.bamboo import _regex_globs
+from pipeforge.renderers.gitlab import GitLabRenderer
+
+SPEC = """
+plan:
+  name: Mono
+triggers:
+  - polling: 130
+  - cron: 0 0 2 ? * 2-6
+  - cron: 0 15 10 L * ?
+repositories:
+  - mono:
+      change-detection:
+        include: ^(services|libs)/.*
+        exclude: .*\\.md$
+stages:
+  - Build:
+      jobs:
+        - name: api
+          tasks: [{script: make api}]
+          artifacts: [{name: bin, pattern: dist/api}]
+        - name: web
+          tasks: [{script: make web}]
+  - Test:
+      jobs:
+        - name: api tests
+          tasks: [{script: make test}]
+          artifact-subscriptions: [bin]
+        - name: e2e
+          tasks: [{script: make e2e}]
+"""
+
+
+@pytest.fixture
+def path_map(tmp_path):
+    path = tmp_path / "paths.yml"
+    path.write_text("jobs:\n  api: [services/api/**]\n  api tests: services/api/tests/**\n  web: [web/**]\n")
+    return load_path_map(path)
+
+
+def test_bamboo_triggers_and_change_detection_become_filters():
+    pipeline = PipelineTranspiler().parsers.get("bamboo").parse(yamlio.load(SPEC))
+
+    # Quartz counts weekdays from Sunday = 1; the last-day schedule has no cron form.
+    assert pipeline.triggers == [Trigger("push"), Trigger("schedule", "0 2 * * 1-5")]
+    assert pipeline.paths == PathFilter(["services/**", "libs/**"], ["**/*.md"])
+    assert not any(job.paths for job in pipeline.jobs)
+
+
+@pytest.mark.parametrize(
+    ("regex", "globs"),
+    [
+        (r"^src.main/.*", ("src?main/**", "src/main/**")),
+        (r"^docs/.*|^README\.md$", ("docs/**", "README.md")),
+        (r"^lib/[^/]*\.py$", ("lib/*.py",)),
+        (r"^\d+/.*", None),
+    ],
+)
+def test_change_detection_globs_cover_the_regex(regex, globs):
+    assert _regex_globs(regex) == globs
+
+
+def test_path_maps_are_validated(tmp_path):
+    path = tmp_path / "paths.yml"
+    path.write_text("build: {include: [src/**], skip: [docs/**]}\n")
+    with pytest.raises(PipeForgeError, match="unknown key"):
+        load_path_map(path)
+    path.write_text("build: 3\n")
+    with pytest.raises(PipeForgeError, match="must be a glob or a list of globs"):
+        load_path_map(path)
+
+
+def test_producers_run_whenever_their_subscribers_do(tmp_path, path_map):
+    spec = tmp_path / "bamboo.yml"
+    spec.write_text(SPEC, encoding="utf-8")
+    pipeline = PipelineTranspiler(paths=path_map).parse_path(spec)
+
+    filters = job_filters(pipeline)
+    assert filters["api"] == PathFilter(["services/api/**", "services/api/tests/**"])
+    assert filters["web"] == PathFilter(["web/**"])
+    assert not filters["e2e"]
+
+    # An unfiltered subscriber needs its producer on every change.
+    pipeline.jobs[2].paths = PathFilter()
+    assert not job_filters(pipeline)["api"]
+
+
+def test_targets_render_native_change_filters(tmp_path, monkeypatch, path_map):
+    monkeypatch.setenv("PIPEFORGE_CACHE_DIR", str(tmp_path / "cache"))
+    outputs = PipelineTranspiler(paths=path_map, validate=True).convert_content(SPEC, targets=["all"])
+
+    gitlab = yamlio.load(outputs["gitlab"])
+    assert gitlab["workflow"] == {
+        "rules": [{"if": '$CI_PIPELINE_SOURCE == "schedule"'}, {"changes": ["services/**", "libs/**"]}]
+    }
+    assert gitlab["web"]["rules"] == [{"changes": ["web/**"]}]
+    assert "rules" not in gitlab["e2e"]
+
+    github = yamlio.load(outputs["github"])
+    assert github["on"] == {
+        "push": {"paths": ["services/**", "libs/**", "!**/*.md"]},
+        "schedule": [{"cron": "0 2 * * 1-5"}],
+    }
+    jobs = github["jobs"]
+    assert list(jobs) == ["changes", "api", "web", "api_tests", "e2e"]
+    assert jobs["changes"]["steps"][1]["with"]["filters"].startswith("api:\n  - 'services/api/**'\n")
+    assert jobs["web"]["needs"] == ["changes"]
+    assert jobs["web"]["if"] == "${{ (github.event_name == 'schedule' || needs.changes.outputs.web == 'true') }}"
+    # A skipped need must not skip the jobs after it.
+    assert jobs["e2e"]["if"] == "${{ !failure() && !cancelled() }}"
+
+    levels = yamlio.load(outputs["bitbucket"])["pipelines"]["default"]
+    steps = [step["step"] for level in levels for step in level["parallel"]]
+    assert steps[1]["condition"] == {"changesets": {"includePaths": ["web/**"], "excludePaths": ["**/*.md"]}}
+    assert steps[3]["condition"] == {
+        "changesets": {"includePaths": ["services/**", "libs/**"], "excludePaths": ["**/*.md"]}
+    }
+
+
+def test_needs_on_filtered_jobs_are_optional():
+    pipeline = Pipeline(
+        name="Needs",
+        stages=["build", "test"],
+        jobs=[
+            Job(name="docs", stage="build", steps=[Step("docs", ["make docs"])], paths=PathFilter(["docs/**"])),
+            Job(name="slow", stage="build", steps=[Step("slow", ["make slow"])]),
+            Job(name="publish", stage="test", steps=[Step("publish", ["make publish"])], needs=("docs",)),
+        ],
+    )
+
+    gitlab = yamlio.load(GitLabRenderer().render(pipeline))
+    assert gitlab["publish"]["needs"] == [{"job": "docs", "optional": True}]
+    assert gitlab["docs"]["rules"] == [{"changes": ["docs/**"]}]
@@ -2,6 +2,9 @@
 #
 # SPDX-License-Identifier: MIT
 
+import json
+import tarfile
+import zipfile
 from pathlib import Path
 
 import yaml
@@ -44,6 +47,40 @@ def test_convert_to_bitbucket(tmp_path):
     assert output["pipelines"]["default"], "Bitbucket pipelines default steps missing"
 
 
+def test_convert_streams_output_file(tmp_path):
+    spec = _write_sample_spec(tmp_path)
+    destination = tmp_path / "out" / "bitbucket-pipelines.yml"
+    result = runner.invoke(app, ["convert", str(spec), "--target", "bitbucket", "-o", str(destination)])
+    assert result.exit_code == 0, result.output
+    assert f"to {destination}" in result.output
+    assert yaml.safe_load(destination.read_text())["pipelines"]["default"]
+    assert list(destination.parent.iterdir()) == [destination]
+
+
+def test_convert_folds_matrix_jobs(tmp_path):
+    spec = tmp_path / "bamboo.yml"
+    spec.write_text(
+        """
+plan:
+  name: Matrix Plan
+jobs:
+  - name: test 11
+    variables: {JDK: "11"}
+    tasks: [{script: [mvn test]}]
+  - name: test 17
+    variables: {JDK: "17"}
+    tasks: [{script: [mvn test]}]
+""",
+        encoding="utf-8",
+    )
+    destination = tmp_path / ".gitlab-ci.yml"
+    result = runner.invoke(app, ["convert", str(spec), "-t", "gitlab", "-o", str(destination), "--fold-matrix"])
+    assert result.exit_code == 0, result.output
+    assert "Folded 2 job(s) into 1 matrix job(s)." in result.output
+    output = yaml.safe_load(destination.read_text())
+    assert output["test"]["parallel"] == {"matrix": [{"JDK": ["11", "17"]}]}
+
+
 def test_convert_to_gitlab(tmp_path):
     spec = _write_sample_spec(tmp_path)
     result = runner.invoke(app, ["convert", str(spec), "--target", "gitlab"])
@@ -52,3 +89,191 @@ def test_convert_to_gitlab(tmp_path):
     assert "stages" in output
     job_keys = [key for key in output.keys() if key not in {"stages", "variables"}]
     assert job_keys, "GitLab jobs should exist"
+
+
+def test_validate_checks_converted_and_hand_written_files(tmp_path, monkeypatch):
+    monkeypatch.setenv("PIPEFORGE_CACHE_DIR", str(tmp_path / "cache"))
+    spec = _write_sample_spec(tmp_path)
+    result = runner.invoke(app, ["convert", str(spec), "-t", "all", "-d", str(tmp_path / "out"), "--validate"])
+    assert result.exit_code == 0, result.output
+
+    outputs = [tmp_path / "out" / ".gitlab-ci.yml", tmp_path / "out" / "bitbucket-pipelines.yml"]
+    result = runner.invoke(app, ["validate", *map(str, outputs)])
+    assert result.exit_code == 0, result.output
+    assert "valid gitlab pipeline" in result.output
+
+    broken = tmp_path / "ci.yml"
+    broken.write_text("build:\n  stage: build\n", encoding="utf-8")
+    result = runner.invoke(app, ["validate", str(broken), "--target", "gitlab"])
+    assert result.exit_code == 1
+    assert "job 'build': missing required property" in result.output
+
+    result = runner.invoke(app, ["validate", str(broken)])
+    assert result.exit_code == 2
+    assert "pass --target" in result.output
+
+
+def test_convert_tree_mirrors_layout_and_reports_failures(tmp_path):
+    input_dir = tmp_path / "specs"
+    (input_dir / "team-a").mkdir(parents=True)
+    _write_sample_spec(input_dir / "team-a")
+    (input_dir / "broken.yml").write_text("plan: {name: Broken}\n", encoding="utf-8")
+    output_dir = tmp_path / "out"
+
+    result = runner.invoke(
+        app,
+        ["convert-tree", str(input_dir), str(output_dir), "--target", "gitlab", "--executor", "thread"],
+    )
+
+    assert result.exit_code == 1
+    assert "Converted 1 spec(s)" in result.output
+    assert "broken.yml" in result.output
+    output = yaml.safe_load((output_dir / "team-a" / "bamboo.yml").read_text(encoding="utf-8"))
+    assert "stages" in output
+
+
+def test_convert_archive_writes_a_new_archive(tmp_path):
+    spec = _write_sample_spec(tmp_path)
+    source = tmp_path / "export.zip"
+    with zipfile.ZipFile(source, "w") as archive:
+        archive.write(spec, "team/plan.yml")
+    destination = tmp_path / "converted.tar.gz"
+
+    result = runner.invoke(app, ["convert-archive", str(source), str(destination), "--target", "gitlab", "-j", "2"])
+
+    assert result.exit_code == 0, result.output
+    assert "Converted 1 spec(s)" in result.output
+    with tarfile.open(destination) as archive:
+        assert archive.getnames() == ["team/plan.yml"]
+        assert "stages" in yaml.safe_load(archive.extractfile("team/plan.yml"))
+
+
+def test_sharded_tree_reports_merge_into_one_summary(tmp_path):
+    input_dir = tmp_path / "specs"
+    for index in range(6):
+        (input_dir / f"team-{index}").mkdir(parents=True)
+        _write_sample_spec(input_dir / f"team-{index}")
+    (input_dir / "broken.yml").write_text("plan: {name: Broken}\n", encoding="utf-8")
+
+    reports = []
+    for index in (1, 2, 3):
+        report = tmp_path / f"shard-{index}.json"
+        args = ["convert-tree", str(input_dir), str(tmp_path / "out"), "--executor", "thread"]
+        runner.invoke(app, [*args, "--shard", f"{index}/3", "--shard-by", "size", "--report", str(report)])
+        reports.append(str(report))
+
+    merged = tmp_path / "merged.json"
+    result = runner.invoke(app, ["merge-reports", *reports[:2], "-o", str(merged)])
+    assert "no report for shard(s) 3" in result.output
+
+    result = runner.invoke(app, ["merge-reports", *reports, "-o", str(merged)])
+    summary = json.loads(merged.read_text(encoding="utf-8"))
+    assert (summary["inputs"], summary["converted"], summary["failed"]) == (7, 6, 1)
+    assert summary["failures"][0]["path"] == "broken.yml"
+    assert not summary["duplicates"] and not summary["missing_shards"]
+    assert result.exit_code == 1
+    assert "Merged 3 report(s): 7 input(s)" in result.output
+
+
+def test_shard_option_is_validated(tmp_path):
+    result = runner.invoke(app, ["convert-tree", str(tmp_path), str(tmp_path / "out"), "--shard", "4/3"])
+    assert result.exit_code == 2
+    assert "between 1 and the shard count" in result.output
+
+
+def test_analyze_reports_schedules_as_json(tmp_path):
+    spec = _write_sample_spec(tmp_path)
+    durations = tmp_path / "durations.json"
+    durations.write_text(json.dumps({"build": 120, "test": [30, 60, 90]}), encoding="utf-8")
+
+    result = runner.invoke(app, ["analyze", str(spec), "--durations", str(durations), "--format", "json"])
+    assert result.exit_code == 0, result.output
+    analysis = json.loads(result.output)
+    assert analysis["runner_s"] == 180
+    assert analysis["critical_s"] == 120
+    assert [schedule["name"] for schedule in analysis["schedules"]] == ["source", "bitbucket", "github", "gitlab"]
+
+    result = runner.invoke(app, ["analyze", str(spec), "--target", "gitlab"])
+    assert "Critical path: 1m 00s" in result.output
+    assert "gitlab" in result.output
+
+
+def test_version_reports_yaml_backend():
+    result = runner.invoke(app, ["--version"])
+    assert result.exit_code == 0
+    assert "YAML backend:" in result.output
+
+
+def test_convert_all_targets_into_output_dir(tmp_path):
+    spec = _write_sample_spec(tmp_path)
+    out = tmp_path / "out"
+    result = runner.invoke(app, ["convert", str(spec), "--target", "all", "--output-dir", str(out)])
+    assert result.exit_code == 0, result.output
+
+    assert "pipelines" in yaml.safe_load((out / "bitbucket-pipelines.yml").read_text(encoding="utf-8"))
+    assert "stages" in yaml.safe_load((out / ".gitlab-ci.yml").read_text(encoding="utf-8"))
+    assert "jobs" in yaml.safe_load((out / ".github" / "workflows" / "pipeforge.yml").read_text(encoding="utf-8"))
+
+
+def test_convert_splits_gitlab_into_child_pipelines(tmp_path, monkeypatch):
+    monkeypatch.setenv("PIPEFORGE_CACHE_DIR", str(tmp_path / "cache"))
+    spec = _write_sample_spec(tmp_path)
+    durations = tmp_path / "durations.json"
+    durations.write_text(json.dumps({"build": 120, "test": [30, 50]}), encoding="utf-8")
+    out = tmp_path / "out"
+
+    result = runner.invoke(
+        app,
+        ["convert", str(spec), "-t", "gitlab", "-d", str(out), "--split", "2", "--split-by", "cost"]
+        + ["--durations", str(durations), "--validate"],
+    )
+
+    assert result.exit_code == 0, result.output
+    assert result.output.count("Wrote gitlab pipeline") == 3
+    parent = yaml.safe_load((out / ".gitlab-ci.yml").read_text(encoding="utf-8"))
+    assert [parent[job]["trigger"]["include"] for job in ("part_1", "part_2")] == [
+        ".gitlab/ci/part-1.yml",
+        ".gitlab/ci/part-2.yml",
+    ]
+    assert "build" in yaml.safe_load((out / ".gitlab" / "ci" / "part-1.yml").read_text(encoding="utf-8"))
+
+    result = runner.invoke(app, ["convert", str(spec), "-t", "gitlab", "--split", "2"])
+    assert result.exit_code == 2
+    assert "--output-dir" in result.output
+
+
+def test_convert_applies_per_job_path_filters(tmp_path):
+    spec = _write_sample_spec(tmp_path)
+    paths = tmp_path / "paths.yml"
+    paths.write_text("jobs:\n  test: [tests/**, src/**]\n", encoding="utf-8")
+
+    result = runner.invoke(app, ["convert", str(spec), "-t", "gitlab", "--paths", str(paths)])
+    assert result.exit_code == 0, result.output
+    output = yaml.safe_load(result.output)
+    assert output["test"]["rules"] == [{"changes": ["tests/**", "src/**"]}]
+    assert "rules" not in output["build"]
+
+    paths.write_text("test: {only: [src/**]}\n", encoding="utf-8")
+    result = runner.invoke(app, ["convert", str(spec), "-t", "gitlab", "--paths", str(paths)])
+    assert result.exit_code == 1
+    assert "unknown key(s): ['only']" in result.output
+
+
+def test_convert_several_targets_requires_output_dir(tmp_path):
+    spec = _write_sample_spec(tmp_path)
+    result = runner.invoke(app, ["convert", str(spec), "-t", "gitlab", "-t", "github"])
+    assert result.exit_code == 2
+    assert "--output-dir" in result.output
+
+
+def test_convert_bundle_writes_one_directory_per_document(tmp_path):
+    spec = _write_sample_spec(tmp_path)
+    bundle = tmp_path / "bundle.yml"
+    bundle.write_text(spec.read_text(encoding="utf-8") + "---\nplan: {name: Second}\njobs: [lint]\n", encoding="utf-8")
+    out = tmp_path / "out"
+
+    result = runner.invoke(app, ["convert-bundle", str(bundle), str(out), "--target", "gitlab"])
+
+    assert result.exit_code == 0, result.output
+    assert (out / "example-plan" / ".gitlab-ci.yml").exists()
+    assert (out / "second" / ".gitlab-ci.yml").exists()
@@ -0,0 +1,130 @@
+# SPDX-FileCopyrightText: 2025-present U.N. Owen <void@some.where>
+#
+# SPDX-License-Identifier: MIT
+
+import os
+import time
+
+from click.testing import CliRunner
+
+from pipeforge import __about__
+from pipeforge.cli import app
+from pipeforge.index import INDEX_FILENAME, FileStateIndex, write_if_changed
+
+SPEC = """
+plan:
+  name: {name}
+jobs:
+  - name: build
+    tasks:
+      - script: make
+"""
+
+runner = CliRunner()
+
+
+def _tree(tmp_path):
+    input_dir = tmp_path / "specs"
+    input_dir.mkdir()
+    for name in ("alpha", "beta"):
+        (input_dir / f"{name}.yml").write_text(SPEC.format(name=name), encoding="utf-8")
+    return input_dir, tmp_path / "out"
+
+
+def _settings(target="bitbucket"):
+    return {"source": "bamboo", "target": target, "pipeforge": __about__.__version__}
+
+
+def _convert(input_dir, output_dir):
+    args = ["convert-tree", str(input_dir), str(output_dir), "--executor", "thread", "--incremental"]
+    return runner.invoke(app, args)
+
+
+def test_incremental_run_skips_unchanged_inputs(tmp_path):
+    input_dir, output_dir = _tree(tmp_path)
+    assert "Converted 2 spec(s)" in _convert(input_dir, output_dir).output
+
+    # A touch without a content change is resolved by the content hash.
+    os.utime(input_dir / "alpha.yml", (time.time() + 5, time.time() + 5))
+    (input_dir / "beta.yml").write_text(SPEC.format(name="beta").replace("make", "make all"), encoding="utf-8")
+    result = _convert(input_dir, output_dir)
+
+    assert "Converted 1 spec(s)" in result.output
+    assert "Skipped 1 unchanged." in result.output
+    assert "make all" in (output_dir / "beta.yml").read_text(encoding="utf-8")
+    assert (output_dir / INDEX_FILENAME).exists()
+
+
+def test_incremental_run_removes_outputs_of_deleted_inputs(tmp_path):
+    input_dir, output_dir = _tree(tmp_path)
+    _convert(input_dir, output_dir)
+
+    (input_dir / "alpha.yml").unlink()
+    _convert(input_dir, output_dir)
+
+    assert not (output_dir / "alpha.yml").exists()
+    index = FileStateIndex.load(output_dir / INDEX_FILENAME, _settings())
+    assert set(index.entries) == {"beta.yml"}
+
+
+def test_failed_inputs_keep_failing_until_edited(tmp_path):
+    input_dir, output_dir = _tree(tmp_path)
+    broken = input_dir / "broken.yml"
+    broken.write_text("plan: {name: Broken}\n", encoding="utf-8")
+
+    first = _convert(input_dir, output_dir)
+    assert first.exit_code == 1
+    assert "1 failed" in first.output
+
+    second = _convert(input_dir, output_dir)
+    assert second.exit_code == 1
+    assert "Converted 0 spec(s)" in second.output
+    assert "1 failed. Skipped 2 unchanged." in second.output
+    assert "Failed broken.yml (unchanged)" in second.output
+    state = FileStateIndex.load(output_dir / INDEX_FILENAME, _settings()).entries["broken.yml"]
+    assert state.outputs == {}
+    assert state.error
+
+    broken.write_text(SPEC.format(name="fixed"), encoding="utf-8")
+    result = _convert(input_dir, output_dir)
+    assert result.exit_code == 0, result.output
+    assert "Converted 1 spec(s)" in result.output
+    assert (output_dir / "broken.yml").exists()
+
+
+def test_validate_invalidates_the_index(tmp_path):
+    input_dir, output_dir = _tree(tmp_path)
+    assert "Converted 2 spec(s)" in _convert(input_dir, output_dir).output
+
+    result = runner.invoke(
+        app,
+        ["convert-tree", str(input_dir), str(output_dir), "--executor", "thread", "--incremental", "--validate"],
+    )
+    assert result.exit_code == 0, result.output
+    assert "Converted 2 spec(s)" in result.output
+    assert "Skipped 0 unchanged." in result.output
+
+
+def test_write_if_changed_leaves_identical_files_alone(tmp_path):
+    destination = tmp_path / "out.yml"
+    assert write_if_changed(destination, "a: 1\n")
+    os.utime(destination, (0, 0))
+
+    assert not write_if_changed(destination, "a: 1\n")
+    assert destination.stat().st_mtime == 0
+    assert write_if_changed(destination, "a: 2\n")
+
+
+def test_watch_converts_then_stops_on_interrupt(tmp_path, monkeypatch):
+    input_dir, output_dir = _tree(tmp_path)
+
+    def _interrupt(seconds):
+        raise KeyboardInterrupt
+
+    monkeypatch.setattr(time, "sleep", _interrupt)
+    result = runner.invoke(app, ["watch", str(input_dir), str(output_dir), "--target", "gitlab"])
+
+    assert result.exit_code == 0, result.output
+    assert "Re-converted 2 spec(s)" in result.output
+    assert "Stopped watching." in result.output
+    assert (output_dir / "alpha.yml").exists()
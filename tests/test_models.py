@@ -0,0 +1,69 @@
+# SPDX-FileCopyrightText: 2025-present U.N. Owen <void@some.where>
+#
+# SPDX-License-Identifier: MIT
+
+import pickle
+
+import pytest
+
+from pipeforge.models import Job, PathFilter, Pipeline, Step, Trigger, freeze_env
+
+
+def test_models_are_slotted():
+    for instance in (Step(name="s"), Job(name="j"), Pipeline(name="p")):
+        assert not hasattr(instance, "__dict__")
+
+
+def test_equal_envs_are_shared_and_immutable():
+    first = Step(name="a", env={"JDK": "17"})
+    second = Job(name="b", env={"JDK": "17"})
+
+    assert first.env is second.env
+    assert first.env == {"JDK": "17"}
+    with pytest.raises(TypeError):
+        first.env["JDK"] = "21"
+
+
+def test_equal_envs_hash_alike_in_any_key_order():
+    first = freeze_env({"A": "1", "B": "2"})
+    second = freeze_env({"B": "2", "A": "1"})
+
+    assert first == second
+    assert hash(first) == hash(second)
+    assert len({first, second}) == 1
+
+
+def test_default_job_names_stay_unique():
+    pipeline = Pipeline(name="p", jobs=[Job(name="job-2"), Job(name=""), Job(name="job-2")])
+    pipeline.ensure_default_job_names()
+
+    assert [job.name for job in pipeline.jobs] == ["job-2", "job-2-2", "job-2-3"]
+
+
+def test_commands_are_interned():
+    command = "".join(["echo ", "TODO"])
+    steps = [Step(name="a", commands=[command]), Step(name="b", commands=["".join(["echo ", "TODO"])])]
+
+    assert steps[0].commands[0] is steps[1].commands[0]
+
+
+def test_pipeline_round_trips_through_pickle():
+    pipeline = Pipeline(
+        name="p",
+        jobs=[
+            Job(
+                name="build",
+                steps=[Step(name="s", commands=["make"], env={"A": "1"})],
+                image="img",
+                paths=PathFilter(["src/**"]),
+            )
+        ],
+        variables={"APP_ENV": "dev"},
+        triggers=[Trigger("schedule", "0 2 * * *")],
+        paths=PathFilter(exclude=["**/*.md"]),
+    )
+
+    restored = pickle.loads(pickle.dumps(pipeline))
+
+    assert restored == pipeline
+    assert restored.variables is freeze_env({"APP_ENV": "dev"})
@@ -0,0 +1,89 @@
+# SPDX-FileCopyrightText: 2025-present U.N. Owen <void@some.where>
+#
+# SPDX-License-Identifier: MIT
+
+from pipeforge import yamlio
+from pipeforge.analysis import analyze
+from pipeforge.models import Artifact, Job, Pipeline, Step
+from pipeforge.optimize import fold_matrix
+from pipeforge.renderers.bitbucket import BitbucketRenderer
+from pipeforge.renderers.github import GitHubActionsRenderer
+from pipeforge.renderers.gitlab import GitLabRenderer
+
+
+def _pipeline(versions=("11", "17", "21")):
+    jobs = [Job(name="build", stage="build", steps=[Step("package", ["mvn package"])])]
+    jobs += [
+        Job(name=f"test jdk{version}", stage="test", env={"JDK": version, "CI": "1"}, steps=[Step("test", ["mvn test"])])
+        for version in versions
+    ]
+    jobs.append(Job(name="deploy", stage="deploy", steps=[Step("deploy", ["./deploy"])]))
+    pipeline = Pipeline(name="Matrix", jobs=jobs, stages=["build", "test", "deploy"])
+    pipeline.chain_stages()
+    return pipeline
+
+
+def test_fold_matrix_collapses_jobs_that_differ_in_env_values():
+    pipeline = _pipeline()
+    stats = fold_matrix(pipeline)
+
+    assert (stats.jobs, stats.matrices) == (3, 1)
+    assert [job.name for job in pipeline.jobs] == ["build", "test", "deploy"]
+    matrix_job = pipeline.jobs[1]
+    assert dict(matrix_job.env) == {"CI": "1"}
+    assert [dict(entry) for entry in matrix_job.matrix] == [{"JDK": "11"}, {"JDK": "17"}, {"JDK": "21"}]
+    assert pipeline.jobs[2].needs == ("test",)
+    assert [variant["JDK"] for variant in matrix_job.variants()] == ["11", "17", "21"]
+
+
+def test_fold_matrix_leaves_partly_needed_and_publishing_jobs_alone():
+    pipeline = _pipeline()
+    pipeline.jobs[-1].needs = ("test jdk11",)
+    assert fold_matrix(pipeline).matrices == 0
+
+    pipeline = _pipeline()
+    for job in pipeline.jobs[1:4]:
+        job.artifacts = (Artifact(job.name, "report.xml"),)
+    assert fold_matrix(pipeline).matrices == 0
+    assert len(pipeline.jobs) == 5
+
+
+def test_renderers_emit_native_matrices():
+    pipeline = _pipeline()
+    fold_matrix(pipeline)
+
+    github = yamlio.load(GitHubActionsRenderer().render(pipeline))["jobs"]["test"]
+    assert github["strategy"] == {"matrix": {"JDK": ["11", "17", "21"]}}
+    assert github["env"] == {"CI": "1", "JDK": "${{ matrix.JDK }}"}
+
+    gitlab = yamlio.load(GitLabRenderer().render(pipeline))["test"]
+    assert gitlab["parallel"] == {"matrix": [{"JDK": ["11", "17", "21"]}]}
+    assert gitlab["variables"] == {"CI": "1"}
+
+    # Bitbucket has no matrix builds, so the variants come back as steps.
+    levels = yamlio.load(BitbucketRenderer().render(pipeline))["pipelines"]["default"]
+    names = [entry["step"]["name"] for entry in levels[1]["parallel"]]
+    assert names == ["test (11)", "test (17)", "test (21)"]
+
+
+def test_matrix_that_is_not_a_full_product_lists_its_entries():
+    pipeline = Pipeline(
+        name="Pairs",
+        jobs=[
+            Job(name=f"test {jdk}", env={"JDK": jdk, "OS": os}, steps=[Step("test", ["make"])])
+            for jdk, os in (("11", "linux"), ("17", "mac"))
+        ],
+    )
+    fold_matrix(pipeline)
+
+    github = yamlio.load(GitHubActionsRenderer().render(pipeline))["jobs"]["test"]
+    assert github["strategy"]["matrix"] == {"include": [{"JDK": "11", "OS": "linux"}, {"JDK": "17", "OS": "mac"}]}
+
+
+def test_analysis_counts_every_matrix_run():
+    pipeline = _pipeline()
+    fold_matrix(pipeline)
+    analysis = analyze(pipeline, {}, default=10)
+
+    assert analysis.runner_s == 50
+    assert analysis.max_width == 3
@@ -0,0 +1,58 @@
+# SPDX-FileCopyrightText: 2025-present U.N. Owen <void@some.where>
+#
+# SPDX-License-Identifier: MIT
+
+from pipeforge.models import Artifact, Job, Pipeline, Step, Subscription
+from pipeforge.partition import job_weights, partition_jobs, split_pipeline
+
+
+def _pipeline(tests=6):
+    jobs = [Job(name="build", stage="build", steps=[Step("make", ["make"])], artifacts=(Artifact("dist", "dist/*"),))]
+    jobs += [Job(name=f"test {index}", stage="test", steps=[Step("test", ["make test"])]) for index in range(tests)]
+    jobs.append(Job(name="deploy", stage="deploy", steps=[Step("deploy", ["./deploy"])]))
+    pipeline = Pipeline(name="Wide", jobs=jobs, stages=["build", "test", "deploy"])
+    pipeline.chain_stages()
+    return pipeline
+
+
+def _names(groups):
+    return [[job.name for job in group] for group in groups]
+
+
+def test_wide_levels_are_spread_over_parts_that_run_side_by_side():
+    parts = split_pipeline(_pipeline(), 4)
+
+    assert _names(part.pipeline.jobs for part in parts) == [
+        ["build"],
+        ["test 0", "test 2", "test 4"],
+        ["test 1", "test 3", "test 5"],
+        ["deploy"],
+    ]
+    assert [part.needs for part in parts] == [(), (0,), (0,), (1, 2)]
+    # Needs on other parts move to the part; the rest stay on the jobs.
+    assert all(job.needs == () for part in parts for job in part.pipeline.jobs)
+    assert parts[1].pipeline.name == "Wide (2/4)"
+
+
+def test_artifact_subscribers_stay_with_their_producer():
+    pipeline = _pipeline()
+    pipeline.jobs[1].subscriptions = (Subscription("dist"),)
+    assert _names(partition_jobs(pipeline, 3)) == [
+        ["build", "test 0"],
+        ["test 1", "test 2", "test 3", "test 4", "test 5"],
+        ["deploy"],
+    ]
+
+    # Subscribing across the test stage pulls every job in between along.
+    pipeline = _pipeline()
+    pipeline.jobs[-1].subscriptions = (Subscription("dist"),)
+    assert len(partition_jobs(pipeline, 3)) == 1
+
+
+def test_cost_weights_balance_parts():
+    pipeline = _pipeline(tests=4)
+    weights = job_weights(pipeline, {"test 0": 300.0}, default=10.0)
+    groups = partition_jobs(pipeline, 4, weights)
+
+    assert ["test 0"] in _names(groups)
+    assert ["test 1", "test 2", "test 3"] in _names(groups)
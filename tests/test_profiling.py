@@ -0,0 +1,66 @@
+# SPDX-FileCopyrightText: 2025-present U.N. Owen <void@some.where>
+#
+# SPDX-License-Identifier: MIT
+
+import json
+
+from click.testing import CliRunner
+
+from pipeforge import PipelineTranspiler
+from pipeforge.cli import app
+from pipeforge.profiling import Profiler
+
+SPEC = """
+plan:
+  name: Profiled Plan
+jobs:
+  - name: build
+    tasks:
+      - script: make
+      - script: make test
+"""
+
+
+def test_profiler_records_every_phase_with_counts(tmp_path):
+    spec = tmp_path / "bamboo.yml"
+    spec.write_text(SPEC, encoding="utf-8")
+    profiler = Profiler()
+
+    PipelineTranspiler(profiler=profiler).convert_targets(spec, targets=["gitlab", "github"])
+
+    summary = {total.phase: total for total in profiler.summary()}
+    assert list(summary) == ["read", "load", "parse", "render", "dump"]
+    assert summary["read"].counts["bytes"] == len(SPEC.encode("utf-8"))
+    assert summary["parse"].counts == {"jobs": 1, "steps": 2, "commands": 2}
+    assert summary["render"].calls == summary["dump"].calls == 2
+
+
+def test_process_pool_phases_are_merged(tmp_path):
+    paths = []
+    for index in range(2):
+        path = tmp_path / f"spec-{index}.yml"
+        path.write_text(SPEC, encoding="utf-8")
+        paths.append(path)
+    profiler = Profiler()
+
+    results = list(PipelineTranspiler(profiler=profiler).convert_many(paths, executor="process", max_workers=2))
+
+    assert all(result.ok for result in results)
+    assert {total.phase: total.calls for total in profiler.summary()}["parse"] == 2
+
+
+def test_cli_profile_and_trace_file(tmp_path):
+    spec = tmp_path / "bamboo.yml"
+    spec.write_text(SPEC, encoding="utf-8")
+    trace = tmp_path / "trace.json"
+
+    result = CliRunner().invoke(
+        app,
+        ["convert", str(spec), "-t", "gitlab", "-o", str(tmp_path / "out.yml"), "--profile", "--trace-file", str(trace)],
+    )
+
+    assert result.exit_code == 0, result.output
+    assert "parse" in result.output and "commands=2" in result.output
+    events = json.loads(trace.read_text(encoding="utf-8"))["traceEvents"]
+    assert [event["name"] for event in events] == ["read", "load", "parse", "render", "dump"]
+    assert all(event["ph"] == "X" and event["dur"] >= 0 for event in events)
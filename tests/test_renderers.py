@@ -0,0 +1,180 @@
+# SPDX-FileCopyrightText: 2025-present U.N. Owen <void@some.where>
+#
+# SPDX-License-Identifier: MIT
+
+import io
+
+import pytest
+
+from pipeforge import PipelineTranspiler, yamlio
+from pipeforge.errors import InvalidPipelineSpecError
+from pipeforge.models import Job, Pipeline, Step
+from pipeforge.renderers.base import BaseRenderer
+from pipeforge.renderers.bitbucket import BitbucketRenderer
+from pipeforge.renderers.github import GitHubActionsRenderer
+from pipeforge.renderers.gitlab import GitLabRenderer
+
+
+def _pipeline(jobs=3):
+    return Pipeline(
+        name="Shared",
+        variables={"APP_ENV": "dev", "REGION": "eu"},
+        jobs=[
+            Job(name=f"job {index}", env={"TIER": "web"}, steps=[Step(name="run", commands=[f"make {index}"])])
+            for index in range(jobs)
+        ],
+    )
+
+
+def test_gitlab_hoists_plan_variables_and_anchors_job_env():
+    rendered = GitLabRenderer().render(_pipeline())
+
+    assert "export" not in rendered
+    assert rendered.count("APP_ENV") == 1
+    assert rendered.count("TIER") == 1
+    document = yamlio.load(rendered)
+    assert document["variables"] == {"APP_ENV": "dev", "REGION": "eu"}
+    assert all(document[f"job_{index}"]["variables"] == {"TIER": "web"} for index in range(3))
+
+
+def test_bitbucket_anchors_repeated_exports():
+    rendered = BitbucketRenderer().render(_pipeline())
+
+    assert rendered.count('export APP_ENV="dev"') == 1
+    # Jobs without needs form a single parallel group.
+    steps = yamlio.load(rendered)["pipelines"]["default"][0]["parallel"]
+    for index, entry in enumerate(steps):
+        script = entry["step"]["script"]
+        assert script[0] == 'export APP_ENV="dev"\nexport REGION="eu"'
+        assert script[1:] == ['export TIER="web"', f"make {index}"]
+
+
+def test_single_job_keeps_inline_exports():
+    rendered = BitbucketRenderer().render(_pipeline(jobs=1))
+
+    assert "&" not in rendered
+    assert '- export APP_ENV="dev"' in rendered
+
+
+def _staged_pipeline():
+    return Pipeline(
+        name="Staged",
+        stages=["Build", "Test", "Deploy"],
+        jobs=[
+            Job(name="compile", stage="Build"),
+            Job(name="lint", stage="Build"),
+            Job(name="unit", stage="Test", needs=("compile", "lint")),
+            Job(name="docs", stage="Test", needs=("lint",)),
+            Job(name="ship", stage="Deploy", needs=("unit",)),
+        ],
+    )
+
+
+def test_job_levels_follow_needs():
+    levels = _staged_pipeline().job_levels()
+
+    assert [[job.name for job in level] for level in levels] == [["compile", "lint"], ["unit", "docs"], ["ship"]]
+
+
+def test_gitlab_emits_needs_only_where_they_start_jobs_sooner():
+    document = yamlio.load(GitLabRenderer().render(_staged_pipeline()))
+
+    assert document["stages"] == ["Build", "Test", "Deploy"]
+    assert "needs" not in document["unit"]
+    assert document["docs"]["needs"] == ["lint"]
+    assert document["ship"] == {"stage": "Deploy", "needs": ["unit"], "script": ["echo TODO: add commands"]}
+
+
+@pytest.mark.parametrize("renderer", [BitbucketRenderer(), GitLabRenderer(), GitHubActionsRenderer()])
+def test_render_to_streams_the_same_document(renderer):
+    pipeline = PipelineTranspiler().parsers.get("bamboo").parse(yamlio.load(ARTIFACT_SPEC))
+    stream = io.StringIO()
+    renderer.render_to(pipeline, stream)
+
+    assert stream.getvalue() == renderer.render(pipeline)
+    assert yamlio.load(stream.getvalue()) == renderer.build_document(pipeline)
+
+
+def test_bitbucket_groups_levels_and_github_uses_needs():
+    pipeline = _staged_pipeline()
+    default = yamlio.load(BitbucketRenderer().render(pipeline))["pipelines"]["default"]
+    jobs = yamlio.load(GitHubActionsRenderer().render(pipeline))["jobs"]
+
+    assert [step["step"]["name"] for step in default[0]["parallel"]] == ["compile", "lint"]
+    assert default[2]["step"]["name"] == "ship"
+    assert "needs" not in jobs["compile"]
+    assert jobs["unit"]["needs"] == ["compile", "lint"]
+
+
+ARTIFACT_SPEC = """
+stages:
+  - Build:
+      jobs:
+        - name: compile
+          artifacts: [{name: Jar, location: target, pattern: "*.jar"}]
+        - name: docs
+          artifacts: [{name: Site, location: site, pattern: "**"}]
+  - Test:
+      jobs:
+        - name: unit
+          artifact-subscriptions: [{artifact: Jar}]
+        - name: lint
+"""
+
+
+def test_jobs_download_only_subscribed_artifacts():
+    outputs = PipelineTranspiler().convert_content(ARTIFACT_SPEC, targets=["all"])
+
+    gitlab = yamlio.load(outputs["gitlab"])
+    assert gitlab["compile"]["artifacts"] == {"paths": ["target/*.jar"]}
+    assert gitlab["unit"]["dependencies"] == ["compile"]
+    assert gitlab["lint"]["dependencies"] == []
+
+    test_level = yamlio.load(outputs["bitbucket"])["pipelines"]["default"][1]["parallel"]
+    assert "artifacts" not in test_level[0]["step"]
+    assert test_level[1]["step"]["artifacts"] == {"download": False}
+
+    jobs = yamlio.load(outputs["github"])["jobs"]
+    assert jobs["compile"]["steps"][-1]["with"] == {"name": "Jar", "path": "target/*.jar"}
+    assert jobs["unit"]["steps"][1]["with"] == {"name": "Jar", "path": "target"}
+    assert not any("download-artifact" in step.get("uses", "") for step in jobs["lint"]["steps"])
+
+
+def test_subscription_must_come_from_an_earlier_stage():
+    spec = ARTIFACT_SPEC.replace("artifact-subscriptions: [{artifact: Jar}]", "artifact-subscriptions: [Missing]")
+
+    with pytest.raises(InvalidPipelineSpecError, match="unknown artifact 'Missing'"):
+        PipelineTranspiler().convert_content(spec)
+
+
+def test_gitlab_split_triggers_child_pipelines():
+    pipeline = Pipeline(
+        name="Wide",
+        variables={"APP_ENV": "dev"},
+        stages=["build", "test"],
+        jobs=[Job(name="build", stage="build", steps=[Step("make", ["make"])])]
+        + [Job(name=f"test {index}", stage="test", steps=[Step("test", ["make test"])]) for index in range(4)],
+    )
+    pipeline.chain_stages()
+
+    assert list(GitLabRenderer().render_files(pipeline)) == [".gitlab-ci.yml"]
+    files = GitLabRenderer(split=3).render_files(pipeline)
+
+    assert list(files) == [".gitlab-ci.yml", ".gitlab/ci/part-1.yml", ".gitlab/ci/part-2.yml", ".gitlab/ci/part-3.yml"]
+    parent = yamlio.load(files[".gitlab-ci.yml"])
+    assert parent["part_2"] == {
+        "stage": "stage-2",
+        "trigger": {"include": ".gitlab/ci/part-2.yml", "strategy": "depend"},
+    }
+    assert parent["stages"] == ["stage-1", "stage-2"]
+    child = yamlio.load(files[".gitlab/ci/part-3.yml"])
+    assert child["variables"] == {"APP_ENV": "dev"}
+    assert sorted(child) == ["stages", "test_1", "test_3", "variables"]
+
+
+def test_renderers_must_implement_a_document_hook():
+    with pytest.raises(TypeError, match="Renderer Incomplete must implement stream_document"):
+
+        class Incomplete(BaseRenderer):
+            slug = "incomplete"
+            description = "Renders nothing"
@@ -0,0 +1,140 @@
+# SPDX-FileCopyrightText: 2025-present U.N. Owen <void@some.where>
+#
+# SPDX-License-Identifier: MIT
+
+import http.client
+import json
+import socket
+import threading
+import urllib.error
+import urllib.request
+
+import pytest
+
+from pipeforge import PipelineTranspiler
+from pipeforge.server import create_server
+
+SPEC = """
+plan:
+  name: Served Plan
+jobs:
+  - name: build
+    tasks:
+      - script: make
+"""
+
+
+@pytest.fixture
+def server():
+    yield from _serve()
+
+
+@pytest.fixture
+def small_server():
+    yield from _serve(max_body=16)
+
+
+def _serve(**options):
+    server = create_server(PipelineTranspiler(), port=0, workers=2, backlog=0, **options)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _url(server, path):
+    host, port = server.server_address[:2]
+    return f"http://{host}:{port}{path}"
+
+
+def _post(server, payload):
+    request = urllib.request.Request(
+        _url(server, "/convert"),
+        data=json.dumps(payload).encode("utf-8"),
+        headers={"Content-Type": "application/json"},
+    )
+    try:
+        with urllib.request.urlopen(request, timeout=10) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as exc:
+        return exc.code, json.loads(exc.read())
+
+
+def test_convert_matches_transpiler_and_records_metrics(server, tmp_path):
+    spec = tmp_path / "bamboo.yml"
+    spec.write_text(SPEC, encoding="utf-8")
+    expected = PipelineTranspiler().convert_targets(spec, targets=["gitlab", "github"])
+
+    status, body = _post(server, {"content": SPEC, "targets": ["gitlab", "github"]})
+    assert status == 200
+    assert body["outputs"] == expected
+
+    status, body = _post(server, {"content": "jobs: [", "target": "gitlab"})
+    assert status == 422
+    assert "error" in body
+
+    with urllib.request.urlopen(_url(server, "/metrics"), timeout=10) as response:
+        metrics = json.loads(response.read())
+    assert metrics["conversions"] == 2
+    assert metrics["errors"] == 1
+    assert metrics["latency_ms"]["p50"] is not None
+
+
+@pytest.mark.parametrize(
+    ("fields", "message"),
+    [
+        ({"targets": [["gitlab"]]}, "'targets' must be a string or a list of strings."),
+        ({"targets": {"gitlab": True}}, "'targets' must be a string or a list of strings."),
+        ({"target": 3}, "'target' must be a string or null."),
+        ({"source": ["bamboo"]}, "'source' must be a string or null."),
+        ({"name": {"x": 1}}, "'name' must be a string or null."),
+    ],
+)
+def test_malformed_fields_are_rejected_with_400(server, fields, message):
+    status, body = _post(server, {"content": SPEC, **fields})
+    assert (status, body) == (400, {"error": message})
+
+
+def test_negative_content_length_is_rejected(server):
+    host, port = server.server_address[:2]
+    with socket.create_connection((host, port), timeout=10) as connection:
+        connection.sendall(b"POST /convert HTTP/1.1\r\nHost: x\r\nContent-Length: -1\r\n\r\n")
+        response = connection.makefile("rb").read()
+    assert response.startswith(b"HTTP/1.1 400")
+    assert b"must not be negative" in response
+
+
+def test_unread_bodies_are_not_parsed_as_requests(small_server):
+    host, port = small_server.server_address[:2]
+    connection = http.client.HTTPConnection(host, port, timeout=10)
+    try:
+        # The oversized body is itself a valid request; it must never run.
+        connection.request("POST", "/convert", body=b"GET /healthz HTTP/1.1\r\nHost: x\r\n\r\n")
+        response = connection.getresponse()
+        response.read()
+        assert response.status == 413
+        assert response.getheader("Connection") == "close"
+
+        connection.request("GET", "/metrics")
+        response = connection.getresponse()
+        assert response.status == 200
+        # Only the 413 has finished; a smuggled /healthz would make it two.
+        assert json.loads(response.read())["requests"] == 1
+    finally:
+        connection.close()
+
+
+def test_full_pool_rejects_with_503(server):
+    # Hold every slot so the next connection overflows the pool.
+    while server._slots.acquire(blocking=False):
+        pass
+    try:
+        with pytest.raises(urllib.error.HTTPError) as excinfo:
+            urllib.request.urlopen(_url(server, "/healthz"), timeout=10)
+    finally:
+        server._slots.release()
+        server._slots.release()
+    assert excinfo.value.code == 503
+    assert excinfo.value.headers["Retry-After"] == "1"
+    assert server.metrics.snapshot()["rejected"] == 1
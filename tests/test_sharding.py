@@ -0,0 +1,44 @@
+# SPDX-FileCopyrightText: 2025-present U.N. Owen <void@some.where>
+#
+# SPDX-License-Identifier: MIT
+
+import random
+
+import pytest
+
+from pipeforge.sharding import Shard, assign, select, shard_of
+
+
+def _items(count, start=0):
+    return [(f"team-{index % 7}/spec-{index}.yml", 0) for index in range(start, start + count)]
+
+
+def test_shard_parse_validates_bounds():
+    assert Shard.parse(" 2/8 ") == Shard(2, 8)
+    for text in ("0/4", "5/4", "1/0", "two/4"):
+        with pytest.raises(ValueError):
+            Shard.parse(text)
+
+
+def test_hash_shards_are_disjoint_complete_and_stable():
+    items = _items(500)
+    chosen = [set(select(items, Shard(index, 4))) for index in range(1, 5)]
+    assert sorted(position for shard in chosen for position in shard) == list(range(500))
+
+    grown = items + _items(100, start=500)
+    assert assign(grown, 4)[:500] == assign(items, 4)
+    assert assign(items, 4) == [shard_of(key, 4) for key, _ in items]
+
+
+def test_size_shards_balance_bytes_and_mostly_keep_assignments():
+    rng = random.Random(4)
+    items = [(f"spec-{index}.yml", int(rng.lognormvariate(8, 1.5))) for index in range(3000)]
+    fair = sum(size for _, size in items) / 8
+
+    shards = assign(items, 8, by="size")
+    loads = [sum(size for (_, size), owner in zip(items, shards) if owner == shard) for shard in range(8)]
+    assert max(loads) <= 1.1 * fair
+
+    grown = assign(items + [(f"new-{index}.yml", 3000) for index in range(30)], 8, by="size")
+    moved = sum(before != after for before, after in zip(shards, grown))
+    assert moved < len(items) * 0.02
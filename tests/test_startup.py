@@ -0,0 +1,50 @@
+# SPDX-FileCopyrightText: 2025-present U.N. Owen <void@some.where>
+#
+# SPDX-License-Identifier: MIT
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pipeforge
+
+HEAVY_MODULES = {
+    "yaml",
+    "concurrent.futures",
+    "pipeforge.transpiler",
+    "pipeforge.parsers.bamboo",
+    "pipeforge.renderers.bitbucket",
+    "pipeforge.renderers.github",
+    "pipeforge.renderers.gitlab",
+}
+
+
+def _imported_modules(code: str) -> set:
+    """Runs ``code`` under ``python -X importtime`` and returns the imported module names."""
+    env = dict(os.environ)
+    src = str(Path(pipeforge.__file__).resolve().parent.parent)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [src, env.get("PYTHONPATH")]))
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True,
+    )
+    modules = set()
+    for line in completed.stderr.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            modules.add(line.rsplit("|", 1)[1].strip())
+    return modules
+
+
+def test_cli_import_stays_lightweight():
+    imported = _imported_modules("import pipeforge.cli")
+    assert not HEAVY_MODULES & imported
+
+
+def test_list_does_not_import_providers():
+    imported = _imported_modules("from pipeforge.cli import app; app(['list'], standalone_mode=False)")
+    assert not HEAVY_MODULES & imported
+    assert "pipeforge.parsers.registry" in imported
@@ -0,0 +1,254 @@
+# SPDX-FileCopyrightText: 2025-present U.N. Owen <void@some.where>
+#
+# SPDX-License-Identifier: MIT
+
+import asyncio
+import tarfile
+import zipfile
+from pathlib import Path
+
+import pytest
+
+from pipeforge import PipelineTranspiler, yamlio
+
+SAMPLE_SPEC = """
+plan:
+  name: {name}
+jobs:
+  - name: build
+    tasks:
+      - script: echo "build"
+"""
+
+
+def _write_specs(tmp_path: Path, count: int) -> list:
+    paths = []
+    for index in range(count):
+        path = tmp_path / f"spec-{index}.yml"
+        path.write_text(SAMPLE_SPEC.format(name=f"Plan {index}"), encoding="utf-8")
+        paths.append(path)
+    return paths
+
+
+def test_convert_many_preserves_input_order(tmp_path):
+    paths = _write_specs(tmp_path, 5)
+    results = list(PipelineTranspiler().convert_many(paths, target="github", max_workers=3))
+
+    assert [result.input_path for result in results] == paths
+    assert all(result.ok for result in results)
+    assert "Plan 3" in results[3].rendered
+
+
+def test_convert_many_isolates_failures(tmp_path):
+    paths = _write_specs(tmp_path, 2)
+    missing = tmp_path / "missing.yml"
+    results = list(PipelineTranspiler().convert_many([paths[0], missing, paths[1]], ordered=False))
+
+    failed = [result for result in results if not result.ok]
+    assert len(results) == 3
+    assert [result.input_path for result in failed] == [missing]
+    assert "Failed to read" in str(failed[0].error)
+
+
+def test_convert_many_with_process_pool(tmp_path):
+    paths = _write_specs(tmp_path, 2)
+    results = list(PipelineTranspiler().convert_many(paths, executor="process", max_workers=2))
+
+    assert all(result.ok for result in results)
+
+
+@pytest.mark.parametrize("executor", [None, "thread"])
+def test_convert_archive_streams_members_in_order(tmp_path, executor):
+    archive = tmp_path / "export.tar.gz"
+    with tarfile.open(archive, "w:gz") as handle:
+        for path in _write_specs(tmp_path, 3):
+            handle.add(path, arcname=f"plans/{path.name}")
+        handle.add(tmp_path / "spec-0.yml", arcname="../escape.yml")
+
+    results = list(PipelineTranspiler().convert_archive(archive, target="github", executor=executor, max_workers=2))
+
+    assert [result.input_path.as_posix() for result in results] == [
+        "plans/spec-0.yml",
+        "plans/spec-1.yml",
+        "plans/spec-2.yml",
+        "../escape.yml",
+    ]
+    assert all(result.ok for result in results[:3])
+    assert "Plan 2" in results[2].rendered
+    assert "leaves the archive root" in str(results[3].error)
+
+
+def test_convert_archive_only_reads_matching_members(tmp_path):
+    archive = tmp_path / "export.zip"
+    with zipfile.ZipFile(archive, "w") as handle:
+        handle.writestr("plans/a.yml", SAMPLE_SPEC.format(name="A"))
+        handle.writestr("plans/readme.txt", "not a spec")
+
+    results = list(PipelineTranspiler().convert_archive(archive))
+
+    assert [result.input_path.name for result in results] == ["a.yml"]
+
+
+def test_aconvert_many_limits_and_orders_results(tmp_path):
+    paths = _write_specs(tmp_path, 6)
+    transpiler = PipelineTranspiler()
+
+    async def convert():
+        single = await transpiler.aconvert_path(paths[0], target="github")
+        results = [result async for result in transpiler.aconvert_many(paths, target="github", ordered=True, limit=2)]
+        return single, results
+
+    single, results = asyncio.run(convert())
+
+    assert "Plan 0" in single
+    assert [result.input_path for result in results] == paths
+    assert all(result.ok for result in results)
+
+
+def test_aconvert_many_cancels_pending_conversions_when_closed(tmp_path, monkeypatch):
+    from concurrent.futures import ThreadPoolExecutor
+
+    from pipeforge.parsers.bamboo import BambooSpecParser
+
+    parsed = []
+    parse = BambooSpecParser.parse
+
+    def counting_parse(self, *args, **kwargs):
+        parsed.append(1)
+        return parse(self, *args, **kwargs)
+
+    monkeypatch.setattr(BambooSpecParser, "parse", counting_parse)
+    paths = _write_specs(tmp_path, 20)
+    pool = ThreadPoolExecutor(max_workers=1)
+
+    async def first():
+        results = PipelineTranspiler().aconvert_many(paths, executor=pool, limit=2)
+        result = await results.__anext__()
+        await results.aclose()
+        return result
+
+    assert asyncio.run(first()).ok
+    pool.shutdown(wait=True)
+    assert len(parsed) <= 3
+
+
+def test_convert_targets_parses_once(tmp_path, monkeypatch):
+    path = _write_specs(tmp_path, 1)[0]
+    transpiler = PipelineTranspiler()
+    parser = transpiler.parsers.get("bamboo")
+    calls = []
+    original = parser.parse
+
+    def _counting_parse(raw, **kwargs):
+        calls.append(raw)
+        return original(raw, **kwargs)
+
+    monkeypatch.setattr(parser, "parse", _counting_parse)
+    outputs = transpiler.convert_targets(path, targets=["all"])
+
+    assert list(outputs) == transpiler.available_targets()
+    assert len(calls) == 1
+
+
+def test_convert_documents_streams_each_plan(tmp_path):
+    bundle = tmp_path / "bundle.yml"
+    bundle.write_text(
+        SAMPLE_SPEC.format(name="First")
+        + "---\n"
+        + "plan: {name: Broken}\n"
+        + "---\n"
+        + "jobs: [lint]\n"
+        + "---\n"
+        + SAMPLE_SPEC.format(name="First"),
+        encoding="utf-8",
+    )
+
+    results = list(PipelineTranspiler().convert_documents(bundle, targets=["gitlab"]))
+
+    assert [result.index for result in results] == [1, 2, 3, 4]
+    assert [result.name for result in results] == ["first", "document-2", "document-3", "first-4"]
+    assert results[1].error.document == 2
+    assert "gitlab" in results[0].outputs
+
+
+def test_registries_load_providers_on_demand():
+    from pipeforge.renderers import RendererRegistry
+
+    registry = RendererRegistry(lazy={"custom": "pipeforge.renderers.gitlab:GitLabRenderer"})
+
+    assert registry.slugs() == ["custom"]
+    assert registry._lazy
+    assert registry.get("custom").slug == "gitlab"
+    assert not registry._lazy
+
+
+def test_broken_plugins_raise_not_found_errors():
+    from pipeforge.errors import ParserNotFoundError, RendererNotFoundError
+    from pipeforge.parsers import ParserRegistry
+    from pipeforge.renderers import RendererRegistry
+
+    renderers = RendererRegistry(lazy={"broken": "pipeforge.renderers.gitlab:NoSuchRenderer"})
+    with pytest.raises(RendererNotFoundError, match="'broken' from pipeforge.renderers.gitlab:NoSuchRenderer"):
+        renderers.get("broken")
+
+    parsers = ParserRegistry(lazy={"missing": "pipeforge_no_such_plugin:Parser"})
+    with pytest.raises(ParserNotFoundError, match="'missing' from pipeforge_no_such_plugin:Parser"):
+        parsers.get("missing")
+
+
+def test_entry_point_plugins_are_listed_without_loading(monkeypatch):
+    from pipeforge import plugins
+    from pipeforge.parsers import default_parser_registry
+
+    class _EntryPoint:
+        name = "thirdparty"
+        loaded = False
+
+        def load(self):
+            _EntryPoint.loaded = True
+            return plugins.load("pipeforge.parsers.bamboo:BambooSpecParser")
+
+    monkeypatch.setattr(plugins, "entry_points", lambda group: [_EntryPoint()])
+    registry = default_parser_registry()
+
+    assert registry.slugs() == ["bamboo", "thirdparty"]
+    assert not _EntryPoint.loaded
+    assert registry.get("thirdparty").slug == "bamboo"
+    assert _EntryPoint.loaded
+
+
+def test_bamboo_stages_become_a_dependency_chain():
+    spec = """
+stages:
+  - Build:
+      jobs: [{name: compile}, {name: lint}]
+  - Test:
+      jobs: [{name: unit}]
+"""
+    outputs = PipelineTranspiler().convert_content(spec, targets=["gitlab", "bitbucket"])
+
+    gitlab = yamlio.load(outputs["gitlab"])
+    assert gitlab["stages"] == ["Build", "Test"]
+    assert "needs" not in gitlab["unit"]
+    default = yamlio.load(outputs["bitbucket"])["pipelines"]["default"]
+    assert len(default[0]["parallel"]) == 2
+    assert default[1]["step"]["name"] == "unit"
+
+
+def test_aliased_bamboo_tasks_share_steps_and_render_as_anchors():
+    spec = """
+x-tasks: &tasks
+  - script: [make build]
+  - script: [make test]
+jobs:
+  - {name: linux, tasks: *tasks}
+  - {name: mac, tasks: *tasks}
+"""
+    transpiler = PipelineTranspiler()
+    pipeline = transpiler.parsers.get("bamboo").parse(yamlio.load(spec))
+
+    linux, mac = pipeline.jobs
+    assert all(left is right for left, right in zip(linux.steps, mac.steps))
+    rendered = transpiler.convert_content(spec, targets=["gitlab"])["gitlab"]
+    assert rendered.count("make test") == 1
+    assert yamlio.load(rendered)["mac"]["script"] == ["make build", "make test"]
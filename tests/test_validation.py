@@ -0,0 +1,107 @@
+# SPDX-FileCopyrightText: 2025-present U.N. Owen <void@some.where>
+#
+# SPDX-License-Identifier: MIT
+
+import pickle
+from pathlib import Path
+
+import pytest
+
+from pipeforge import PipelineTranspiler, validation, yamlio
+from pipeforge.errors import OutputValidationError
+from pipeforge.renderers import default_renderer_registry
+from pipeforge.renderers.gitlab import GitLabRenderer
+
+SPEC = """
+plan:
+  name: Checked
+jobs:
+  - name: build
+    tasks:
+      - script: make
+  - name: test
+    tasks:
+      - script: make test
+"""
+
+
+@pytest.fixture(autouse=True)
+def _cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv("PIPEFORGE_CACHE_DIR", str(tmp_path / "cache"))
+
+
+class _BrokenGitLabRenderer(GitLabRenderer):
+    def stream_document(self, pipeline):
+        document = yamlio.materialize(super().stream_document(pipeline))
+        document["test"]["when"] = "sometimes"
+        return document
+
+
+def test_issues_name_the_offending_job():
+    gitlab = validation.validate_text("gitlab", "stages: [build]\nbuild:\n  stage: 3\n  scriptt: [make]\n")
+    assert {(issue.job, issue.path, issue.message) for issue in gitlab} == {
+        ("build", "build", "missing required property 'script' or 'trigger' or 'extends' or 'run'"),
+        ("build", "build.stage", "expected string, got integer"),
+        ("build", "build.scriptt", "unknown property 'scriptt'"),
+    }
+
+    # A bare ``on:`` key loads as ``True`` and must still count as ``on``.
+    github = validation.validate_text("github", "on: push\njobs:\n  lint:\n    runs-on: x\n    steps: [{name: a}]\n")
+    assert [str(issue) for issue in github] == [
+        "job 'lint': missing required property 'uses' or 'run' (at jobs.lint.steps[0])"
+    ]
+
+    bitbucket = validation.validate_text("bitbucket", "pipelines:\n  default:\n    - step: {name: Build, script: make}\n")
+    assert [(issue.job, issue.message) for issue in bitbucket] == [("Build", "expected array, got string")]
+
+
+def test_compiled_validators_are_reused_from_disk(tmp_path, monkeypatch):
+    monkeypatch.setattr(validation, "_VALIDATORS", {})
+    validation.get_validator("gitlab", tmp_path)
+    [cached] = (tmp_path / "validators").iterdir()
+    assert cached.name.startswith("gitlab.v1-")
+
+    def fail(schema):
+        raise AssertionError("validator was compiled again")
+
+    monkeypatch.setattr(validation, "_VALIDATORS", {})
+    monkeypatch.setattr(validation, "compile_schema", fail)
+    assert validation.get_validator("gitlab", tmp_path).validate({"build": {"script": ["make"]}}) == []
+
+
+def test_transpiler_rejects_output_that_breaks_the_schema(tmp_path):
+    spec = tmp_path / "bamboo.yml"
+    spec.write_text(SPEC, encoding="utf-8")
+    renderers = default_renderer_registry(include_plugins=False)
+    renderers.register(_BrokenGitLabRenderer())
+
+    # Without --validate the broken output goes through untouched.
+    assert "sometimes" in PipelineTranspiler(renderer_registry=renderers).convert_path(spec, target="gitlab")
+
+    transpiler = PipelineTranspiler(renderer_registry=renderers, validate=True)
+    with pytest.raises(OutputValidationError) as raised:
+        transpiler.convert_path(spec, target="gitlab")
+    [issue] = raised.value.issues
+    assert issue.startswith("job 'test': must be one of: ") and issue.endswith("(at test.when)")
+
+    # Targets without a problem, or without a schema, pass through.
+    assert transpiler.convert_targets(spec, targets=["github", "bitbucket"])
+
+
+def test_validation_errors_survive_pickling():
+    error = pickle.loads(pickle.dumps(OutputValidationError("gitlab", "spec.yml", ["job 'a': bad"])))
+    assert (error.target, error.origin, error.issues) == ("gitlab", "spec.yml", ["job 'a': bad"])
+    assert str(error).endswith("\n  - job 'a': bad")
+
+
+@pytest.mark.parametrize(
+    ("path", "target"),
+    [
+        (".gitlab-ci.yml", "gitlab"),
+        ("out/bitbucket-pipelines.yml", "bitbucket"),
+        (".github/workflows/ci.yml", "github"),
+        ("pipeline.yml", None),
+    ],
+)
+def test_target_is_inferred_from_conventional_paths(path, target):
+    assert validation.target_for_path(Path(path)) == target
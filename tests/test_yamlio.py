@@ -0,0 +1,60 @@
+# SPDX-FileCopyrightText: 2025-present U.N. Owen <void@some.where>
+#
+# SPDX-License-Identifier: MIT
+
+import io
+
+import yaml
+
+from pipeforge import yamlio
+
+DOCUMENTS = [
+    {"pipelines": {"default": [{"step": {"name": "build", "script": ["export APP_ENV=\"dev\"", "make"]}}]}},
+    {"job": {"script": ["echo " + "x" * 120 + " done", "multi\nline\nscript"]}},
+    {"job": {"script": ["echo ä " + "y" * 90 + " \t tab", "trailing \n space", "  lead\nkeep\n\n"]}},
+    {"": "empty key", "multi\nline": "key", "k" * 200: [[], {}, None, True, 3, "yes", "- x", "a: b", "#c"]},
+    {"floats": [1e20, 1e-7, 2.5e-300, 1.5, 3.0, -0.0, float("inf"), float("-inf")]},
+    {"control": "bell\x07 nbsp\xa0 bom\ufeff", "quotes": "it's \"x\"", "nested": [["a", ["b"]], {"c": [{}]}]},
+]
+
+
+def test_dump_round_trips():
+    for document in DOCUMENTS:
+        assert yaml.safe_load(yamlio.dump(document)) == document
+
+
+def test_dump_matches_pyyaml_layout_without_folding_long_lines():
+    document = {"job": {"needs": [{"job": "a", "artifacts": False}], "script": ["make", "x " * 60]}, "stages": ["b"]}
+
+    assert yamlio.dump(document) == yaml.safe_dump(document, sort_keys=False, width=float("inf"))
+    floats = {"floats": [1e20, 1e-7, 1.5, 10.0, float("inf"), float("nan")]}
+    assert yamlio.dump(floats) == yaml.safe_dump(floats, sort_keys=False)
+    assert yamlio.dump({"run": "make\nmake test"}) == "run: |-\n  make\n  make test\n"
+
+
+def test_shared_values_are_anchored_once_even_when_streamed():
+    block = yamlio.SharedBlock("export A=1\nexport B=2")
+
+    def jobs():
+        for index in range(3):
+            # A fresh shared mapping per job must not alias an earlier, freed one.
+            env = yamlio.SharedDict({"JOB": str(index)})
+            yield f"job{index}", {"env": env, "steps": [{"env": env}], "script": [block]}
+
+    stream = io.StringIO()
+    yamlio.dump({"jobs": yamlio.LazyMapping(jobs()), "empty": iter([])}, stream)
+    text = stream.getvalue()
+
+    assert text.count("export A=1") == 1
+    loaded = yaml.safe_load(text)
+    assert [job["steps"][0]["env"]["JOB"] for job in loaded["jobs"].values()] == ["0", "1", "2"]
+    assert loaded["jobs"]["job2"]["script"] == ["export A=1\nexport B=2"]
+    assert loaded["empty"] == []
+
+
+def test_load_accepts_binary_handles(tmp_path):
+    path = tmp_path / "spec.yml"
+    path.write_bytes("plan:\n  name: Café\n".encode("utf-8"))
+
+    with path.open("rb") as handle:
+        assert yamlio.load(handle) == {"plan": {"name": "Café"}}